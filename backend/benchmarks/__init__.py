@@ -0,0 +1 @@
+"""Benchmark suites for backend hot paths."""
@@ -0,0 +1,176 @@
+"""
+PDF extraction benchmark.
+
+Generates synthetic transcripts (see synthetic_transcripts.py) and times each PDFProcessor phase
+plus the upload path end to end (prescan_and_process_pdf_file on a spooled file, in-process and
+through the extraction pool), recording throughput and peak memory to a JSON results file.
+
+Run from backend/:
+    python -m benchmarks.bench_pdf_processor --pages 10 60 120 250 500 --repeats 3
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import fitz
+
+from benchmarks.synthetic_transcripts import SyntheticTranscriptConfig, generate_transcript_pdf
+from src.utils.pdf_processor import PDFProcessor, shutdown_extraction_pool, warm_extraction_pool
+
+
+DEFAULT_PAGES = [10, 60, 120, 250, 500]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def _measure(fn: Callable[[], object], repeats: int) -> Dict[str, float]:
+    """Median wall time over `repeats` runs, plus the Python-heap peak of one traced run."""
+    durations: List[float] = []
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_seconds": round(statistics.median(durations), 4),
+        "min_seconds": round(min(durations), 4),
+        "python_peak_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+def _with_doc(pdf_bytes: bytes, fn: Callable[[fitz.Document], object]) -> Callable[[], object]:
+    def run():
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        try:
+            return fn(doc)
+        finally:
+            doc.close()
+    return run
+
+
+def benchmark_document(pdf_bytes: bytes, repeats: int, parallel_min_pages: int) -> Dict[str, Dict[str, float]]:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        in_process = PDFProcessor(save_transcripts_dir=cache_dir,
+                                  max_file_size_mb=1024, parallel_min_pages=None)
+        parallel = PDFProcessor(save_transcripts_dir=cache_dir,
+                                max_file_size_mb=1024, parallel_min_pages=parallel_min_pages)
+
+        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        with contextlib.redirect_stdout(io.StringIO()):
+            body_font_size = in_process.analyze_font_styles(doc)
+        doc.close()
+
+        # /validate_file parses uploads from a file on disk
+        pdf_path = os.path.join(cache_dir, "benchmark.pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(pdf_bytes)
+
+        return {
+            "analyze_font_styles": _measure(
+                _with_doc(pdf_bytes, in_process.analyze_font_styles), repeats),
+            "find_qa_section_title": _measure(
+                _with_doc(pdf_bytes, lambda d: in_process.find_qa_section_title(d, body_font_size)), repeats),
+            "extract_text_sections": _measure(
+                _with_doc(pdf_bytes, in_process.extract_text_sections), repeats),
+            "prescan_and_process_pdf_file": _measure(
+                lambda: in_process.prescan_and_process_pdf_file(pdf_path, "benchmark.pdf"), repeats),
+            "prescan_and_process_pdf_file_parallel": _measure(
+                lambda: parallel.prescan_and_process_pdf_file(pdf_path, "benchmark.pdf"), repeats),
+        }
+
+
+def run(args: argparse.Namespace) -> Dict:
+    results = []
+    for pages in args.pages:
+        config = SyntheticTranscriptConfig(
+            pages=pages,
+            body_font_size=args.body_font_size,
+            title_font_size=args.title_font_size,
+            bold_qa_header=not args.no_bold_qa_header,
+            toc_page=not args.no_toc,
+            copyright_footer=not args.no_copyright,
+        )
+        pdf_bytes = generate_transcript_pdf(config)
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            actual_pages = len(doc)
+        size_mb = len(pdf_bytes) / (1024 * 1024)
+
+        timings = benchmark_document(
+            pdf_bytes, args.repeats, args.parallel_min_pages)
+        for timing in timings.values():
+            seconds = timing["median_seconds"] or 1e-9
+            timing["pages_per_second"] = round(actual_pages / seconds, 1)
+            timing["mb_per_second"] = round(size_mb / seconds, 2)
+
+        print(f"[BENCH] {actual_pages:>4} pages ({size_mb:.2f}MB): " + ", ".join(
+            f"{name}={t['median_seconds']:.3f}s" for name, t in timings.items()))
+        results.append({
+            "requested_pages": pages,
+            "pages": actual_pages,
+            "pdf_size_mb": round(size_mb, 3),
+            "config": config.__dict__,
+            "timings": timings,
+        })
+
+    return {
+        "run_at": datetime.now().isoformat(),
+        "pymupdf_version": fitz.VersionBind,
+        "python_version": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "repeats": args.repeats,
+        # Process-wide high-water mark (includes MuPDF's native allocations); KB on Linux
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PDFProcessor on synthetic transcripts")
+    parser.add_argument("--pages", type=int, nargs="+", default=DEFAULT_PAGES)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--body-font-size", type=float, default=10.0)
+    parser.add_argument("--title-font-size", type=float, default=10.0)
+    parser.add_argument("--no-bold-qa-header", action="store_true")
+    parser.add_argument("--no-toc", action="store_true")
+    parser.add_argument("--no-copyright", action="store_true")
+    parser.add_argument("--parallel-min-pages", type=int, default=1,
+                        help="Threshold for the process-pool run (default: shard every document)")
+    parser.add_argument("--output", default=None,
+                        help="Results JSON path (default: benchmarks/results/pdf_extraction_<timestamp>.json)")
+    args = parser.parse_args()
+
+    warm_extraction_pool()
+    try:
+        report = run(args)
+    finally:
+        shutdown_extraction_pool()
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"pdf_extraction_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[BENCH] Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
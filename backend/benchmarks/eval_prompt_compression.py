@@ -0,0 +1,136 @@
+"""
+Offline evaluation of LLMLingua transcript compression.
+
+For every saved transcript (the JSON files precheck writes to local_cache/) and every keep rate,
+summarizes the Q&A with the compressed transcript, then judges the summary against the ORIGINAL
+transcript, recording input tokens, compression savings and time, and the judge pass rate, so the
+savings can be weighed against summary quality. Rate 1.0 is the uncompressed baseline.
+Calls the configured LLM backend: every transcript/rate pair costs one summary and one judge call.
+
+Run from backend/:
+    python -m benchmarks.eval_prompt_compression --transcripts Call_A.json Call_B.json --rates 1.0 0.7 0.5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from src.config.constants import CACHE_DIR
+from src.config.runtime import JUDGE_PROMPT_VERSION
+from src.llm.llm_utils import get_prompt_config, judge_q_a_summary, summarize_q_a
+
+
+DEFAULT_RATES = [1.0, 0.7, 0.5]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def _load_q_a(transcript: str) -> str:
+    path = transcript if os.path.exists(transcript) else os.path.join(CACHE_DIR, transcript)
+    with open(path, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    q_a = (saved.get("transcripts") or {}).get("q_a") or ""
+    if not q_a:
+        raise ValueError(f"No Q&A transcript in {path}")
+    return q_a
+
+
+def evaluate(q_a: str, rate: float, call_type: str, summary_length: str, answer_format: str) -> Dict:
+    prompt_config = get_prompt_config(call_type, summary_length, answer_format)
+
+    start = time.perf_counter()
+    summary = summarize_q_a(
+        q_a, call_type, summary_length, prompt_config["prompt_version"],
+        model=prompt_config["model"], effort_level=prompt_config["effort_level"],
+        answer_format=answer_format, compression_rate=rate)
+    summary_seconds = time.perf_counter() - start
+    summary_metadata = summary["metadata"]
+
+    # The judge always reads the uncompressed transcript: it measures what compression lost
+    start = time.perf_counter()
+    judge = judge_q_a_summary(
+        q_a, summary["summary"]["text"], summary_metadata.get("summary_structure", {}),
+        JUDGE_PROMPT_VERSION, compression_rate=1.0)
+    judge_seconds = time.perf_counter() - start
+
+    evaluation = judge["eval_results"]["obj"]
+    assessment = evaluation.overall_assessment if evaluation is not None else None
+    compression = summary_metadata.get("compression") or {}
+    return {
+        "rate": rate,
+        "summary_input_tokens": summary_metadata.get("input_tokens"),
+        "summary_output_tokens": summary_metadata.get("output_tokens"),
+        "compression_saved_tokens": compression.get("saved_tokens", 0),
+        "compression_seconds": compression.get("time", 0.0),
+        "summary_seconds": round(summary_seconds, 2),
+        "judge_seconds": round(judge_seconds, 2),
+        "finish_reason": summary_metadata.get("finish_reason"),
+        "pass_rate": assessment.pass_rate if assessment else None,
+        "failed_criteria": [
+            r.metric_name for r in evaluation.evaluation_results if not r.passed
+        ] if evaluation is not None else None,
+    }
+
+
+def run(args: argparse.Namespace) -> Dict:
+    results: List[Dict] = []
+    for transcript in args.transcripts:
+        q_a = _load_q_a(transcript)
+        for rate in args.rates:
+            row = evaluate(q_a, rate, args.call_type, args.summary_length, args.answer_format)
+            row["transcript"] = transcript
+            print(f"[EVAL] {transcript} rate={rate}: input_tokens={row['summary_input_tokens']} "
+                  f"saved={row['compression_saved_tokens']} pass_rate={row['pass_rate']}")
+            results.append(row)
+
+    summary = {}
+    for rate in args.rates:
+        rows = [r for r in results if r["rate"] == rate]
+        pass_rates = [r["pass_rate"] for r in rows if r["pass_rate"] is not None]
+        input_tokens = [r["summary_input_tokens"] for r in rows if r["summary_input_tokens"]]
+        summary[str(rate)] = {
+            "mean_pass_rate": round(statistics.mean(pass_rates), 3) if pass_rates else None,
+            "mean_input_tokens": round(statistics.mean(input_tokens)) if input_tokens else None,
+            "total_saved_tokens": sum(r["compression_saved_tokens"] for r in rows),
+            "total_compression_seconds": round(sum(r["compression_seconds"] for r in rows), 2),
+        }
+
+    return {
+        "run_at": datetime.now().isoformat(),
+        "call_type": args.call_type,
+        "summary_length": args.summary_length,
+        "answer_format": args.answer_format,
+        "judge_prompt_version": JUDGE_PROMPT_VERSION,
+        "by_rate": summary,
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Weigh LLMLingua transcript compression against judge pass rate")
+    parser.add_argument("--transcripts", nargs="+", required=True,
+                        help="Transcript JSON names in local_cache/ or paths")
+    parser.add_argument("--rates", type=float, nargs="+", default=DEFAULT_RATES,
+                        help="Share of transcript tokens kept (1.0 = uncompressed baseline)")
+    parser.add_argument("--call-type", default="earnings", choices=["earnings", "conference"])
+    parser.add_argument("--summary-length", default="long", choices=["short", "long"])
+    parser.add_argument("--answer-format", default="prose", choices=["prose", "bullet"])
+    parser.add_argument("--output", default=None,
+                        help="Results JSON path (default: benchmarks/results/prompt_compression_<timestamp>.json)")
+    args = parser.parse_args()
+
+    report = run(args)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"prompt_compression_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[EVAL] Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
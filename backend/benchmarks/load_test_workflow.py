@@ -0,0 +1,166 @@
+"""
+Offline load test of the summary workflow against the LLM simulator.
+
+Runs many concurrent jobs of one saved transcript (the JSON files precheck writes to local_cache/)
+with every model served by the simulator, so the rate limiter, retries, hedging and the parallel
+stage timeout can be exercised without network access. Records per-job wall time, final status,
+stage statuses and warnings, plus the rate limiter and response cache counters.
+
+Run from backend/:
+    python -m benchmarks.load_test_workflow --transcript Call_A.json --jobs 50 --concurrency 20 \
+        --latency-scale 0.05 --error-rates '{"429": 0.05, "503": 0.02}' --parallel-timeout 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def _configure_simulator(args: argparse.Namespace) -> None:
+    # src.config.runtime reads these at import time, so they are set before any src import
+    os.environ["LLM_SIMULATOR"] = "1"
+    os.environ["LLM_SIMULATOR_LATENCY_SCALE"] = str(args.latency_scale)
+    os.environ["LLM_SIMULATOR_ERROR_RATES"] = args.error_rates
+    os.environ["LLM_SIMULATOR_TRUNCATION_RATE"] = str(args.truncation_rate)
+    os.environ["SUMMARY_WORKFLOW_MODE"] = args.mode
+    if not args.response_cache:
+        os.environ["LLM_RESPONSE_CACHE_BACKEND"] = "none"
+    if args.rate_limits:
+        os.environ["LLM_SIMULATOR_RATE_LIMITS"] = args.rate_limits
+    if args.seed is not None:
+        os.environ["LLM_SIMULATOR_SEED"] = str(args.seed)
+
+
+def _job_report(job_dir: str, seconds: float) -> Dict:
+    with open(os.path.join(job_dir, "status.json"), "r", encoding="utf-8") as f:
+        status = json.load(f)
+    return {
+        "seconds": round(seconds, 3),
+        "status": status.get("current_stage"),
+        "stages": status.get("stages"),
+        "warnings": status.get("warnings") or [],
+        "error": status.get("error"),
+    }
+
+
+def run(args: argparse.Namespace) -> Dict:
+    from src.services import summary_workflow
+    from src.llm.llm_client import get_llm_pool_stats
+    from src.llm.response_cache import get_response_cache_stats
+    from src.utils.job_utils import _write_json_atomic
+
+    if args.parallel_timeout is not None:
+        summary_workflow.PARALLEL_TIMEOUT_SECONDS = args.parallel_timeout
+
+    jobs_root = tempfile.mkdtemp(prefix="load_test_jobs_")
+
+    def new_job_dir(i: int) -> str:
+        job_dir = os.path.join(jobs_root, f"job_{i:04d}")
+        os.makedirs(job_dir)
+        _write_json_atomic(os.path.join(job_dir, "status.json"), {
+            "job_id": os.path.basename(job_dir),
+            "transcript_name": args.transcript,
+            "current_stage": "q_a_summary",
+            "stages": {"q_a_summary": "pending", "overview_summary": "pending", "summary_evaluation": "pending"},
+        })
+        return job_dir
+
+    def run_job(i: int) -> Dict:
+        job_dir = new_job_dir(i)
+        start = time.perf_counter()
+        summary_workflow.run_summary_workflow_from_saved_transcripts(
+            args.transcript, args.call_type, args.summary_length, job_dir=job_dir, answer_format=args.answer_format)
+        return _job_report(job_dir, time.perf_counter() - start)
+
+    async def arun_jobs() -> List[Dict]:
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def arun_job(i: int) -> Dict:
+            async with semaphore:
+                job_dir = new_job_dir(i)
+                start = time.perf_counter()
+                await summary_workflow.arun_summary_workflow_from_saved_transcripts(
+                    args.transcript, args.call_type, args.summary_length, job_dir=job_dir, answer_format=args.answer_format)
+                return _job_report(job_dir, time.perf_counter() - start)
+
+        return await asyncio.gather(*(arun_job(i) for i in range(args.jobs)))
+
+    start = time.perf_counter()
+    if args.mode == "asyncio":
+        jobs = asyncio.run(arun_jobs())
+    else:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            jobs = list(executor.map(run_job, range(args.jobs)))
+    wall_seconds = time.perf_counter() - start
+
+    durations = sorted(job["seconds"] for job in jobs)
+    statuses: Dict[str, int] = {}
+    for job in jobs:
+        statuses[job["status"]] = statuses.get(job["status"], 0) + 1
+    return {
+        "run_at": datetime.now().isoformat(),
+        "config": vars(args),
+        "wall_seconds": round(wall_seconds, 2),
+        "jobs_per_minute": round(len(jobs) / wall_seconds * 60, 1) if wall_seconds else None,
+        "job_seconds": {
+            "median": round(statistics.median(durations), 3),
+            "p95": durations[min(len(durations) - 1, int(0.95 * len(durations)))],
+            "max": durations[-1],
+        },
+        "statuses": statuses,
+        "jobs_with_warnings": sum(1 for job in jobs if job["warnings"]),
+        "rate_limits": get_llm_pool_stats()["rate_limits"],
+        "response_cache": get_response_cache_stats(),
+        "jobs": jobs,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the summary workflow against the offline LLM simulator")
+    parser.add_argument("--transcript", required=True, help="Transcript JSON name in local_cache/")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--mode", default="thread", choices=["thread", "asyncio"])
+    parser.add_argument("--call-type", default="earnings", choices=["earnings", "conference"])
+    parser.add_argument("--summary-length", default="long", choices=["short", "long"])
+    parser.add_argument("--answer-format", default="prose", choices=["prose", "bullet"])
+    parser.add_argument("--latency-scale", type=float, default=0.1,
+                        help="Multiplier on every simulated delay (1.0 = realistic latencies)")
+    parser.add_argument("--error-rates", default="{}",
+                        help='Injected failures per call, e.g. \'{"429": 0.05, "503": 0.02, "timeout": 0.01}\'')
+    parser.add_argument("--truncation-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limits", default=None,
+                        help='Simulated provider limits, e.g. \'{"gpt-5": {"requests_per_minute": 60, "tokens_per_minute": 200000}}\'')
+    parser.add_argument("--parallel-timeout", type=float, default=None,
+                        help="Override PARALLEL_TIMEOUT_SECONDS for the overview/judge stages")
+    parser.add_argument("--response-cache", action="store_true",
+                        help="Keep the LLM response cache on (off by default so every job reaches the simulator)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None,
+                        help="Results JSON path (default: benchmarks/results/load_test_<timestamp>.json)")
+    args = parser.parse_args()
+
+    _configure_simulator(args)
+    report = run(args)
+    print(f"[LOAD] {args.jobs} jobs in {report['wall_seconds']}s: {report['statuses']}, "
+          f"median {report['job_seconds']['median']}s, p95 {report['job_seconds']['p95']}s, "
+          f"{report['jobs_with_warnings']} with warnings")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"load_test_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[LOAD] Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
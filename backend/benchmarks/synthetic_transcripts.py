@@ -0,0 +1,197 @@
+"""
+Synthetic earnings-call PDF generator for the PDF extraction benchmarks.
+Produces BamSEC-like transcripts: participants list, presentation, a Q&A title,
+analyst/executive turns, per-page header/footer lines and an optional copyright page.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import List
+
+import fitz
+
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+MARGIN = 54
+
+EXECUTIVES = [
+    ("Jane Miller", "Chief Executive Officer"),
+    ("Robert Chen", "Chief Financial Officer"),
+    ("Laura Gomez", "Senior Director of Investor Relations"),
+]
+ANALYSTS = [
+    ("Michael Grant", "Morgan Stanley, Research Division", "Equity Analyst"),
+    ("Sarah Patel", "Goldman Sachs Group, Inc., Research Division", "Analyst"),
+    ("David Okafor", "JPMorgan Chase & Co, Research Division", "MD & Senior Analyst"),
+    ("Emily Novak", "Barclays Bank PLC, Research Division", "Senior Analyst"),
+]
+COMPANY = "Example Corp."
+
+_BODY_FONT = fitz.Font("helv")
+_BOLD_FONT = fitz.Font("hebo")
+
+SENTENCES = [
+    "Revenue grew {n}% year over year, driven by strong demand in our cloud segment.",
+    "Gross margin came in at {n}.{m}%, ahead of the guidance we provided last quarter.",
+    "We continue to invest in AI capabilities across the platform.",
+    "Operating expenses were ${n}.{m} million, reflecting higher headcount in R&D.",
+    "Can you talk about the pipeline and how conversion rates trended through the quarter?",
+    "Free cash flow was ${n} million and we repurchased shares during the period.",
+    "We are raising the full-year outlook to a range of ${n} to ${m} billion.",
+    "Customer retention remained above {n}% across enterprise accounts.",
+]
+
+
+@dataclass
+class SyntheticTranscriptConfig:
+    pages: int = 60
+    body_font_size: float = 10.0
+    title_font_size: float = 10.0
+    bold_qa_header: bool = True
+    toc_page: bool = True
+    # PDF outline entries and clickable table-of-contents links to the sections
+    outline: bool = True
+    toc_links: bool = True
+    copyright_footer: bool = True
+    # Fraction of content pages that belong to the presentation
+    presentation_fraction: float = 0.4
+    seed: int = 7
+
+
+class _Writer:
+    """Lays out lines top-to-bottom, starting a new page (with header/footer) when the current one is full."""
+
+    def __init__(self, doc: fitz.Document, config: SyntheticTranscriptConfig, title: str):
+        self.doc = doc
+        self.config = config
+        self.title = title
+        self.page = None
+        self.y = 0.0
+        self.line_height = config.body_font_size * 1.45
+
+    def new_page(self) -> None:
+        self.page = self.doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        # Embedded Helvetica clones: the base-14 encoding has no en dash for speaker headers
+        self.page.insert_font(fontname="body", fontbuffer=_BODY_FONT.buffer)
+        self.page.insert_font(fontname="bold", fontbuffer=_BOLD_FONT.buffer)
+        self.page.insert_text((MARGIN, 30), "11/08/2025, 14:23",
+                              fontsize=7, fontname="body")
+        self.page.insert_text((MARGIN, 40), self.title,
+                              fontsize=7, fontname="body")
+        self.y = MARGIN + 20
+
+    def has_room(self, lines: int = 1) -> bool:
+        return self.page is not None and self.y + lines * self.line_height < PAGE_HEIGHT - MARGIN
+
+    def write(self, text: str, fontsize: float = None, bold: bool = False) -> None:
+        if not self.has_room():
+            self.new_page()
+        self.page.insert_text(
+            (MARGIN, self.y), text,
+            fontsize=fontsize or self.config.body_font_size,
+            fontname="bold" if bold else "body",
+        )
+        self.y += self.line_height
+
+    def write_speaker(self, name: str, rest: str) -> None:
+        """Speaker header as BamSEC renders it: bold name followed by the regular-weight firm and role."""
+        if not self.has_room():
+            self.new_page()
+        size = self.config.body_font_size
+        self.page.insert_text((MARGIN, self.y), name,
+                              fontsize=size, fontname="bold")
+        name_width = _BOLD_FONT.text_length(name + " ", fontsize=size)
+        self.page.insert_text((MARGIN + name_width, self.y), rest,
+                              fontsize=size, fontname="body")
+        self.y += self.line_height
+
+
+def _paragraph(rng: random.Random, sentences: int) -> List[str]:
+    words: List[str] = []
+    for _ in range(sentences):
+        words.extend(rng.choice(SENTENCES).format(
+            n=rng.randint(2, 95), m=rng.randint(1, 9)).split())
+    lines, current = [], []
+    for word in words:
+        current.append(word)
+        if len(" ".join(current)) > 90:
+            lines.append(" ".join(current))
+            current = []
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+def generate_transcript_pdf(config: SyntheticTranscriptConfig) -> bytes:
+    """Build a synthetic transcript PDF with roughly `config.pages` pages and return its bytes."""
+    rng = random.Random(config.seed)
+    doc = fitz.open()
+    title = f"{COMPANY}, Q2 2025 Earnings Call – BamSEC"
+    writer = _Writer(doc, config, title)
+
+    content_pages = max(2, config.pages - int(config.toc_page) - int(config.copyright_footer))
+    presentation_pages = max(1, int(content_pages * config.presentation_fraction))
+    qa_page_target = int(config.toc_page) + presentation_pages
+
+    if config.toc_page:
+        writer.new_page()
+        writer.write("Table of Contents", fontsize=config.body_font_size + 4, bold=True)
+        writer.write(f"Presentation ........ {int(config.toc_page) + 1}")
+        writer.write(f"Questions and Answers ........ {qa_page_target + 1}")
+
+    # Presentation: participants list then prepared remarks
+    writer.new_page()
+    writer.write("Corporate Participants", bold=True)
+    for name, role in EXECUTIVES:
+        writer.write_speaker(name, f"{COMPANY} – {role}")
+    writer.write("Conference Call Participants", bold=True)
+    for name, firm, role in ANALYSTS:
+        writer.write_speaker(name, f"{firm} – {role}")
+    writer.write("Presentation", bold=True)
+    writer.write("Operator")
+    while len(doc) < qa_page_target:
+        name, role = rng.choice(EXECUTIVES)
+        writer.write_speaker(name, f"{COMPANY} – {role}")
+        for line in _paragraph(rng, rng.randint(3, 8)):
+            writer.write(line)
+
+    # Q&A section starts on a fresh page
+    writer.new_page()
+    qa_page = len(doc) - 1
+    writer.write("Questions and Answers", fontsize=config.title_font_size,
+                 bold=config.bold_qa_header)
+    while len(doc) < int(config.toc_page) + content_pages:
+        writer.write("Operator")
+        name, firm, role = rng.choice(ANALYSTS)
+        writer.write(f"Our next question comes from {name} with {firm.split(',')[0]}.")
+        writer.write_speaker(name, f"{firm} – {role}")
+        for line in _paragraph(rng, rng.randint(1, 3)):
+            writer.write(line)
+        for _ in range(rng.randint(1, 2)):
+            exec_name, exec_role = rng.choice(EXECUTIVES)
+            writer.write_speaker(exec_name, f"{COMPANY} – {exec_role}")
+            for line in _paragraph(rng, rng.randint(3, 9)):
+                writer.write(line)
+
+    if config.copyright_footer:
+        writer.new_page()
+        writer.write("Copyright © 2025 Example Data Provider. All rights reserved.",
+                     fontsize=config.body_font_size - 3)
+        writer.write("This transcript may not be reproduced without permission.",
+                     fontsize=config.body_font_size - 3)
+
+    total = len(doc)
+    for page_num in range(total):
+        doc[page_num].insert_text(
+            (MARGIN, PAGE_HEIGHT - 24), f"{page_num + 1}/{total}", fontsize=7, fontname="body")
+
+    if config.outline:
+        doc.set_toc([[1, "Presentation", int(config.toc_page) + 1],
+                     [1, "Questions and Answers", qa_page + 1]])
+    if config.toc_page and config.toc_links:
+        for rect in doc[0].search_for("Questions and Answers"):
+            doc[0].insert_link({"kind": fitz.LINK_GOTO, "from": rect, "page": qa_page})
+
+    pdf_bytes = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return pdf_bytes
@@ -10,7 +10,10 @@ import time
 from src.services.precheck import PrecheckError
 from src.services.summary_workflow import SummaryWorkflowError
 from src.config.constants import RETENTION_DAYS, FORCE_CLEANUP_DAYS, CLEANUP_INTERVAL_SECONDS
-from src.config.constants import CACHE_DIR
+from src.config.constants import CACHE_DIR, PDF_EXTRACTION_WORKERS, PDF_PARALLEL_MIN_PAGES
+from src.utils.pdf_processor import warm_extraction_pool, shutdown_extraction_pool
+from src.services.validation_executor import validation_executor
+from src.llm.llm_client import aclose_llm_clients
 
 # Routers
 from src.api.routes.health import router as health_router
@@ -43,6 +46,26 @@ app.add_middleware(
 )
 
 
+# Keep the PDF extraction workers warm so large uploads don't pay process start-up
+@app.on_event("startup")
+def start_extraction_pool():
+    # A single worker never gets used (extraction stays in-process), so don't spawn it
+    if PDF_PARALLEL_MIN_PAGES is not None and PDF_EXTRACTION_WORKERS > 1:
+        try:
+            warm_extraction_pool()
+        except Exception as e:
+            logger.warning(f"Failed to warm PDF extraction pool: {e}")
+
+
+@app.on_event("shutdown")
+def stop_extraction_pool():
+    shutdown_extraction_pool()
+    validation_executor.shutdown()
+
+
+@app.on_event("shutdown")
+async def close_llm_pools():
+    await aclose_llm_clients()
 
 
 class ErrorDetail(BaseModel):
@@ -56,10 +79,17 @@ class ErrorResponse(BaseModel):
 
 @app.exception_handler(PrecheckError)
 async def precheck_error_handler(request: Request, exc: PrecheckError):
+    code_map = {
+        "file_too_large": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        "server_busy": status.HTTP_503_SERVICE_UNAVAILABLE,
+    }
+
+    status_code = code_map.get(exc.code, status.HTTP_400_BAD_REQUEST)
+
     return JSONResponse(
         content=ErrorResponse(error=ErrorDetail(
             code=exc.code, message=exc.message)).model_dump(),
-        status_code=status.HTTP_400_BAD_REQUEST
+        status_code=status_code
     )
 
 
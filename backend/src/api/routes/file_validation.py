@@ -4,6 +4,8 @@ import logging
 from typing import Dict, Any
 
 from src.services.precheck import PrecheckError, run_validate_file
+from src.services.validation_executor import validation_executor
+from src.llm.token_budget import plan_job_tokens, preflight_context_error
 from src.services.job_creation import (
     _read_json_file, _reuse_existing_job, _create_new_job
 )
@@ -36,8 +38,10 @@ async def validate_file_endpoint(
             f"Invalid file type. Expected '.pdf', but received '{file.content_type}'",
         )
 
-    payload: Dict[str, Any] = run_validate_file(
-        file=file, call_type=call_type, summary_length=summary_length, answer_format=answer_format)
+    # Parsing, hashing and the transcript write run on the bounded validation executor, off the event loop
+    payload, timings = await validation_executor.run(
+        run_validate_file, file=file, call_type=call_type, summary_length=summary_length, answer_format=answer_format)
+    payload["validation_timings"] = timings
 
     # 2) Ensure Q&A transcript exists
     transcript_name = payload.get("transcript_name")
@@ -51,6 +55,14 @@ async def validate_file_endpoint(
                 "code": "no_q_a_transcript",
                 "message": "No Q&A transcript found in the document.",
             }
+        else:
+            # 3) Pre-flight: every stage's prompt plus output budget must fit the model's context window
+            token_plan = plan_job_tokens(saved_doc, call_type, summary_length, answer_format)
+            context_error = preflight_context_error(token_plan)
+            if context_error:
+                logger.warning(f"Rejecting {transcript_name}: {context_error['message']}")
+                payload["is_validated"] = False
+                payload["error"] = context_error
 
     # Early return on invalid
     if not payload.get("is_validated"):
@@ -1,6 +1,9 @@
 from fastapi import APIRouter
 from datetime import datetime
 
+from src.llm.llm_client import get_llm_pool_stats
+from src.llm.response_cache import get_response_cache_stats
+
 router = APIRouter()
 
 
@@ -8,3 +11,15 @@ router = APIRouter()
 async def health_check():
     """Health check endpoint to verify API status"""
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+
+
+@router.get("/health/llm_pools")
+async def llm_pool_stats():
+    """Connection reuse statistics of the shared LLM client pools"""
+    return {**get_llm_pool_stats(), "timestamp": datetime.now().isoformat()}
+
+
+@router.get("/health/llm_cache")
+async def llm_cache_stats():
+    """Hit/miss counters of the LLM response cache per workflow stage"""
+    return {**get_response_cache_stats(), "timestamp": datetime.now().isoformat()}
@@ -1,4 +1,4 @@
-
+import os
 
 QA_PATTERNS = [
     "questions and answers",
@@ -11,10 +11,45 @@ QA_PATTERNS = [
     "questions & answer",
    
 ]
-FILESIZE = 10
+# Table-of-contents pages searched for a link to the Q&A section
+QA_TOC_LINK_SCAN_PAGES = 3
+# Uploads are spooled to disk and parsed from the file, so memory no longer scales with size
+SPOOLED_FILESIZE = 50
+UPLOAD_SPOOL_CHUNK_BYTES = 1024 * 1024
+
+# Page-sharded PDF extraction: documents with at least this many pages are parsed
+# by a pool of worker processes (None keeps every document in-process)
+PDF_PARALLEL_MIN_PAGES = 40
+PDF_EXTRACTION_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# Pages (with their TextPages) the Q&A pre-scan keeps for the in-process extraction that follows;
+# bounds memory while scanning a long document that turns out to have no Q&A title
+QA_PRESCAN_MAX_CACHED_PAGES = 60
+
+# Repeated page headers/footers: lines in the top/bottom band of a page that recur with the
+# same position and font on at least this share of pages are stripped before hashing
+BOILERPLATE_EDGE_BAND = 0.12
+BOILERPLATE_MIN_PAGES = 3
+BOILERPLATE_MIN_PAGE_RATIO = 0.5
+# Documents that must agree on a publisher template before its layout profile replaces the statistics
+LAYOUT_PROFILE_MIN_DOCUMENTS = 2
 
 CACHE_DIR = "local_cache"
 
+# Near-duplicate dedup: transcripts whose simhash agrees on at least this share of bits (63 of 64)
+# reuse a completed job for the same parameters (1.0 disables fuzzy matching)
+NEAR_DUPLICATE_MIN_SIMILARITY = 63 / 64
+# A whole-document simhash barely moves when a few exchanges are cut, so candidates must also have the
+# same analyst and question counts and a Q&A length within this share of each other
+NEAR_DUPLICATE_MAX_Q_A_LENGTH_DELTA = 0.02
+NEAR_DUPLICATE_MAX_ENTRIES = 200
+# Raw upload cache (pdf_index.json) size; past it stale entries are pruned and the oldest dropped
+# down to 4/5 of the cap, so the transcript files are only re-read once every few uploads
+PDF_INDEX_MAX_ENTRIES = 500
+
+# /validate_file runs on a dedicated executor instead of the event loop
+VALIDATION_MAX_CONCURRENCY = 2
+VALIDATION_MAX_QUEUE = 8
+
 RETENTION_DAYS = 1
 FORCE_CLEANUP_DAYS = 7
 CLEANUP_INTERVAL_SECONDS = 30 * 60  # 30 minutes (for testing)
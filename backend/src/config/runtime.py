@@ -1,3 +1,6 @@
+import json
+import os
+
 # Inputs hardcoded para a V1
 CALL_TYPE = "conference call"        # "earnings" ou "conference"
 SUMMARY_LENGTH = "short"      # "short" ou "long"
@@ -5,9 +8,13 @@ PDF_PATH = r"C:\Users\innyw\OneDrive - minerva.edu\kapitalo\financial-summarizer
 
 
 # JUDGE
-JUDGE_PROMPT_VERSION = "version_1"
+JUDGE_PROMPT_VERSION = "version_4"
 JUDGE_MODEL = "gpt-5"
 EFFORT_LEVEL_JUDGE = "medium"
+# Fan-out judge: criteria groups of the fan-out prompt version are evaluated by concurrent calls and
+# merged, with the overall assessment computed locally
+JUDGE_FAN_OUT = os.getenv("JUDGE_FAN_OUT", "0") == "1"
+JUDGE_FAN_OUT_PROMPT_VERSION = "version_5"
 
 
 # Q&A SUMMARY EARNINGS
@@ -33,3 +40,104 @@ OVERVIEW_PROMPT_VERSION = "version_2"
 
 # Config do PDFProcessor
 MAX_FILE_SIZE_MB = 10
+
+
+# Summary workflow execution: "thread" (one worker thread per job) or "asyncio"
+# (one task per job on the API event loop, AsyncOpenAI calls, cancellation by task.cancel)
+SUMMARY_WORKFLOW_MODE = os.getenv("SUMMARY_WORKFLOW_MODE", "thread")
+
+# Stream the Q&A summary and persist each completed analyst/topic block to q_a_summary.json.
+# The rate limiter resyncs from the x-ratelimit-* headers of the streaming HTTP response
+Q_A_STREAMING = os.getenv("Q_A_STREAMING", "1") == "1"
+
+# Map-reduce Q&A summary: call types listed here whose Q&A transcript has at least this many
+# characters are split at analyst-exchange boundaries and the chunks summarized concurrently
+Q_A_CHUNKED_MIN_CHARS = {"earnings": 60000}
+Q_A_CHUNK_TARGET_CHARS = 25000
+Q_A_MAX_CHUNKS = 6
+
+# Shared LLM HTTP connection pool (one per provider, reused by every stage and job)
+LLM_HTTP_MAX_CONNECTIONS = 20
+LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS = 120
+LLM_HTTP_CONNECT_TIMEOUT_SECONDS = 10
+LLM_HTTP_READ_TIMEOUT_SECONDS = 600
+
+# LLM response cache keyed by model, effort, schema, prompts and max tokens:
+# "disk" (LRU files under LLM_RESPONSE_CACHE_DIR), "memcached" or "none"
+LLM_RESPONSE_CACHE_BACKEND = os.getenv("LLM_RESPONSE_CACHE_BACKEND", "none")
+LLM_RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("LLM_RESPONSE_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_RESPONSE_CACHE_MAX_MB = 200
+# Kept outside the job cache directory, whose cleanup treats every subdirectory as a job
+LLM_RESPONSE_CACHE_DIR = os.getenv("LLM_RESPONSE_CACHE_DIR", "llm_response_cache")
+# The disk cache directory is swept (TTL and size) at most this often, or sooner once it outgrows the limit
+LLM_RESPONSE_CACHE_SWEEP_SECONDS = 15 * 60
+LLM_RESPONSE_CACHE_MEMCACHED_SERVER = os.getenv("LLM_RESPONSE_CACHE_MEMCACHED_SERVER", "127.0.0.1:11211")
+
+# Process-wide LLM rate limits per model (starting values; corrected from the x-ratelimit-* headers)
+LLM_RATE_LIMITS = {
+    "gpt-5": {"requests_per_minute": 500, "tokens_per_minute": 500000},
+    "gpt-5-mini": {"requests_per_minute": 500, "tokens_per_minute": 500000},
+}
+LLM_DEFAULT_RATE_LIMIT = {"requests_per_minute": 500, "tokens_per_minute": 200000}
+
+# Retries of failed LLM calls in the client layer (jittered exponential backoff, Retry-After honoured)
+LLM_RETRY_MAX_ATTEMPTS = 3
+LLM_RETRY_BASE_DELAY_SECONDS = 2.0
+LLM_RETRY_MAX_DELAY_SECONDS = 30.0
+
+# Hedged requests: once a call outlives this latency percentile of its stage (after enough samples),
+# a duplicate is fired and the first response wins; hedges are capped at a share of all calls
+LLM_HEDGING = os.getenv("LLM_HEDGING", "0") == "1"
+LLM_HEDGE_PERCENTILE = 0.95
+LLM_HEDGE_MIN_SAMPLES = 20
+LLM_HEDGE_MAX_RATIO = 0.1
+
+# LLMLingua-2 compression of the TRANSCRIPT placeholder (requires llmlingua). Rates are the share of
+# tokens kept per stage; the judge checks the summary against the transcript, so it stays uncompressed
+PROMPT_COMPRESSION = os.getenv("PROMPT_COMPRESSION", "0") == "1"
+PROMPT_COMPRESSION_RATES = {"q_a_summary": 0.7, "overview": 0.5, "judge": 1.0}
+PROMPT_COMPRESSION_MODEL = "microsoft/llmlingua-2-xlm-roberta-large-meetingbank"
+PROMPT_COMPRESSION_DEVICE = os.getenv("PROMPT_COMPRESSION_DEVICE", "cpu")
+# Shorter lines (speaker headers, page headers) are kept verbatim
+PROMPT_COMPRESSION_MIN_LINE_CHARS = 200
+
+# Model limits used by the pre-flight context-window check and the adaptive output budget
+MODEL_CONTEXT_WINDOWS = {"gpt-5": 400000, "gpt-5-mini": 400000}
+MODEL_MAX_OUTPUT_TOKENS = {"gpt-5": 128000, "gpt-5-mini": 128000}
+DEFAULT_CONTEXT_WINDOW = 128000
+DEFAULT_MAX_OUTPUT_TOKENS = 16000
+
+# Adaptive Q&A max_output_tokens: base + per analyst + per analyst question (by summary length),
+# times a safety margin, plus headroom for reasoning tokens at the stage's effort level
+Q_A_OUTPUT_TOKENS_BASE = 300
+Q_A_OUTPUT_TOKENS_PER_ANALYST = 60
+Q_A_OUTPUT_TOKENS_PER_QUESTION = {"short": 150, "long": 350}
+Q_A_OUTPUT_BUDGET_SAFETY = 1.5
+Q_A_OUTPUT_BUDGET_MIN = 4000
+REASONING_TOKEN_RESERVE = {"minimal": 2000, "low": 6000, "medium": 16000, "high": 32000}
+
+# Offline LLM simulator: models named "sim:<model>" (or every model with LLM_SIMULATOR=1) are served
+# locally with schema-valid structured output, for load tests of the workflow without network access
+LLM_SIMULATOR = os.getenv("LLM_SIMULATOR", "0") == "1"
+LLM_SIMULATOR_MODEL_PREFIX = "sim:"
+# Multiplies every simulated delay (e.g. 0.01 to run a load test in seconds)
+LLM_SIMULATOR_LATENCY_SCALE = float(os.getenv("LLM_SIMULATOR_LATENCY_SCALE", "1.0"))
+# Latency = lognormal time to first token + output tokens / tokens_per_second
+LLM_SIMULATOR_PROFILES = {
+    "gpt-5": {"ttft_median_seconds": 4.0, "ttft_sigma": 0.6, "tokens_per_second": 60},
+    "gpt-5-mini": {"ttft_median_seconds": 1.5, "ttft_sigma": 0.5, "tokens_per_second": 120},
+}
+LLM_SIMULATOR_DEFAULT_PROFILE = {"ttft_median_seconds": 2.0, "ttft_sigma": 0.5, "tokens_per_second": 80}
+# Median reasoning tokens per effort level (lognormal around it)
+LLM_SIMULATOR_REASONING_TOKENS = {"minimal": 0, "low": 800, "medium": 3000, "high": 8000}
+# Provider-side limits behind the simulated x-ratelimit-* headers and 429s (defaults to our own limits)
+LLM_SIMULATOR_RATE_LIMITS = json.loads(os.getenv("LLM_SIMULATOR_RATE_LIMITS", "null")) or LLM_RATE_LIMITS
+# Injected failures per call, e.g. {"429": 0.05, "500": 0.02, "503": 0.02, "timeout": 0.01}
+LLM_SIMULATOR_ERROR_RATES = json.loads(os.getenv("LLM_SIMULATOR_ERROR_RATES", "{}"))
+# Share of calls cut short with status "incomplete", on top of calls that exceed max_output_tokens
+LLM_SIMULATOR_TRUNCATION_RATE = float(os.getenv("LLM_SIMULATOR_TRUNCATION_RATE", "0"))
+# How long an injected timeout hangs before failing (scaled like every other delay)
+LLM_SIMULATOR_TIMEOUT_SECONDS = float(os.getenv("LLM_SIMULATOR_TIMEOUT_SECONDS", str(LLM_HTTP_READ_TIMEOUT_SECONDS)))
+LLM_SIMULATOR_JUDGE_PASS_RATE = 0.85
+LLM_SIMULATOR_SEED = os.getenv("LLM_SIMULATOR_SEED")
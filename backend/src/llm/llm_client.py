@@ -1,14 +1,32 @@
 from pydantic import BaseModel
 
+import asyncio
 import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from abc import ABC, abstractmethod
 from dotenv import load_dotenv
-from typing import Optional, Type, Any
+from typing import Optional, Type, Any, Dict, Tuple, Callable
 import time
 
+import httpx
 # import google.generativeai as genai
 # from google.generativeai import types
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+
+from src.llm.partial_json import StreamingArrayExtractor
+from src.llm.rate_limiter import ModelRateLimiter, Reservation, estimate_request_tokens, get_rate_limiter, get_rate_limiter_stats, parse_reset_duration
+from src.llm.response_cache import RESPONSE_CACHE_STATS, get_response_cache, response_cache_key
+from src.llm.retry_policy import PartialGate, RetryPolicy, get_hedge_policy, get_latency_tracker
+from src.config.runtime import (
+    LLM_HTTP_MAX_CONNECTIONS,
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    LLM_HTTP_CONNECT_TIMEOUT_SECONDS,
+    LLM_HTTP_READ_TIMEOUT_SECONDS,
+    LLM_SIMULATOR,
+    LLM_SIMULATOR_MODEL_PREFIX,
+)
 
 
 load_dotenv()
@@ -26,6 +44,13 @@ class LLMResponse(BaseModel):
     remaining_tokens: Optional[int] = None
     # Reasoning tokens when available (e.g., gpt-5)
     reasoning_tokens: Optional[int] = None
+    # Input tokens served from the provider's prompt cache (usage.input_tokens_details.cached_tokens)
+    cached_tokens: Optional[int] = None
+    # True when the response was served by the LLM response cache instead of the API
+    cache_hit: bool = False
+    # Attempts made by the retry policy and whether a hedged duplicate was fired
+    attempts: int = 1
+    hedged: bool = False
     # Round-trip duration in seconds for the LLM API call
     duration_seconds: Optional[float] = None
 
@@ -50,21 +75,162 @@ class BaseLLMClient(ABC):
         """Generates a response from the LLM."""
         pass
 
+    async def agenerate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_output_tokens: int,
+        **kwargs
+    ) -> LLMResponse:
+        """Coroutine version of generate; clients without a native async API run it in a worker thread."""
+        return await asyncio.to_thread(
+            self.generate, system_prompt, user_prompt, max_output_tokens, **kwargs)
+
+
+class HttpConnectionPool:
+    """
+    One keep-alive HTTP connection pool per provider config, shared by every client of that provider,
+    so each stage reuses warm TCP/TLS connections instead of opening new ones.
+    """
+
+    def __init__(self, provider: str, base_url: Optional[str] = None):
+        self.provider = provider
+        self.base_url = base_url
+        self.limits = httpx.Limits(
+            max_connections=LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        self.timeout = httpx.Timeout(
+            LLM_HTTP_READ_TIMEOUT_SECONDS, connect=LLM_HTTP_CONNECT_TIMEOUT_SECONDS)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._awaiting_response = 0
+        # Created on first async use so it binds to the running event loop
+        self._async_http_client: Optional[httpx.AsyncClient] = None
+        self.http_client = httpx.Client(
+            limits=self.limits,
+            timeout=self.timeout,
+            follow_redirects=True,
+            event_hooks={"request": [self._on_request],
+                         "response": [self._on_response]},
+        )
+
+    def _on_request(self, request) -> None:
+        with self._lock:
+            self._requests += 1
+            self._awaiting_response += 1
+
+    def _on_response(self, response) -> None:
+        with self._lock:
+            self._awaiting_response = max(0, self._awaiting_response - 1)
+
+    async def _aon_request(self, request) -> None:
+        self._on_request(request)
+
+    async def _aon_response(self, response) -> None:
+        self._on_response(response)
+
+    def get_async_http_client(self) -> httpx.AsyncClient:
+        with self._lock:
+            if self._async_http_client is None:
+                self._async_http_client = httpx.AsyncClient(
+                    limits=self.limits,
+                    timeout=self.timeout,
+                    follow_redirects=True,
+                    event_hooks={"request": [self._aon_request],
+                                 "response": [self._aon_response]},
+                )
+            return self._async_http_client
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "provider": self.provider,
+                "base_url": self.base_url,
+                "requests": self._requests,
+                "awaiting_response": self._awaiting_response,
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry_seconds": self.limits.keepalive_expiry,
+            }
+        # Open/idle connection counts come from the transport internals; best-effort only
+        clients = [("", self.http_client)]
+        if self._async_http_client is not None:
+            clients.append(("async_", self._async_http_client))
+        for prefix, client in clients:
+            try:
+                connections = list(client._transport._pool.connections)
+                stats[f"{prefix}open_connections"] = len(connections)
+                stats[f"{prefix}idle_connections"] = sum(
+                    1 for conn in connections if conn.is_idle())
+            except Exception:
+                pass
+        return stats
+
+    def close(self) -> None:
+        self.http_client.close()
+
+    async def aclose(self) -> None:
+        self.close()
+        if self._async_http_client is not None:
+            await self._async_http_client.aclose()
+
+
+# Process-wide registries: provider config -> HTTP pool, (provider, model, base_url) -> client
+_HTTP_POOLS: Dict[Tuple[str, Optional[str]], HttpConnectionPool] = {}
+_LLM_CLIENTS: Dict[Tuple[str, str, Optional[str]], BaseLLMClient] = {}
+_REGISTRY_LOCK = threading.Lock()
+# Workers for sync calls that may be hedged (primary and duplicate both run here)
+_HEDGE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=LLM_HTTP_MAX_CONNECTIONS * 2, thread_name_prefix="llm-hedge")
+
+
+def get_http_pool(provider: str, base_url: Optional[str] = None) -> HttpConnectionPool:
+    with _REGISTRY_LOCK:
+        key = (provider, base_url)
+        if key not in _HTTP_POOLS:
+            _HTTP_POOLS[key] = HttpConnectionPool(provider, base_url)
+        return _HTTP_POOLS[key]
+
 
 class OpenAIClient(BaseLLMClient):
     """LLM Client for OpenAI's GPT models."""
 
-    def __init__(self, model: str = "gpt-5-mini"):
+    def __init__(self, model: str = "gpt-5-mini", http_pool: Optional[HttpConnectionPool] = None):
         super().__init__(model)
 
         api_key = os.getenv("OPENAI_API_KEY")
-        self.client = OpenAI(api_key=api_key)
-        
-
-    def generate(self, system_prompt: str, user_prompt: str, max_output_tokens: int,
-                 effort_level: Optional[str] = "medium",
-                 text_format: Optional[Type[BaseModel]] = None) -> LLMResponse:
-
+        base_url = os.getenv("OPENAI_BASE_URL") or None
+        self.http_pool = http_pool or get_http_pool("openai", base_url)
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=self.http_pool.timeout,
+            http_client=self.http_pool.http_client,
+            # Retries are owned by RetryPolicy so they go through the rate limiter and are counted
+            max_retries=0,
+        )
+        self._api_key = api_key
+        self._base_url = base_url
+        self._async_client: Optional[AsyncOpenAI] = None
+        self.retry_policy = RetryPolicy()
+        self.hedge_policy = get_hedge_policy(model)
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self._api_key,
+                base_url=self._base_url,
+                timeout=self.http_pool.timeout,
+                http_client=self.http_pool.get_async_http_client(),
+                max_retries=0,
+            )
+        return self._async_client
+
+    def _request_args(self, system_prompt: str, user_prompt: str, max_output_tokens: int,
+                      effort_level: Optional[str], prompt_cache_key: Optional[str] = None) -> dict:
         base = {
             "model": self.model,
             "instructions": system_prompt,
@@ -76,63 +242,363 @@ class OpenAIClient(BaseLLMClient):
         #Only gpt-5 support effort level for reasoning
         if effort_level and self.model == "gpt-5":
             base["reasoning"] = {"effort": effort_level}
+        # Routes requests sharing a static prompt prefix to the same prompt cache
+        if prompt_cache_key:
+            base["extra_body"] = {"prompt_cache_key": prompt_cache_key}
+        return base
 
+    def generate(self, system_prompt: str, user_prompt: str, max_output_tokens: int,
+                 effort_level: Optional[str] = "medium",
+                 text_format: Optional[Type[BaseModel]] = None,
+                 stream: bool = False,
+                 on_partial: Optional[Callable[[str, dict, dict], None]] = None,
+                 prompt_cache_key: Optional[str] = None,
+                 stage: Optional[str] = None) -> LLMResponse:
+        """
+        With stream=True (structured output only) the response is consumed as events and every completed
+        object of a top-level "analysts"/"topics" array is passed to on_partial(array_key, item, fields)
+        before the final parsed object is available; on_partial.reset(), if defined, is called before a retry.
+        Retryable failures (timeouts, connection errors, 429/5xx) are retried with jittered backoff; with
+        hedging on, a call slower than its stage's latency percentile is duplicated and the first response wins.
+        """
+
+        def call(partial_callback) -> LLMResponse:
+            return self._call(system_prompt, user_prompt, max_output_tokens, effort_level,
+                              text_format, stream, partial_callback, prompt_cache_key)
+
+        attempt = 1
+        while True:
+            try:
+                response = self._hedged(call, on_partial, stage)
+                response.attempts = attempt
+                return response
+            except LLMClientError as e:
+                delay = self.retry_policy.next_delay(attempt, e.__cause__)
+                if delay is None:
+                    raise
+                print(f"LLM call failed (attempt {attempt}/{self.retry_policy.max_attempts}), retrying in {delay:.1f}s: {e}")
+                # The next attempt streams from the start: drop the blocks the failed one delivered
+                self._reset_partial(on_partial)
+                time.sleep(delay)
+                attempt += 1
+
+    def _hedged(self, call: Callable, on_partial, stage: Optional[str]) -> LLMResponse:
+        tracker = get_latency_tracker(self.model, stage)
+        hedge_after = self.hedge_policy.hedge_after(tracker)
+        if hedge_after is None:
+            response = call(on_partial)
+            tracker.record(response.duration_seconds)
+            return response
+
+        gate = PartialGate(on_partial)
+
+        def timed(partial_callback) -> LLMResponse:
+            response = call(partial_callback)
+            tracker.record(response.duration_seconds)
+            return response
+
+        pending = {_HEDGE_EXECUTOR.submit(timed, gate)}
+        done, _ = wait(pending, timeout=hedge_after)
+        hedged = False
+        if not done and self.hedge_policy.try_spend():
+            # The duplicate does not stream: partial blocks keep coming from the primary only
+            pending.add(_HEDGE_EXECUTOR.submit(timed, None))
+            hedged = True
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # A losing sync call keeps running in its worker; the limiter still settles its tokens
+                    gate.close()
+                    response = future.result()
+                    response.hedged = hedged
+                    return response
+                error = future.exception()
+        raise error
+
+    async def _ahedged(self, call: Callable, on_partial, stage: Optional[str]) -> LLMResponse:
+        tracker = get_latency_tracker(self.model, stage)
+        hedge_after = self.hedge_policy.hedge_after(tracker)
+        if hedge_after is None:
+            response = await call(on_partial)
+            tracker.record(response.duration_seconds)
+            return response
+
+        gate = PartialGate(on_partial)
+
+        async def timed(partial_callback) -> LLMResponse:
+            response = await call(partial_callback)
+            tracker.record(response.duration_seconds)
+            return response
+
+        pending = {asyncio.create_task(timed(gate))}
+        hedged = False
+        try:
+            done, _ = await asyncio.wait(pending, timeout=hedge_after)
+            if not done and self.hedge_policy.try_spend():
+                pending.add(asyncio.create_task(timed(None)))
+                hedged = True
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        gate.close()
+                        response = task.result()
+                        response.hedged = hedged
+                        return response
+                    error = task.exception()
+            raise error
+        finally:
+            # The loser (or everything, when the caller is cancelled) is cancelled with its HTTP request
+            for task in pending:
+                task.cancel()
+
+    def _call(self, system_prompt: str, user_prompt: str, max_output_tokens: int,
+              effort_level: Optional[str], text_format: Optional[Type[BaseModel]],
+              stream: bool, on_partial, prompt_cache_key: Optional[str]) -> LLMResponse:
+        """One API call: reserve rate-limit budget, call, settle."""
+        base = self._request_args(
+            system_prompt, user_prompt, max_output_tokens, effort_level, prompt_cache_key)
+
+        # Wait for this model's process-wide token/request budget before calling the API
+        limiter = get_rate_limiter(self.model)
+        reservation = limiter.reserve(
+            estimate_request_tokens(system_prompt, user_prompt, max_output_tokens))
+        try:
+            if stream and text_format is not None:
+                return self._generate_streaming(base, text_format, on_partial, limiter, reservation)
+            return self._generate_once(base, text_format, limiter, reservation)
+        except LLMClientError as e:
+            self._on_api_error(limiter, e.__cause__)
+            raise
+        finally:
+            limiter.settle(reservation, None)
+
+    def _generate_once(self, base: dict, text_format: Optional[Type[BaseModel]],
+                       limiter: ModelRateLimiter, reservation: Reservation) -> LLMResponse:
         try:
             #Track output generation time
             start_time = time.time()
 
-            # Initialize status to a default value
-            status = "unknown"
-
             # Use raw responses to access headers for rate limit info
-           
             if text_format is not None:
                 raw_api_resp = self.client.responses.with_raw_response.parse(
                     **base,
                     text_format=text_format,
                 )
-               
-                response = raw_api_resp.parse()
-
-                text_output = getattr(response, "output_text", "") or ""
+            else:
+                raw_api_resp = self.client.responses.with_raw_response.create(
+                    **base)
+            response = raw_api_resp.parse()
+            text_output, status, parsed_resp = self._read_output(
+                response, text_format)
 
-                #get status before possible json parsing error 
-                status = getattr(response, "status", None) or "unknown"
+        except Exception as e:
+            raise LLMClientError(f"OpenAI API error: {e}") from e
+
+        return self._to_llm_response(
+            raw_api_resp, response, text_output, status, parsed_resp, start_time, limiter, reservation)
+
+    async def agenerate(self, system_prompt: str, user_prompt: str, max_output_tokens: int,
+                        effort_level: Optional[str] = "medium",
+                        text_format: Optional[Type[BaseModel]] = None,
+                        stream: bool = False,
+                        on_partial: Optional[Callable[[str, dict, dict], None]] = None,
+                        prompt_cache_key: Optional[str] = None,
+                        stage: Optional[str] = None) -> LLMResponse:
+        """Same request, retries and hedging as generate, awaited on the event loop through AsyncOpenAI."""
+
+        def call(partial_callback):
+            return self._acall(system_prompt, user_prompt, max_output_tokens, effort_level,
+                               text_format, stream, partial_callback, prompt_cache_key)
+
+        attempt = 1
+        while True:
+            try:
+                response = await self._ahedged(call, on_partial, stage)
+                response.attempts = attempt
+                return response
+            except LLMClientError as e:
+                delay = self.retry_policy.next_delay(attempt, e.__cause__)
+                if delay is None:
+                    raise
+                print(f"LLM call failed (attempt {attempt}/{self.retry_policy.max_attempts}), retrying in {delay:.1f}s: {e}")
+                # The next attempt streams from the start: drop the blocks the failed one delivered
+                self._reset_partial(on_partial)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _acall(self, system_prompt: str, user_prompt: str, max_output_tokens: int,
+                     effort_level: Optional[str], text_format: Optional[Type[BaseModel]],
+                     stream: bool, on_partial, prompt_cache_key: Optional[str]) -> LLMResponse:
+        base = self._request_args(
+            system_prompt, user_prompt, max_output_tokens, effort_level, prompt_cache_key)
+
+        limiter = get_rate_limiter(self.model)
+        reservation = await limiter.areserve(
+            estimate_request_tokens(system_prompt, user_prompt, max_output_tokens))
+        try:
+            if stream and text_format is not None:
+                return await self._agenerate_streaming(base, text_format, on_partial, limiter, reservation)
+            return await self._agenerate_once(base, text_format, limiter, reservation)
+        except LLMClientError as e:
+            self._on_api_error(limiter, e.__cause__)
+            raise
+        finally:
+            limiter.settle(reservation, None)
+
+    async def _agenerate_once(self, base: dict, text_format: Optional[Type[BaseModel]],
+                              limiter: ModelRateLimiter, reservation: Reservation) -> LLMResponse:
+        try:
+            start_time = time.time()
 
-              
-                parsed_resp = getattr(response, "output_parsed", None)
-                text_output = parsed_resp.json() if parsed_resp is not None else ""
+            if text_format is not None:
+                raw_api_resp = await self.async_client.responses.with_raw_response.parse(
+                    **base,
+                    text_format=text_format,
+                )
             else:
-                raw_api_resp = self.client.responses.with_raw_response.create(
+                raw_api_resp = await self.async_client.responses.with_raw_response.create(
                     **base)
-                response = raw_api_resp.parse()
-                text_output = getattr(response, "output_text", None)
-
-          #  Fallback to manual text extraction
-          
-            if text_output is None:
-                print(
-                    "output_text attribute is not provided by the SDK. Aggregating the output text manually")
-              #Concatenate the output text
-                text_output = ""
-                for item in getattr(response, "output", []) or []:
-                    for part in getattr(item, "content", []) or []:
-                        if getattr(part, "type", None) == "output_text" and getattr(part, "text", None):
-                            text_output += part.text
-
-            if not text_output and text_format is None:
-                raise LLMClientError(
-                    f"Empty output from Responses API (status={status}). Raw: {response}")
+            response = await raw_api_resp.parse()
+            text_output, status, parsed_resp = self._read_output(
+                response, text_format)
+
+        except asyncio.CancelledError:
+            # Task cancellation must propagate, not turn into an API error
+            raise
+        except Exception as e:
+            raise LLMClientError(f"OpenAI API error: {e}") from e
+
+        return self._to_llm_response(
+            raw_api_resp, response, text_output, status, parsed_resp, start_time, limiter, reservation)
+
+    @staticmethod
+    def _on_api_error(limiter: ModelRateLimiter, error: Optional[BaseException]) -> None:
+        """Feed the rate-limit headers of a failed call back to the limiter; a 429 holds every caller back."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return
+        limiter.update_from_headers(headers)
+        if getattr(response, "status_code", None) == 429:
+            retry_after = parse_reset_duration(headers.get("retry-after"))
+            limiter.block_for(retry_after if retry_after is not None else 1.0)
+
+    @staticmethod
+    def _reset_partial(on_partial) -> None:
+        reset = getattr(on_partial, "reset", None)
+        if reset is not None:
+            try:
+                reset()
+            except Exception as e:
+                print(f"Partial output reset failed: {e}")
+
+    @staticmethod
+    def _feed_partial(extractor: StreamingArrayExtractor, event, on_partial) -> None:
+        if getattr(event, "type", None) != "response.output_text.delta":
+            return
+        for array_key, item in extractor.feed(getattr(event, "delta", "") or ""):
+            if on_partial is not None:
+                try:
+                    on_partial(array_key, item, dict(extractor.fields))
+                except Exception as e:
+                    # A failing progress callback must not abort the generation
+                    print(f"Partial output callback failed: {e}")
+
+    @staticmethod
+    def _stream_http_response(stream):
+        """The HTTP response behind a Responses stream; its x-ratelimit-* headers arrive when the stream opens."""
+        raw_stream = getattr(stream, "_raw_stream", None)
+        return getattr(raw_stream, "response", None) or getattr(stream, "_response", None)
+
+    def _generate_streaming(self, base: dict, text_format: Type[BaseModel], on_partial,
+                            limiter: ModelRateLimiter, reservation: Reservation) -> LLMResponse:
+        extractor = StreamingArrayExtractor()
+        try:
+            start_time = time.time()
+            with self.client.responses.stream(**base, text_format=text_format) as stream:
+                for event in stream:
+                    self._feed_partial(extractor, event, on_partial)
+                response = stream.get_final_response()
+            text_output, status, parsed_resp = self._read_output(
+                response, text_format)
 
         except Exception as e:
-            raise LLMClientError(f"OpenAI API error: {e}")
+            raise LLMClientError(f"OpenAI API error: {e}") from e
+
+        return self._to_llm_response(
+            self._stream_http_response(stream), response, text_output, status, parsed_resp,
+            start_time, limiter, reservation)
 
+    async def _agenerate_streaming(self, base: dict, text_format: Type[BaseModel], on_partial,
+                                   limiter: ModelRateLimiter, reservation: Reservation) -> LLMResponse:
+        extractor = StreamingArrayExtractor()
+        try:
+            start_time = time.time()
+            async with self.async_client.responses.stream(**base, text_format=text_format) as stream:
+                async for event in stream:
+                    self._feed_partial(extractor, event, on_partial)
+                response = await stream.get_final_response()
+            text_output, status, parsed_resp = self._read_output(
+                response, text_format)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            raise LLMClientError(f"OpenAI API error: {e}") from e
+
+        return self._to_llm_response(
+            self._stream_http_response(stream), response, text_output, status, parsed_resp,
+            start_time, limiter, reservation)
+
+    def _read_output(self, response, text_format: Optional[Type[BaseModel]]) -> Tuple[str, str, Optional[BaseModel]]:
+        # Initialize status to a default value
+        status = "unknown"
+        parsed_resp = None
+
+        if text_format is not None:
+            text_output = getattr(response, "output_text", "") or ""
+
+            #get status before possible json parsing error 
+            status = getattr(response, "status", None) or "unknown"
+
+            parsed_resp = getattr(response, "output_parsed", None)
+            text_output = parsed_resp.json() if parsed_resp is not None else ""
+        else:
+            text_output = getattr(response, "output_text", None)
+
+        #  Fallback to manual text extraction
+        if text_output is None:
+            print(
+                "output_text attribute is not provided by the SDK. Aggregating the output text manually")
+            #Concatenate the output text
+            text_output = ""
+            for item in getattr(response, "output", []) or []:
+                for part in getattr(item, "content", []) or []:
+                    if getattr(part, "type", None) == "output_text" and getattr(part, "text", None):
+                        text_output += part.text
+
+        if not text_output and text_format is None:
+            raise LLMClientError(
+                f"Empty output from Responses API (status={status}). Raw: {response}")
+
+        return text_output, status, parsed_resp
+
+    def _to_llm_response(self, raw_api_resp, response, text_output: str, status: str,
+                         parsed_resp: Optional[BaseModel], start_time: float,
+                         limiter: Optional[ModelRateLimiter] = None,
+                         reservation: Optional[Reservation] = None) -> LLMResponse:
         # Usage information
         usage = getattr(response, "usage", None)
         in_tok = getattr(usage, "input_tokens", None) if usage else None
         out_tok = getattr(usage, "output_tokens", None) if usage else None
         reasoning_tok = getattr(
             usage, "reasoning_tokens", None) if usage else None
+        input_details = getattr(usage, "input_tokens_details", None) if usage else None
+        cached_tok = getattr(input_details, "cached_tokens", None) if input_details else None
 
         # Calculate Duration
         duration_seconds = max(0.0, time.time() - start_time)
@@ -154,28 +620,211 @@ class OpenAIClient(BaseLLMClient):
         except Exception:
             remaining_tokens = None
 
+        if limiter is not None and reservation is not None:
+            # Settle first so the header sync only discounts the other calls still in flight
+            limiter.settle(reservation, (in_tok or 0) + (out_tok or 0))
+            limiter.update_from_headers(getattr(raw_api_resp, "headers", None))
+
         return LLMResponse(
             text=text_output,
             model=self.model,
             input_tokens=in_tok or 0,
             output_tokens=out_tok or 10,
             finish_reason=status,
-            parsed=parsed_resp if text_format is not None else None,
+            parsed=parsed_resp,
             raw=response,
             remaining_tokens=remaining_tokens,
             reasoning_tokens=reasoning_tok if reasoning_tok is not None else None,
+            cached_tokens=cached_tok,
             duration_seconds=duration_seconds,
         )
 
 
+class CachedLLMClient(BaseLLMClient):
+    """
+    Content-addressed response cache in front of a client: a request identical to an earlier completed
+    one (model, effort, schema, prompts, max tokens) is answered from the cache without an API call.
+    Truncated or unparsed responses are never stored. With no cache backend every call goes straight through.
+    """
+
+    def __init__(self, inner: BaseLLMClient, cache=None):
+        super().__init__(inner.model)
+        self.inner = inner
+        self.cache = cache
+        self.http_pool = getattr(inner, "http_pool", None)
+
+    def generate(self, system_prompt: str, user_prompt: str, max_output_tokens: int,
+                 effort_level: Optional[str] = "medium",
+                 text_format: Optional[Type[BaseModel]] = None,
+                 stage: Optional[str] = None,
+                 **kwargs) -> LLMResponse:
+        if self.cache is None:
+            return self.inner.generate(system_prompt, user_prompt, max_output_tokens,
+                                       effort_level=effort_level, text_format=text_format, stage=stage, **kwargs)
+
+        key = self._key(system_prompt, user_prompt, max_output_tokens, effort_level, text_format)
+        cached = self._lookup(key, text_format, stage, kwargs.get("on_partial"))
+        if cached is not None:
+            return cached
+        response = self.inner.generate(system_prompt, user_prompt, max_output_tokens,
+                                       effort_level=effort_level, text_format=text_format, stage=stage, **kwargs)
+        self._store(key, response, text_format, stage)
+        return response
+
+    async def agenerate(self, system_prompt: str, user_prompt: str, max_output_tokens: int,
+                        effort_level: Optional[str] = "medium",
+                        text_format: Optional[Type[BaseModel]] = None,
+                        stage: Optional[str] = None,
+                        **kwargs) -> LLMResponse:
+        if self.cache is None:
+            return await self.inner.agenerate(system_prompt, user_prompt, max_output_tokens,
+                                              effort_level=effort_level, text_format=text_format, stage=stage, **kwargs)
+
+        key = self._key(system_prompt, user_prompt, max_output_tokens, effort_level, text_format)
+        # Backend reads/writes are blocking (file system or memcached socket)
+        cached = await asyncio.to_thread(
+            self._lookup, key, text_format, stage, kwargs.get("on_partial"))
+        if cached is not None:
+            return cached
+        response = await self.inner.agenerate(system_prompt, user_prompt, max_output_tokens,
+                                              effort_level=effort_level, text_format=text_format, stage=stage, **kwargs)
+        await asyncio.to_thread(self._store, key, response, text_format, stage)
+        return response
+
+    def _key(self, system_prompt: str, user_prompt: str, max_output_tokens: int,
+             effort_level: Optional[str], text_format: Optional[Type[BaseModel]]) -> str:
+        schema = text_format.model_json_schema() if text_format is not None else None
+        return response_cache_key(self.model, effort_level, schema, system_prompt, user_prompt, max_output_tokens)
+
+    def _lookup(self, key: str, text_format: Optional[Type[BaseModel]], stage: Optional[str],
+                on_partial: Optional[Callable[[str, dict, dict], None]]) -> Optional[LLMResponse]:
+        start_time = time.time()
+        try:
+            stored = self.cache.get(key)
+        except Exception as e:
+            print(f"LLM response cache read failed: {e}")
+            RESPONSE_CACHE_STATS.record(stage, "errors")
+            return None
+
+        response = self._from_cache(stored, text_format, start_time) if stored else None
+        if response is None:
+            RESPONSE_CACHE_STATS.record(stage, "misses")
+            return None
+        RESPONSE_CACHE_STATS.record(
+            stage, "hits", saved_tokens=response.input_tokens + response.output_tokens)
+        if on_partial is not None and response.parsed is not None:
+            self._replay_partials(response.parsed, on_partial)
+        return response
+
+    def _store(self, key: str, response: LLMResponse, text_format: Optional[Type[BaseModel]], stage: Optional[str]) -> None:
+        if response.finish_reason != "completed" or (text_format is not None and response.parsed is None):
+            return
+        try:
+            self.cache.set(key, {
+                "text": response.text,
+                "model": response.model,
+                "input_tokens": response.input_tokens,
+                "output_tokens": response.output_tokens,
+                "reasoning_tokens": response.reasoning_tokens,
+                "finish_reason": response.finish_reason,
+            })
+            RESPONSE_CACHE_STATS.record(stage, "stores")
+        except Exception as e:
+            print(f"LLM response cache write failed: {e}")
+            RESPONSE_CACHE_STATS.record(stage, "errors")
+
+    @staticmethod
+    def _from_cache(stored: dict, text_format: Optional[Type[BaseModel]], start_time: float) -> Optional[LLMResponse]:
+        try:
+            parsed = text_format.model_validate_json(stored["text"]) if text_format is not None else None
+            return LLMResponse(
+                text=stored["text"],
+                model=stored["model"],
+                input_tokens=stored.get("input_tokens") or 0,
+                output_tokens=stored.get("output_tokens") or 0,
+                finish_reason=stored.get("finish_reason"),
+                parsed=parsed,
+                reasoning_tokens=stored.get("reasoning_tokens"),
+                cache_hit=True,
+                duration_seconds=max(0.0, time.time() - start_time),
+            )
+        except Exception:
+            # Entry no longer matches the schema: treat as a miss and let the fresh response overwrite it
+            return None
+
+    @staticmethod
+    def _replay_partials(parsed: BaseModel, on_partial: Callable[[str, dict, dict], None]) -> None:
+        """Give streaming consumers the same per-block callbacks a live stream would have produced."""
+        data = parsed.model_dump()
+        fields = {k: v for k, v in data.items() if isinstance(v, str)}
+        for array_key in ("analysts", "topics"):
+            for item in data.get(array_key) or []:
+                try:
+                    on_partial(array_key, item, fields)
+                except Exception as e:
+                    print(f"Partial output callback failed: {e}")
+
+
 def get_llm_client(model: str) -> BaseLLMClient:
-   
+    """
+    Return the shared client for this model; clients of a provider share one connection pool and
+    sit behind the configured LLM response cache. "sim:<model>" (or any model with LLM_SIMULATOR=1)
+    returns the offline simulator of that model.
+    """
+    if LLM_SIMULATOR or model.startswith(LLM_SIMULATOR_MODEL_PREFIX):
+        # Imported here: the simulator subclasses OpenAIClient from this module
+        from src.llm.simulator import SimulatedLLMClient
+
+        model = model[len(LLM_SIMULATOR_MODEL_PREFIX):] if model.startswith(LLM_SIMULATOR_MODEL_PREFIX) else model
+        key = ("simulator", model, None)
+        with _REGISTRY_LOCK:
+            client = _LLM_CLIENTS.get(key)
+        if client is None:
+            created = CachedLLMClient(SimulatedLLMClient(model=model), get_response_cache())
+            with _REGISTRY_LOCK:
+                client = _LLM_CLIENTS.setdefault(key, created)
+        return client
     if model.startswith("gpt"):
-        return OpenAIClient(model=model)
+        key = ("openai", model, os.getenv("OPENAI_BASE_URL") or None)
+        with _REGISTRY_LOCK:
+            client = _LLM_CLIENTS.get(key)
+        if client is None:
+            # Built outside the lock: get_http_pool takes it too
+            created = CachedLLMClient(OpenAIClient(model=model), get_response_cache())
+            with _REGISTRY_LOCK:
+                client = _LLM_CLIENTS.setdefault(key, created)
+        return client
     else:
         raise ValueError(f"Unsupported model provider for model: {model}")
 
 
+def get_llm_pool_stats() -> Dict[str, Any]:
+    """Connection pool statistics for every provider pool and the models using it."""
+    with _REGISTRY_LOCK:
+        pools = list(_HTTP_POOLS.values())
+        clients = list(_LLM_CLIENTS.items())
+    result = []
+    for pool in pools:
+        stats = pool.stats()
+        stats["models"] = sorted(
+            key[1] for key, client in clients if getattr(client, "http_pool", None) is pool)
+        result.append(stats)
+    return {"pools": result, "clients": len(clients), "rate_limits": get_rate_limiter_stats()}
+
+
+async def aclose_llm_clients() -> None:
+    """Close every shared pool (sync and async HTTP clients)."""
+    with _REGISTRY_LOCK:
+        pools = list(_HTTP_POOLS.values())
+        _HTTP_POOLS.clear()
+        _LLM_CLIENTS.clear()
+    for pool in pools:
+        try:
+            await pool.aclose()
+        except Exception:
+            pass
+
+
 class LLMClientError(Exception):
     """Custom exception for all LLM client errors."""
     pass
@@ -1,12 +1,20 @@
 #    /llm_utils: (all are for earning call and conference) summarize_q_a, judge_q_a_summary, run_overview_workflow
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
-from src.llm.llm_client import get_llm_client
+import string
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.llm.llm_client import BaseLLMClient, LLMResponse, get_llm_client
+from src.llm.prompt_compression import compress_transcript, merge_compression_stats
 from typing import Tuple
 from src.config.runtime import (
     JUDGE_PROMPT_VERSION,
+    JUDGE_FAN_OUT,
+    JUDGE_FAN_OUT_PROMPT_VERSION,
     OVERVIEW_PROMPT_VERSION,
     EFFORT_LEVEL_Q_A,
     EFFORT_LEVEL_JUDGE,
@@ -18,7 +26,8 @@ from src.config.runtime import (
     CONFERENCE_LONG_QA_PROMPT_VERSION,
     CONFERENCE_LONG_BULLET_PROMPT_VERSION,
     Q_A_MODEL,
-    CONFERENCE_Q_A_MODEL
+    CONFERENCE_Q_A_MODEL,
+    Q_A_MAX_CHUNKS,
 )
 from pydantic import BaseModel
 from typing import List, Optional
@@ -130,6 +139,11 @@ class JudgeOutputFormat(BaseModel):
     overall_assessment: OverallAssessment
 
 
+class JudgeGroupOutputFormat(BaseModel):
+    """One criteria group of the fan-out judge; the overall assessment is computed after merging."""
+    evaluation_results: List[EvaluationResult]
+
+
 # Overall output format
 class Executive(BaseModel):
     executive_name: str
@@ -243,6 +257,55 @@ def _require_output_structure(d: dict, context: str) -> str:
     return json.dumps(structure, ensure_ascii=False)
 
 
+def _render_prompts(stage: str, prompt_version: str, system_prompt: str, user_prompt: str, static_values: dict, call_values: dict) -> Tuple[str, str, dict]:
+    """
+    Fill the prompt templates so the prefix the provider caches (instructions, then the user prompt up
+    to the first per-call value) is byte-identical for every call of a prompt version.
+    The system prompt may only use static values (output structures, call type); in the user prompt,
+    static blocks placed after the transcript/summary are reported as an unstable prefix.
+    Returns the processed prompts and the prefix info (hash, cache key, stability) for the metadata.
+    """
+    formatter = string.Formatter()
+
+    system_fields = {field for _, field, _, _ in formatter.parse(system_prompt) if field}
+    per_call_fields = system_fields - set(static_values)
+    if per_call_fields:
+        raise PromptConfigError(
+            f"{stage} system prompt {prompt_version} uses per-call placeholders {sorted(per_call_fields)}")
+
+    stable = True
+    prefix_template = ""
+    seen_call_value = False
+    for literal, field, _, _ in formatter.parse(user_prompt):
+        if not seen_call_value:
+            prefix_template += literal.replace("{", "{{").replace("}", "}}")
+        if not field:
+            continue
+        if field in call_values:
+            seen_call_value = True
+        elif seen_call_value:
+            stable = False
+        else:
+            prefix_template += "{" + field + "}"
+    if not stable:
+        logger.warning(
+            f"{stage} user prompt {prompt_version} places static blocks after the transcript; the cached prefix stops at the transcript")
+
+    processed_system_prompt = system_prompt.format(**static_values)
+    processed_user_prompt = user_prompt.format(**static_values, **call_values)
+
+    prefix = processed_system_prompt + "\n" + prefix_template.format(**static_values)
+    prefix_hash = hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
+    prompt_prefix = {
+        "stage": stage,
+        "prefix_hash": prefix_hash,
+        "prefix_chars": len(prefix),
+        "prefix_stable": stable,
+        "prompt_cache_key": f"{stage}:{prompt_version}:{prefix_hash}",
+    }
+    return processed_system_prompt, processed_user_prompt, prompt_prefix
+
+
 def get_prompt_config(call_type: str, summary_length: str, answer_format: str = "prose") -> dict:
     """
     Centralized function to determine prompt configuration based on call type, summary length, and answer format.
@@ -278,27 +341,8 @@ def get_prompt_config(call_type: str, summary_length: str, answer_format: str =
     }
 
 
-def summarize_q_a(qa_transcript: str, call_type: str, summary_length: str, prompt_version: str, model="gpt-5", effort_level=EFFORT_LEVEL_Q_A, text_format=None, answer_format="prose") -> dict:
-
-    logger.info("Calling Summarize Q&A")
-    llm_client = get_llm_client(model)
-    
-    logger.info("Initiated llm")
-
-    # Select the appropriate Pydantic model based on call type and answer format
-    if text_format is None:
-        if call_type == "conference":
-            if answer_format == "bullet":
-                text_format = ConferenceSummarizeOutputFormatBullet
-            else:
-                text_format = ConferenceSummarizeOutputFormat
-        else:
-            if answer_format == "bullet":
-                text_format = SummarizeOutputFormatBullet
-            else:
-                text_format = SummarizeOutputFormat
-
-    # Get prompts
+def _select_q_a_prompts(call_type: str, summary_length: str, answer_format: str, prompt_version: str) -> Tuple[str, str, str, int]:
+    """Q&A prompt templates, output structure (JSON) and the prompt's max_output_tokens for this configuration."""
     if call_type == "conference":
         # Conference calls use the long_conference.json file
         if answer_format == "bullet":
@@ -319,10 +363,8 @@ def summarize_q_a(qa_transcript: str, call_type: str, summary_length: str, promp
             prompts, "conference Q&A prompts")
         max_output_tokens = _require_params_max_tokens(
             prompts, "conference Q&A prompts")
-        effort_level = EFFORT_LEVEL_Q_A_CONFERENCE
 
     else:  # for earnig calls
-        effort_level = EFFORT_LEVEL_Q_A
         # Earnings calls use short_earning.json or long_earning.json based on summary_length
         if summary_length == "short":
             if answer_format == "bullet":
@@ -363,19 +405,84 @@ def summarize_q_a(qa_transcript: str, call_type: str, summary_length: str, promp
             max_output_tokens = _require_params_max_tokens(
                 prompts, "long Q&A prompts")
 
-    processed_user_prompt = user_prompt.format(TRANSCRIPT=qa_transcript)
-    processed_system_prompt = system_prompt.format(
-        OUTPUT_STRUCTURE=output_structure_json, CALL_TYPE=call_type)
+    return system_prompt, user_prompt, output_structure_json, max_output_tokens
+
+
+def _build_q_a_summary_request(qa_transcript: str, call_type: str, summary_length: str, prompt_version: str, model="gpt-5", effort_level=EFFORT_LEVEL_Q_A, text_format=None, answer_format="prose", on_partial=None, compression_rate: Optional[float] = None, max_output_tokens: Optional[int] = None) -> Tuple[BaseLLMClient, dict, dict]:
+
+    logger.info("Calling Summarize Q&A")
+    llm_client = get_llm_client(model)
     
+    logger.info("Initiated llm")
+
+    # Select the appropriate Pydantic model based on call type and answer format
+    if text_format is None:
+        if call_type == "conference":
+            if answer_format == "bullet":
+                text_format = ConferenceSummarizeOutputFormatBullet
+            else:
+                text_format = ConferenceSummarizeOutputFormat
+        else:
+            if answer_format == "bullet":
+                text_format = SummarizeOutputFormatBullet
+            else:
+                text_format = SummarizeOutputFormat
+
+    # Get prompts
+    system_prompt, user_prompt, output_structure_json, prompt_max_output_tokens = _select_q_a_prompts(
+        call_type, summary_length, answer_format, prompt_version)
+    effort_level = EFFORT_LEVEL_Q_A_CONFERENCE if call_type == "conference" else EFFORT_LEVEL_Q_A
+    # A per-job budget sized from the analyst/question counts replaces the prompt's fixed value
+    max_output_tokens_source = "adaptive" if max_output_tokens else "prompt"
+    max_output_tokens = max_output_tokens or prompt_max_output_tokens
+
+    qa_transcript, compression = compress_transcript(
+        qa_transcript, "q_a_summary", compression_rate)
+    processed_system_prompt, processed_user_prompt, prompt_prefix = _render_prompts(
+        "q_a_summary", prompt_version, system_prompt, user_prompt,
+        static_values={"OUTPUT_STRUCTURE": output_structure_json, "CALL_TYPE": call_type},
+        call_values={"TRANSCRIPT": qa_transcript})
+
     logger.info("finishing processing the prompts. Generating the summary now")
-    llm_response = llm_client.generate(
 
-        system_prompt=processed_system_prompt,
-        user_prompt=processed_user_prompt,
-        max_output_tokens=max_output_tokens,
-        effort_level=effort_level,
-        text_format=text_format
-    )
+    request = {
+        "system_prompt": processed_system_prompt,
+        "user_prompt": processed_user_prompt,
+        "max_output_tokens": max_output_tokens,
+        "effort_level": effort_level,
+        "text_format": text_format,
+        "prompt_cache_key": prompt_prefix["prompt_cache_key"],
+        "stage": prompt_prefix["stage"],
+    }
+    # Stream the response so each analyst/topic block can be persisted as soon as it is complete
+    if on_partial is not None:
+        request["stream"] = True
+        request["on_partial"] = on_partial
+    context = {
+        "model": model,
+        "summary_length": summary_length,
+        "answer_format": answer_format,
+        "prompt_version": prompt_version,
+        "effort_level": effort_level,
+        "output_structure_json": output_structure_json,
+        "call_type": call_type,
+        "max_output_tokens": max_output_tokens,
+        "max_output_tokens_source": max_output_tokens_source,
+        "prompt_prefix": prompt_prefix,
+        "compression": compression,
+    }
+    return llm_client, request, context
+
+
+def _q_a_summary_output(llm_response: LLMResponse, context: dict) -> dict:
+    model = context["model"]
+    summary_length = context["summary_length"]
+    answer_format = context["answer_format"]
+    prompt_version = context["prompt_version"]
+    effort_level = context["effort_level"]
+    output_structure_json = context["output_structure_json"]
+    call_type = context["call_type"]
+    max_output_tokens = context["max_output_tokens"]
 
     
     summary_text = llm_response.text  # to pass to judge llm
@@ -398,12 +505,19 @@ def summarize_q_a(qa_transcript: str, call_type: str, summary_length: str, promp
         "summary_structure": json.loads(output_structure_json),
         "call_type": call_type,
         "max_output_tokens": max_output_tokens,
+        "max_output_tokens_source": context["max_output_tokens_source"],
         "input_tokens": llm_response.input_tokens,
         "output_tokens": llm_response.output_tokens,
         "reasoning_tokens": llm_response.reasoning_tokens if model == "gpt-5" else None,
         "finish_reason": llm_response.finish_reason,
         "raw_response": llm_response.raw,  # for debugging
         "remaining_tokens": llm_response.remaining_tokens,
+        "cached_tokens": llm_response.cached_tokens,
+        "cache_hit": llm_response.cache_hit,
+        "attempts": llm_response.attempts,
+        "hedged": llm_response.hedged,
+        "prompt_prefix": context["prompt_prefix"],
+        "compression": context["compression"],
         "time": rounded_time,
     }
 
@@ -426,16 +540,186 @@ def summarize_q_a(qa_transcript: str, call_type: str, summary_length: str, promp
     return final_output
 
 
-def judge_q_a_summary(transcript: str, q_a_summary: str, summary_structure: str, prompt_version: str, model="gpt-5", effort_level=EFFORT_LEVEL_JUDGE, text_format=JudgeOutputFormat) -> dict:
+def summarize_q_a(qa_transcript: str, call_type: str, summary_length: str, prompt_version: str, model="gpt-5", effort_level=EFFORT_LEVEL_Q_A, text_format=None, answer_format="prose", on_partial=None, compression_rate: Optional[float] = None, max_output_tokens: Optional[int] = None) -> dict:
+    llm_client, request, context = _build_q_a_summary_request(
+        qa_transcript=qa_transcript, call_type=call_type, summary_length=summary_length, prompt_version=prompt_version, model=model, effort_level=effort_level, text_format=text_format, answer_format=answer_format, on_partial=on_partial, compression_rate=compression_rate, max_output_tokens=max_output_tokens)
+    llm_response = llm_client.generate(**request)
+    return _q_a_summary_output(llm_response, context)
+
+
+async def asummarize_q_a(qa_transcript: str, call_type: str, summary_length: str, prompt_version: str, model="gpt-5", effort_level=EFFORT_LEVEL_Q_A, text_format=None, answer_format="prose", on_partial=None, compression_rate: Optional[float] = None, max_output_tokens: Optional[int] = None) -> dict:
+    """Coroutine version of summarize_q_a: same prompts and metadata, awaited on the event loop."""
+    # Built in a worker thread: LLMLingua-2 compression is a blocking CPU-bound model call
+    llm_client, request, context = await asyncio.to_thread(
+        _build_q_a_summary_request,
+        qa_transcript=qa_transcript, call_type=call_type, summary_length=summary_length, prompt_version=prompt_version, model=model, effort_level=effort_level, text_format=text_format, answer_format=answer_format, on_partial=on_partial, compression_rate=compression_rate, max_output_tokens=max_output_tokens)
+    llm_response = await llm_client.agenerate(**request)
+    return _q_a_summary_output(llm_response, context)
+
+
+def merge_q_a_summaries(parts: List[BaseModel]) -> BaseModel:
+    """
+    Merge chunk summaries into one object of the same format, keeping chunk order.
+    Analysts split across two chunks are joined; conference topics with the same name are merged.
+    The title comes from the first chunk that has one.
+    """
+    text_format = type(parts[0])
+    title = next((part.title for part in parts if part.title), "")
+
+    if "topics" in text_format.model_fields:
+        topics: dict = {}
+        for part in parts:
+            for topic in part.topics:
+                key = " ".join(topic.topic.lower().split())
+                if key in topics:
+                    topics[key].question_answers.extend(topic.question_answers)
+                else:
+                    topics[key] = topic.model_copy(deep=True)
+        return text_format(title=title, topics=list(topics.values()))
+
+    analysts: list = []
+    for part in parts:
+        for analyst in part.analysts:
+            if analysts and (analysts[-1].name, analysts[-1].firm) == (analyst.name, analyst.firm):
+                analysts[-1].questions.extend(analyst.questions)
+            else:
+                analysts.append(analyst.model_copy(deep=True))
+    return text_format(title=title, analysts=analysts)
+
+
+def _chunked_q_a_output(results: List[dict], chunk_times: List[float], wall_time: float) -> dict:
+    parts = [result.get("summary", {}).get("obj") for result in results]
+    if any(part is None for part in parts):
+        raise LLMGenerationError(
+            "Chunked Q&A summary failed: a chunk did not return a parsed summary")
+    merged = merge_q_a_summaries(parts)
+
+    chunk_metadata = [result.get("metadata", {}) for result in results]
+    metadata = dict(chunk_metadata[0])
+    metadata.pop("raw_response", None)
+    for key in ("input_tokens", "output_tokens", "reasoning_tokens", "cached_tokens"):
+        values = [m.get(key) for m in chunk_metadata if m.get(key) is not None]
+        metadata[key] = sum(values) if values else None
+    # Surface the first abnormal finish reason (e.g. a truncated chunk)
+    metadata["finish_reason"] = next(
+        (m.get("finish_reason") for m in chunk_metadata if m.get("finish_reason") != "completed"),
+        chunk_metadata[0].get("finish_reason"))
+    remaining = [m.get("remaining_tokens") for m in chunk_metadata if m.get("remaining_tokens") is not None]
+    metadata["remaining_tokens"] = min(remaining) if remaining else None
+    metadata["time"] = round(wall_time)
+    metadata["cache_hit"] = all(m.get("cache_hit") for m in chunk_metadata)
+    metadata["compression"] = merge_compression_stats([m.get("compression") for m in chunk_metadata])
+    metadata["q_a_mode"] = "chunked"
+    metadata["chunks"] = [
+        {
+            "index": i,
+            "time": round(chunk_time, 2),
+            "input_tokens": m.get("input_tokens"),
+            "output_tokens": m.get("output_tokens"),
+            "cached_tokens": m.get("cached_tokens"),
+            "cache_hit": m.get("cache_hit"),
+            "attempts": m.get("attempts"),
+            "hedged": m.get("hedged"),
+            "finish_reason": m.get("finish_reason"),
+            "items": len(getattr(part, "analysts", None) or getattr(part, "topics", None) or []),
+        }
+        for i, (m, part, chunk_time) in enumerate(zip(chunk_metadata, parts, chunk_times))
+    ]
+
+    return {
+        "summary": {"text": merged.model_dump_json(), "obj": merged},
+        "metadata": metadata
+    }
+
+
+def summarize_q_a_chunked(chunks: List[str], call_type: str, summary_length: str, prompt_version: str, model="gpt-5", effort_level=EFFORT_LEVEL_Q_A, text_format=None, answer_format="prose") -> dict:
+    """Map-reduce variant of summarize_q_a: every chunk uses the same prompt version, results are merged in order."""
+
+    def run_chunk(chunk: str) -> Tuple[dict, float]:
+        chunk_start = time.time()
+        result = summarize_q_a(chunk, call_type, summary_length, prompt_version, model=model,
+                               effort_level=effort_level, text_format=text_format, answer_format=answer_format)
+        return result, time.time() - chunk_start
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, min(len(chunks), Q_A_MAX_CHUNKS))) as executor:
+        outcomes = list(executor.map(run_chunk, chunks))
+    return _chunked_q_a_output([o[0] for o in outcomes], [o[1] for o in outcomes], time.time() - start)
+
+
+async def asummarize_q_a_chunked(chunks: List[str], call_type: str, summary_length: str, prompt_version: str, model="gpt-5", effort_level=EFFORT_LEVEL_Q_A, text_format=None, answer_format="prose") -> dict:
+    """Coroutine version of summarize_q_a_chunked; chunks run with asyncio.gather."""
+
+    async def run_chunk(chunk: str) -> Tuple[dict, float]:
+        chunk_start = time.time()
+        result = await asummarize_q_a(chunk, call_type, summary_length, prompt_version, model=model,
+                                      effort_level=effort_level, text_format=text_format, answer_format=answer_format)
+        return result, time.time() - chunk_start
+
+    start = time.time()
+    outcomes = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+    return _chunked_q_a_output([o[0] for o in outcomes], [o[1] for o in outcomes], time.time() - start)
+
+
+def stage_prompt_template(stage: str, call_type: str, summary_length: str, answer_format: str = "prose") -> Tuple[str, int]:
+    """
+    Static prompt text of a stage as the workflow configures it (templates and output structures,
+    placeholders unfilled) and the prompt's max_output_tokens, for pre-flight token estimates.
+    """
+    q_a_version = get_prompt_config(call_type, summary_length, answer_format)["prompt_version"]
+    q_a_system, q_a_user, q_a_structure, q_a_max_tokens = _select_q_a_prompts(
+        call_type, summary_length, answer_format, q_a_version)
+    if stage == "q_a_summary":
+        return q_a_system + q_a_user + q_a_structure, q_a_max_tokens
+
+    if stage == "judge":
+        # A fan-out group call carries the same transcript and summary as the single call
+        prompts = _judge_prompts(JUDGE_FAN_OUT_PROMPT_VERSION if JUDGE_FAN_OUT else JUDGE_PROMPT_VERSION)
+        context = "judge Q&A prompts"
+        extra = q_a_structure + json.dumps(prompts.get("criteria") or {}, ensure_ascii=False)  # SUMMARY_STRUCTURE, CRITERIA
+    elif stage == "overview":
+        section = _ensure_dict(overview_prompt.get(
+            "OVERVIEW"), "overview.json -> OVERVIEW")
+        prompts = _ensure_dict(section.get(
+            OVERVIEW_PROMPT_VERSION), f"overview.json -> OVERVIEW['{OVERVIEW_PROMPT_VERSION}']")
+        context = "overview prompts"
+        extra = ""
+    else:
+        raise PromptConfigError(f"Unknown stage {stage}")
+
+    text = (_require_str(prompts, "system_prompt", context) + _require_str(prompts, "user_prompt", context)
+            + _require_output_structure(prompts, context) + extra)
+    return text, _require_params_max_tokens(prompts, context)
 
-    # logger.info("Calling Judge Q&A Summary")
-    llm_client = get_llm_client(model)
 
+def _judge_prompts(prompt_version: str) -> dict:
     judge_section = _ensure_dict(q_a_summary_prompt.get(
         "Q_A_LLM_JUDGE"), "q_a_summary.json -> Q_A_LLM_JUDGE")
-    prompts = _ensure_dict(judge_section.get(
+    return _ensure_dict(judge_section.get(
         prompt_version), f"q_a_summary.json -> Q_A_LLM_JUDGE['{prompt_version}']")
 
+
+def _judge_criteria_groups(prompt_version: str) -> Tuple[dict, dict]:
+    """Criteria (metric_name -> question) and criteria groups of a fan-out judge prompt version."""
+    prompts = _judge_prompts(prompt_version)
+    context = f"judge Q&A prompts {prompt_version}"
+    criteria = _ensure_dict(prompts.get("criteria"), f"{context} -> criteria")
+    groups = _ensure_dict(prompts.get("criteria_groups"), f"{context} -> criteria_groups")
+    for group, metric_names in groups.items():
+        unknown = [name for name in metric_names if name not in criteria] if isinstance(metric_names, list) else None
+        if not metric_names or unknown is None or unknown:
+            raise PromptConfigError(
+                f"Invalid criteria group '{group}' in {context}: {unknown or metric_names}")
+    return criteria, groups
+
+
+def _build_judge_request(transcript: str, q_a_summary: str, summary_structure: str, prompt_version: str, model="gpt-5", effort_level=EFFORT_LEVEL_JUDGE, text_format=JudgeOutputFormat, compression_rate: Optional[float] = None, criteria_group: Optional[str] = None) -> Tuple[BaseLLMClient, dict, dict]:
+
+    # logger.info("Calling Judge Q&A Summary")
+    llm_client = get_llm_client(model)
+
+    prompts = _judge_prompts(prompt_version)
+
     system_prompt = _require_str(prompts, "system_prompt", "judge Q&A prompts")
     user_prompt = _require_str(prompts, "user_prompt", "judge Q&A prompts")
     output_structure_json = _require_output_structure(
@@ -443,20 +727,50 @@ def judge_q_a_summary(transcript: str, q_a_summary: str, summary_structure: str,
     max_output_tokens = _require_params_max_tokens(
         prompts, "judge Q&A prompts")
 
-    processed_user_prompt = user_prompt.format(
-        TRANSCRIPT=transcript, SUMMARY=q_a_summary, SUMMARY_STRUCTURE=summary_structure)
-
-    processed_system_prompt = system_prompt.format(
-        OUTPUT_STRUCTURE=output_structure_json)
+    # The summary structure comes from the summary metadata as a dict; serialize it the same way every time
+    if not isinstance(summary_structure, str):
+        summary_structure = json.dumps(summary_structure, ensure_ascii=False)
+
+    static_values = {"OUTPUT_STRUCTURE": output_structure_json, "SUMMARY_STRUCTURE": summary_structure}
+    stage = "judge"
+    if criteria_group is not None:
+        # Only this group's criteria go into the instructions; each group has its own cached prefix
+        criteria, groups = _judge_criteria_groups(prompt_version)
+        static_values["CRITERIA"] = "\n\n".join(
+            f"- {name}: {criteria[name]}" for name in groups[criteria_group])
+        stage = f"judge.{criteria_group}"
+
+    transcript, compression = compress_transcript(transcript, "judge", compression_rate)
+    processed_system_prompt, processed_user_prompt, prompt_prefix = _render_prompts(
+        stage, prompt_version, system_prompt, user_prompt,
+        static_values=static_values,
+        call_values={"TRANSCRIPT": transcript, "SUMMARY": q_a_summary})
+
+    request = {
+        "system_prompt": processed_system_prompt,
+        "user_prompt": processed_user_prompt,
+        "max_output_tokens": max_output_tokens,
+        "effort_level": effort_level,
+        "text_format": text_format,
+        "prompt_cache_key": prompt_prefix["prompt_cache_key"],
+        "stage": prompt_prefix["stage"],
+    }
+    context = {
+        "model": model,
+        "effort_level": effort_level,
+        "prompt_version": prompt_version,
+        "max_output_tokens": max_output_tokens,
+        "prompt_prefix": prompt_prefix,
+        "compression": compression,
+    }
+    return llm_client, request, context
 
-    llm_response = llm_client.generate(
 
-        system_prompt=processed_system_prompt,
-        user_prompt=processed_user_prompt,
-        max_output_tokens=max_output_tokens,
-        effort_level=effort_level,
-        text_format=text_format
-    )
+def _judge_output(llm_response: LLMResponse, context: dict) -> dict:
+    model = context["model"]
+    effort_level = context["effort_level"]
+    prompt_version = context["prompt_version"]
+    max_output_tokens = context["max_output_tokens"]
 
     rounded_time = None
     try:
@@ -476,6 +790,12 @@ def judge_q_a_summary(transcript: str, q_a_summary: str, summary_structure: str,
         "finish_reason": llm_response.finish_reason,
         "raw_response": llm_response.raw,  # for debugging
         "remaining_tokens": llm_response.remaining_tokens,
+        "cached_tokens": llm_response.cached_tokens,
+        "cache_hit": llm_response.cache_hit,
+        "attempts": llm_response.attempts,
+        "hedged": llm_response.hedged,
+        "prompt_prefix": context["prompt_prefix"],
+        "compression": context["compression"],
         "time": rounded_time,
     }
 
@@ -501,7 +821,191 @@ def judge_q_a_summary(transcript: str, q_a_summary: str, summary_structure: str,
     return final_output
 
 
-def run_overview_workflow(presentation_transcript: str, q_a_summary: str, call_type: str, prompt_version=OVERVIEW_PROMPT_VERSION, model="gpt-5-mini", text_format=OverviewOutputFormat) -> dict:
+def judge_q_a_summary(transcript: str, q_a_summary: str, summary_structure: str, prompt_version: str, model="gpt-5", effort_level=EFFORT_LEVEL_JUDGE, text_format=JudgeOutputFormat, compression_rate: Optional[float] = None) -> dict:
+    llm_client, request, context = _build_judge_request(
+        transcript=transcript, q_a_summary=q_a_summary, summary_structure=summary_structure, prompt_version=prompt_version, model=model, effort_level=effort_level, text_format=text_format, compression_rate=compression_rate)
+    llm_response = llm_client.generate(**request)
+    return _judge_output(llm_response, context)
+
+
+async def ajudge_q_a_summary(transcript: str, q_a_summary: str, summary_structure: str, prompt_version: str, model="gpt-5", effort_level=EFFORT_LEVEL_JUDGE, text_format=JudgeOutputFormat, compression_rate: Optional[float] = None) -> dict:
+    """Coroutine version of judge_q_a_summary: same prompts and metadata, awaited on the event loop."""
+    llm_client, request, context = await asyncio.to_thread(
+        _build_judge_request,
+        transcript=transcript, q_a_summary=q_a_summary, summary_structure=summary_structure, prompt_version=prompt_version, model=model, effort_level=effort_level, text_format=text_format, compression_rate=compression_rate)
+    llm_response = await llm_client.agenerate(**request)
+    return _judge_output(llm_response, context)
+
+
+def overall_assessment(evaluation_results: List[EvaluationResult], criteria: List[str]) -> OverallAssessment:
+    """
+    Overall assessment recomputed from the per-criterion results (fan-out judge). Totals come from the
+    configured criteria, so a criterion without a result counts as failed.
+    """
+    results = {r.metric_name: r for r in evaluation_results}
+    passed = [name for name in criteria if name in results and results[name].passed]
+    failed = [name for name in criteria if name in results and not results[name].passed]
+    missing = [name for name in criteria if name not in results]
+    total = len(criteria)
+    summary = f"{len(passed)} of {total} criteria passed."
+    if failed:
+        summary += f" Failed: {', '.join(failed)}."
+    if missing:
+        summary += f" No result: {', '.join(missing)}."
+    failed += missing
+    return OverallAssessment(
+        total_criteria=total,
+        passed_criteria=len(passed),
+        failed_criteria=len(failed),
+        overall_passed=total > 0 and not failed,
+        pass_rate=round(len(passed) / total, 3) if total else 0.0,
+        evaluation_timestamp=datetime.now().isoformat(),
+        evaluation_summary=summary,
+    )
+
+
+def _metric_key(metric_name: str) -> str:
+    return "_".join(metric_name.strip().lower().replace("-", " ").split())
+
+
+def _fan_out_judge_output(prompt_version: str, group_results: dict, group_times: dict, group_errors: dict, wall_time: float, compression: Optional[dict]) -> dict:
+    criteria, groups = _judge_criteria_groups(prompt_version)
+    # Every group failed: nothing to merge, surface the first error as the stage error
+    if not group_results:
+        raise next(iter(group_errors.values()))
+
+    # Keep each group's own criteria only, under the configured metric names, in the configured order
+    evaluations: dict = {}
+    for group, result in group_results.items():
+        obj = result.get("eval_results", {}).get("obj")
+        for evaluation in (obj.evaluation_results if obj is not None else []):
+            key = _metric_key(evaluation.metric_name)
+            if key in groups[group] and key not in evaluations:
+                evaluations[key] = evaluation.model_copy(update={"metric_name": key})
+    # Configured criteria of this prompt version, in order; the overall assessment is out of all of them
+    configured = [name for name in criteria if any(name in group for group in groups.values())]
+    evaluation_results = [evaluations[name] for name in configured if name in evaluations]
+    missing = [name for name in configured if name not in evaluations]
+    for group, error in group_errors.items():
+        logger.warning(f"Fan-out judge group {group} failed: {error}")
+    if missing:
+        logger.warning(f"Fan-out judge returned no result for: {', '.join(missing)}")
+
+    # Groups answered but none under a configured metric name: there is no evaluation to report
+    if not evaluation_results:
+        raise LLMGenerationError(
+            f"Fan-out judge failed: no group returned any of the configured criteria ({', '.join(configured)})")
+    merged = JudgeOutputFormat(
+        evaluation_results=evaluation_results,
+        overall_assessment=overall_assessment(evaluation_results, configured))
+
+    group_metadata = {group: result.get("metadata", {}) for group, result in group_results.items()}
+    first = next(iter(group_metadata.values()))
+    metadata = dict(first)
+    metadata.pop("raw_response", None)
+    for key in ("input_tokens", "output_tokens", "reasoning_tokens", "cached_tokens"):
+        values = [m.get(key) for m in group_metadata.values() if m.get(key) is not None]
+        metadata[key] = sum(values) if values else None
+    metadata["finish_reason"] = next(
+        (m.get("finish_reason") for m in group_metadata.values() if m.get("finish_reason") != "completed"),
+        first.get("finish_reason"))
+    remaining = [m.get("remaining_tokens") for m in group_metadata.values() if m.get("remaining_tokens") is not None]
+    metadata["remaining_tokens"] = min(remaining) if remaining else None
+    metadata["cache_hit"] = all(m.get("cache_hit") for m in group_metadata.values())
+    metadata["attempts"] = max(m.get("attempts") or 1 for m in group_metadata.values())
+    metadata["hedged"] = any(m.get("hedged") for m in group_metadata.values())
+    metadata["compression"] = compression
+    metadata["time"] = round(wall_time)
+    metadata["judge_mode"] = "fan_out"
+    metadata["missing_criteria"] = missing
+    metadata["failed_groups"] = {group: str(error) for group, error in group_errors.items()}
+    metadata["groups"] = [
+        {
+            "group": group,
+            "criteria": groups[group],
+            "time": round(group_times[group], 2),
+            "input_tokens": m.get("input_tokens"),
+            "output_tokens": m.get("output_tokens"),
+            "reasoning_tokens": m.get("reasoning_tokens"),
+            "cached_tokens": m.get("cached_tokens"),
+            "cache_hit": m.get("cache_hit"),
+            "attempts": m.get("attempts"),
+            "hedged": m.get("hedged"),
+            "finish_reason": m.get("finish_reason"),
+            "prefix_hash": (m.get("prompt_prefix") or {}).get("prefix_hash"),
+        }
+        for group, m in group_metadata.items()
+    ] + [
+        {"group": group, "criteria": groups[group], "time": round(group_times[group], 2), "error": str(error)}
+        for group, error in group_errors.items()
+    ]
+
+    return {
+        "eval_results": {"text": merged.model_dump_json(), "obj": merged},
+        "metadata": metadata,
+    }
+
+
+def _merge_fan_out_outcomes(prompt_version: str, outcomes: dict, wall_time: float, compression: Optional[dict]) -> dict:
+    """Split (result, time, error) per group into the successful results and the errors, then merge."""
+    return _fan_out_judge_output(
+        prompt_version,
+        {g: o[0] for g, o in outcomes.items() if o[2] is None},
+        {g: o[1] for g, o in outcomes.items()},
+        {g: o[2] for g, o in outcomes.items() if o[2] is not None},
+        wall_time, compression)
+
+
+def judge_q_a_summary_fan_out(transcript: str, q_a_summary: str, summary_structure: str, prompt_version: str = JUDGE_FAN_OUT_PROMPT_VERSION, model="gpt-5", effort_level=EFFORT_LEVEL_JUDGE, compression_rate: Optional[float] = None) -> dict:
+    """
+    judge_q_a_summary split by criteria group: every group of the prompt version is evaluated by its own
+    concurrent call, so the stage takes as long as the slowest group instead of one call reasoning over all.
+    Returns the same shape as judge_q_a_summary, with the overall assessment computed locally.
+    """
+    _, groups = _judge_criteria_groups(prompt_version)
+    # Compressed once; the group calls get the same text
+    transcript, compression = compress_transcript(transcript, "judge", compression_rate)
+
+    def run_group(group: str) -> Tuple[Optional[dict], float, Optional[Exception]]:
+        group_start = time.time()
+        # A failing group only loses its own criteria, which are reported as missing
+        try:
+            llm_client, request, context = _build_judge_request(
+                transcript=transcript, q_a_summary=q_a_summary, summary_structure=summary_structure, prompt_version=prompt_version, model=model, effort_level=effort_level, text_format=JudgeGroupOutputFormat, compression_rate=1.0, criteria_group=group)
+            result = _judge_output(llm_client.generate(**request), context)
+        except Exception as e:
+            return None, time.time() - group_start, e
+        return result, time.time() - group_start, None
+
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        outcomes = dict(zip(groups, executor.map(run_group, groups)))
+    return _merge_fan_out_outcomes(prompt_version, outcomes, time.time() - start, compression)
+
+
+async def ajudge_q_a_summary_fan_out(transcript: str, q_a_summary: str, summary_structure: str, prompt_version: str = JUDGE_FAN_OUT_PROMPT_VERSION, model="gpt-5", effort_level=EFFORT_LEVEL_JUDGE, compression_rate: Optional[float] = None) -> dict:
+    """Coroutine version of judge_q_a_summary_fan_out; groups run with asyncio.gather."""
+    _, groups = _judge_criteria_groups(prompt_version)
+    transcript, compression = await asyncio.to_thread(
+        compress_transcript, transcript, "judge", compression_rate)
+
+    async def run_group(group: str) -> Tuple[Optional[dict], float, Optional[Exception]]:
+        group_start = time.time()
+        # CancelledError is not an Exception, so cancelling the job still cancels every group
+        try:
+            llm_client, request, context = _build_judge_request(
+                transcript=transcript, q_a_summary=q_a_summary, summary_structure=summary_structure, prompt_version=prompt_version, model=model, effort_level=effort_level, text_format=JudgeGroupOutputFormat, compression_rate=1.0, criteria_group=group)
+            result = _judge_output(await llm_client.agenerate(**request), context)
+        except Exception as e:
+            return None, time.time() - group_start, e
+        return result, time.time() - group_start, None
+
+    start = time.time()
+    outcomes = dict(zip(groups, await asyncio.gather(*(run_group(group) for group in groups))))
+    return _merge_fan_out_outcomes(prompt_version, outcomes, time.time() - start, compression)
+
+
+def _build_overview_request(presentation_transcript: str, q_a_summary: str, call_type: str, prompt_version=OVERVIEW_PROMPT_VERSION, model="gpt-5-mini", text_format=OverviewOutputFormat, compression_rate: Optional[float] = None) -> Tuple[BaseLLMClient, dict, dict]:
 
     logger.info("Calling Write Call Overview")
     llm_client = get_llm_client(model)
@@ -521,18 +1025,37 @@ def run_overview_workflow(presentation_transcript: str, q_a_summary: str, call_t
     max_output_tokens = _require_params_max_tokens(
         write_call_overview_prompts, "overview prompts")
 
-    processed_system_prompt = system_prompt.format(
-        CALL_TYPE=call_type, OUTPUT_STRUCTURE=output_structure_json)
-    processed_user_prompt = user_prompt.format(
-        TRANSCRIPT=presentation_transcript, Q_A_SUMMARY=q_a_summary)
+    presentation_transcript, compression = compress_transcript(
+        presentation_transcript, "overview", compression_rate)
+    processed_system_prompt, processed_user_prompt, prompt_prefix = _render_prompts(
+        "overview", prompt_version, system_prompt, user_prompt,
+        static_values={"CALL_TYPE": call_type, "OUTPUT_STRUCTURE": output_structure_json},
+        call_values={"TRANSCRIPT": presentation_transcript, "Q_A_SUMMARY": q_a_summary})
+
+    request = {
+        "system_prompt": processed_system_prompt,
+        "user_prompt": processed_user_prompt,
+        "max_output_tokens": max_output_tokens,
+        "text_format": text_format,
+        "prompt_cache_key": prompt_prefix["prompt_cache_key"],
+        "stage": prompt_prefix["stage"],
+    }
+    context = {
+        "model": model,
+        "prompt_version": prompt_version,
+        "max_output_tokens": max_output_tokens,
+        "call_type": call_type,
+        "prompt_prefix": prompt_prefix,
+        "compression": compression,
+    }
+    return llm_client, request, context
 
-    llm_response = llm_client.generate(
-        system_prompt=processed_system_prompt,
-        user_prompt=processed_user_prompt,
-        max_output_tokens=max_output_tokens,
 
-        text_format=text_format
-    )
+def _overview_output(llm_response: LLMResponse, context: dict) -> dict:
+    model = context["model"]
+    prompt_version = context["prompt_version"]
+    max_output_tokens = context["max_output_tokens"]
+    call_type = context["call_type"]
 
     if llm_response.finish_reason == 'length' or llm_response.finish_reason == 'max_tokens':
         logger.error(
@@ -558,6 +1081,12 @@ def run_overview_workflow(presentation_transcript: str, q_a_summary: str, call_t
         "reasoning_tokens": llm_response.reasoning_tokens if model == "gpt-5" else None,
         "finish_reason": llm_response.finish_reason,
         "remaining_tokens": llm_response.remaining_tokens,
+        "cached_tokens": llm_response.cached_tokens,
+        "cache_hit": llm_response.cache_hit,
+        "attempts": llm_response.attempts,
+        "hedged": llm_response.hedged,
+        "prompt_prefix": context["prompt_prefix"],
+        "compression": context["compression"],
         "time": rounded_time,
     }
 
@@ -580,4 +1109,20 @@ def run_overview_workflow(presentation_transcript: str, q_a_summary: str, call_t
     logger.info(
         "--------------------------- END OF CALL OVERVIEW --------------------------------")
 
-    return final_output
\ No newline at end of file
+    return final_output
+
+
+def run_overview_workflow(presentation_transcript: str, q_a_summary: str, call_type: str, prompt_version=OVERVIEW_PROMPT_VERSION, model="gpt-5-mini", text_format=OverviewOutputFormat, compression_rate: Optional[float] = None) -> dict:
+    llm_client, request, context = _build_overview_request(
+        presentation_transcript=presentation_transcript, q_a_summary=q_a_summary, call_type=call_type, prompt_version=prompt_version, model=model, text_format=text_format, compression_rate=compression_rate)
+    llm_response = llm_client.generate(**request)
+    return _overview_output(llm_response, context)
+
+
+async def arun_overview_workflow(presentation_transcript: str, q_a_summary: str, call_type: str, prompt_version=OVERVIEW_PROMPT_VERSION, model="gpt-5-mini", text_format=OverviewOutputFormat, compression_rate: Optional[float] = None) -> dict:
+    """Coroutine version of run_overview_workflow: same prompts and metadata, awaited on the event loop."""
+    llm_client, request, context = await asyncio.to_thread(
+        _build_overview_request,
+        presentation_transcript=presentation_transcript, q_a_summary=q_a_summary, call_type=call_type, prompt_version=prompt_version, model=model, text_format=text_format, compression_rate=compression_rate)
+    llm_response = await llm_client.agenerate(**request)
+    return _overview_output(llm_response, context)
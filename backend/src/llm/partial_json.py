@@ -0,0 +1,91 @@
+import json
+from typing import Iterable, List, Optional, Tuple
+
+
+class StreamingArrayExtractor:
+    """
+    Incremental scanner over streamed structured-output JSON such as
+    {"title": "...", "analysts": [{...}, {...}]}.
+    Every object of a watched top-level array is returned as soon as its closing brace arrives,
+    and top-level string fields (e.g. the title) are captured once complete.
+    """
+
+    def __init__(self, array_keys: Iterable[str] = ("analysts", "topics")):
+        self.array_keys = set(array_keys)
+        self.fields: dict = {}
+        self.items: List[Tuple[str, dict]] = []
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False
+        self._last_key: Optional[str] = None
+        self._array_key: Optional[str] = None
+        self._item_start: Optional[int] = None
+        self._text = ""
+
+    def feed(self, delta: str) -> List[Tuple[str, dict]]:
+        """Consume a text delta; return the (array key, object) pairs completed by it."""
+        if not delta:
+            return []
+        self._text += delta
+        completed: List[Tuple[str, dict]] = []
+        text = self._text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._top_level_string(text[self._string_start:i + 1])
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch in "{[":
+                if ch == "{" and self._depth == 2 and self._array_key:
+                    self._item_start = i
+                if ch == "[" and self._depth == 1 and self._last_key in self.array_keys:
+                    self._array_key = self._last_key
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+            elif ch in "}]":
+                self._depth -= 1
+                if ch == "}" and self._depth == 2 and self._item_start is not None:
+                    item = self._parse(text[self._item_start:i + 1])
+                    self._item_start = None
+                    if isinstance(item, dict):
+                        completed.append((self._array_key, item))
+                elif ch == "]" and self._depth == 1:
+                    self._array_key = None
+            elif self._depth == 1:
+                if ch == ",":
+                    self._expect_key = True
+                elif ch == ":":
+                    self._expect_key = False
+        self._pos = len(text)
+        self.items.extend(completed)
+        return completed
+
+    def _top_level_string(self, token: str) -> None:
+        value = self._parse(token)
+        if not isinstance(value, str):
+            return
+        if self._expect_key:
+            self._last_key = value
+        elif self._last_key is not None:
+            self.fields[self._last_key] = value
+
+    @staticmethod
+    def _parse(token: str):
+        try:
+            return json.loads(token)
+        except ValueError:
+            return None
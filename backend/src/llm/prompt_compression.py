@@ -0,0 +1,146 @@
+"""
+Optional LLMLingua-2 compression of the TRANSCRIPT placeholder before a stage formats its prompts.
+Speaker header lines are kept verbatim and only the spoken paragraphs are compressed; digits and the
+names found in the header lines are forced into the output so figures and speakers survive.
+"""
+
+import logging
+import re
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from src.config.runtime import (
+    PROMPT_COMPRESSION,
+    PROMPT_COMPRESSION_RATES,
+    PROMPT_COMPRESSION_MODEL,
+    PROMPT_COMPRESSION_DEVICE,
+    PROMPT_COMPRESSION_MIN_LINE_CHARS,
+)
+
+try:
+    from llmlingua import PromptCompressor
+except ImportError:  # optional dependency
+    PromptCompressor = None
+
+logger = logging.getLogger(__name__)
+
+# LLMLingua-2 maps multi-token forced words onto a fixed set of 100 placeholder tokens
+MAX_PROTECTED_TERMS = 100
+_NAME_WORD = re.compile(r"\b[A-Z][a-z]+(?:[-'][A-Z]?[a-z]+)*\b")
+
+_COMPRESSOR = None
+_COMPRESSOR_LOCK = threading.Lock()
+_COMPRESS_LOCK = threading.Lock()
+
+
+def get_prompt_compressor():
+    """Lazily load the LLMLingua-2 model once per process; None when llmlingua is not installed or fails to load."""
+    global _COMPRESSOR
+    if PromptCompressor is None:
+        return None
+    with _COMPRESSOR_LOCK:
+        if _COMPRESSOR is None:
+            try:
+                _COMPRESSOR = PromptCompressor(
+                    model_name=PROMPT_COMPRESSION_MODEL,
+                    use_llmlingua2=True,
+                    device_map=PROMPT_COMPRESSION_DEVICE,
+                )
+            except Exception as e:
+                logger.warning(f"Prompt compressor unavailable: {e}")
+                _COMPRESSOR = False
+        return _COMPRESSOR or None
+
+
+def stage_compression_rate(stage: str, rate: Optional[float] = None) -> Optional[float]:
+    """Share of tokens to keep for this stage; None means no compression. An explicit rate overrides the config."""
+    if rate is None:
+        if not PROMPT_COMPRESSION:
+            return None
+        rate = PROMPT_COMPRESSION_RATES.get(stage)
+    if rate is None or rate >= 1.0 or rate <= 0.0:
+        return None
+    return rate
+
+
+def _protected_terms(header_lines: Iterable[str], extra_terms: Iterable[str]) -> List[str]:
+    terms: List[str] = []
+    seen = set()
+    for term in list(extra_terms) + [w for line in header_lines for w in _NAME_WORD.findall(line)]:
+        if term and term not in seen:
+            seen.add(term)
+            terms.append(term)
+    return terms[:MAX_PROTECTED_TERMS]
+
+
+def compress_transcript(text: str, stage: str, rate: Optional[float] = None,
+                        protected_terms: Optional[Iterable[str]] = None) -> Tuple[str, Optional[dict]]:
+    """
+    Compress the transcript for `stage` (q_a_summary, judge, overview).
+    Returns the text to put in the prompt and the compression stats for the stage metadata
+    (None when the stage is not compressed, in which case the text is returned unchanged).
+    """
+    rate = stage_compression_rate(stage, rate)
+    if not text or rate is None:
+        return text, None
+    compressor = get_prompt_compressor()
+    if compressor is None:
+        return text, None
+
+    lines = text.split("\n")
+    body_lines = [i for i, line in enumerate(lines) if len(line) >= PROMPT_COMPRESSION_MIN_LINE_CHARS]
+    if not body_lines:
+        return text, None
+    body_set = set(body_lines)
+    header_lines = [line for i, line in enumerate(lines) if i not in body_set and line.strip()]
+
+    start = time.time()
+    try:
+        with _COMPRESS_LOCK:
+            result = compressor.compress_prompt(
+                [lines[i] for i in body_lines],
+                rate=rate,
+                force_tokens=_protected_terms(header_lines, protected_terms or []),
+                force_reserve_digit=True,
+                drop_consecutive=True,
+            )
+    except Exception as e:
+        logger.warning(f"Transcript compression failed for {stage}, sending it uncompressed: {e}")
+        return text, None
+
+    compressed_bodies = result.get("compressed_prompt_list") or []
+    if len(compressed_bodies) != len(body_lines):
+        logger.warning(f"Transcript compression for {stage} returned {len(compressed_bodies)} of {len(body_lines)} paragraphs; sending it uncompressed")
+        return text, None
+    for i, body in zip(body_lines, compressed_bodies):
+        lines[i] = body
+    compressed = "\n".join(lines)
+
+    original_tokens = int(result.get("origin_tokens") or 0)
+    compressed_tokens = int(result.get("compressed_tokens") or 0)
+    stats = {
+        "method": "llmlingua2",
+        "model": PROMPT_COMPRESSION_MODEL,
+        "rate": rate,
+        "original_chars": len(text),
+        "compressed_chars": len(compressed),
+        "original_tokens": original_tokens,
+        "compressed_tokens": compressed_tokens,
+        "saved_tokens": max(0, original_tokens - compressed_tokens),
+        "time": round(time.time() - start, 2),
+    }
+    logger.info(f"Compressed {stage} transcript: {original_tokens} -> {compressed_tokens} tokens in {stats['time']}s")
+    return compressed, stats
+
+
+def merge_compression_stats(stats: List[Optional[dict]]) -> Optional[dict]:
+    """Totals over the chunks of a map-reduce stage."""
+    stats = [s for s in stats if s]
+    if not stats:
+        return None
+    merged = dict(stats[0])
+    for key in ("original_chars", "compressed_chars", "original_tokens", "compressed_tokens", "saved_tokens"):
+        merged[key] = sum(s.get(key, 0) for s in stats)
+    merged["time"] = round(sum(s.get("time", 0) for s in stats), 2)
+    return merged
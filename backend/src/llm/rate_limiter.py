@@ -0,0 +1,252 @@
+import asyncio
+import itertools
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from src.config.runtime import LLM_RATE_LIMITS, LLM_DEFAULT_RATE_LIMIT
+
+# Longest single wait between two checks; waiters also wake up when a reservation is settled
+_MAX_WAIT_SLICE = 1.0
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse OpenAI reset headers such as "1s", "6m0s" or "120ms" into seconds."""
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+@dataclass(slots=True)
+class Reservation:
+    tokens: int
+    waited_seconds: float = 0.0
+    settled: bool = False
+
+
+class _Bucket:
+    """Continuously refilled bucket; level may go negative when the provider reports less than we assumed."""
+
+    __slots__ = ("capacity", "level", "rate", "updated_at")
+
+    def __init__(self, capacity: float, per_seconds: float = 60.0):
+        self.capacity = float(capacity)
+        self.level = float(capacity)
+        self.rate = self.capacity / per_seconds
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_for(self, amount: float) -> float:
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate if self.rate > 0 else _MAX_WAIT_SLICE
+
+    def sync(self, limit: Optional[int], remaining: Optional[int], reset_seconds: Optional[float], in_flight: float) -> None:
+        if limit:
+            self.capacity = float(limit)
+        if remaining is not None:
+            # The provider already counted requests that have reached it; ours still in flight have not
+            self.level = min(self.level, float(remaining) - in_flight)
+        if limit and remaining is not None and reset_seconds:
+            self.rate = max(self.capacity / 60.0, (limit - remaining) / reset_seconds)
+        elif limit:
+            self.rate = self.capacity / 60.0
+
+
+class ModelRateLimiter:
+    """
+    Process-wide request and token buckets for one model, shared by every job and stage.
+    Callers reserve their estimated token cost before the API call and are served strictly in
+    arrival order (sync threads and asyncio tasks share one queue); the buckets refill over time and
+    are corrected from the x-ratelimit-* headers of each response.
+    """
+
+    def __init__(self, model: str, requests_per_minute: int, tokens_per_minute: int):
+        self.model = model
+        self._requests = _Bucket(requests_per_minute)
+        self._tokens = _Bucket(tokens_per_minute)
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._queue: deque = deque()
+        self._tickets = itertools.count()
+        self._in_flight_tokens = 0.0
+        self._in_flight_requests = 0
+        self._blocked_until = 0.0
+        self._waits = 0
+        self._waited_seconds = 0.0
+        self._reservations = 0
+
+    def _try_acquire(self, ticket: int, tokens: int) -> float:
+        """Take the tokens if this ticket is at the head of the queue and both buckets allow it; else return the wait."""
+        now = time.monotonic()
+        if self._queue[0] != ticket:
+            return _MAX_WAIT_SLICE
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        self._requests.refill(now)
+        self._tokens.refill(now)
+        # A request larger than the whole bucket waits for a full bucket instead of forever
+        tokens = min(tokens, self._tokens.capacity)
+        wait = max(self._requests.wait_for(1), self._tokens.wait_for(tokens))
+        if wait > 0:
+            return wait
+        self._requests.level -= 1
+        self._tokens.level -= tokens
+        self._in_flight_requests += 1
+        self._in_flight_tokens += tokens
+        self._queue.popleft()
+        self._reservations += 1
+        self._released.notify_all()
+        return 0.0
+
+    def _granted(self, started: float, estimated_tokens: int) -> Reservation:
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            self._waits += 1
+            self._waited_seconds += waited
+        return Reservation(tokens=int(min(estimated_tokens, self._tokens.capacity)), waited_seconds=waited)
+
+    def reserve(self, estimated_tokens: int) -> Reservation:
+        """Block the calling thread until the reservation is granted."""
+        started = time.monotonic()
+        with self._lock:
+            ticket = next(self._tickets)
+            self._queue.append(ticket)
+            try:
+                while True:
+                    wait = self._try_acquire(ticket, estimated_tokens)
+                    if wait <= 0:
+                        break
+                    self._released.wait(min(wait, _MAX_WAIT_SLICE))
+            except BaseException:
+                self._abandon(ticket)
+                raise
+            return self._granted(started, estimated_tokens)
+
+    async def areserve(self, estimated_tokens: int) -> Reservation:
+        """Coroutine version of reserve: waits with asyncio.sleep and leaves the queue when cancelled."""
+        started = time.monotonic()
+        with self._lock:
+            ticket = next(self._tickets)
+            self._queue.append(ticket)
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_acquire(ticket, estimated_tokens)
+                    if wait <= 0:
+                        return self._granted(started, estimated_tokens)
+                await asyncio.sleep(min(wait, _MAX_WAIT_SLICE))
+        except BaseException:
+            with self._lock:
+                self._abandon(ticket)
+            raise
+
+    def _abandon(self, ticket: int) -> None:
+        try:
+            self._queue.remove(ticket)
+        except ValueError:
+            return
+        self._released.notify_all()
+
+    def settle(self, reservation: Reservation, actual_tokens: Optional[int]) -> None:
+        """Return the difference between the reserved and the actual cost (all of it when the call failed)."""
+        with self._lock:
+            if reservation.settled:
+                return
+            reservation.settled = True
+            self._in_flight_requests = max(0, self._in_flight_requests - 1)
+            self._in_flight_tokens = max(0.0, self._in_flight_tokens - reservation.tokens)
+            used = actual_tokens if actual_tokens is not None else 0
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level + reservation.tokens - used)
+            self._released.notify_all()
+
+    def update_from_headers(self, headers: Any) -> None:
+        """Align both buckets with the provider's view (limit, remaining and time to reset)."""
+        if not headers:
+            return
+
+        def header_int(name: str) -> Optional[int]:
+            try:
+                value = headers.get(name)
+                return int(str(value)) if value is not None else None
+            except (TypeError, ValueError):
+                return None
+
+        with self._lock:
+            self._requests.sync(
+                header_int("x-ratelimit-limit-requests"),
+                header_int("x-ratelimit-remaining-requests"),
+                parse_reset_duration(headers.get("x-ratelimit-reset-requests")),
+                self._in_flight_requests)
+            self._tokens.sync(
+                header_int("x-ratelimit-limit-tokens"),
+                header_int("x-ratelimit-remaining-tokens"),
+                parse_reset_duration(headers.get("x-ratelimit-reset-tokens")),
+                self._in_flight_tokens)
+            self._released.notify_all()
+
+    def block_for(self, seconds: float) -> None:
+        """Hold every caller back after a 429 (Retry-After) without touching the bucket levels."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + max(0.0, seconds))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            return {
+                "model": self.model,
+                "requests_available": round(self._requests.level, 1),
+                "requests_limit": int(self._requests.capacity),
+                "tokens_available": round(self._tokens.level),
+                "tokens_limit": int(self._tokens.capacity),
+                "in_flight_requests": self._in_flight_requests,
+                "in_flight_tokens": round(self._in_flight_tokens),
+                "queued": len(self._queue),
+                "reservations": self._reservations,
+                "waits": self._waits,
+                "waited_seconds": round(self._waited_seconds, 2),
+            }
+
+
+_LIMITERS: Dict[str, ModelRateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(model: str) -> ModelRateLimiter:
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(model)
+        if limiter is None:
+            limits = LLM_RATE_LIMITS.get(model, LLM_DEFAULT_RATE_LIMIT)
+            limiter = ModelRateLimiter(
+                model, limits["requests_per_minute"], limits["tokens_per_minute"])
+            _LIMITERS[model] = limiter
+        return limiter
+
+
+def get_rate_limiter_stats() -> list:
+    with _LIMITERS_LOCK:
+        limiters = list(_LIMITERS.values())
+    return [limiter.stats() for limiter in limiters]
+
+
+def estimate_request_tokens(system_prompt: str, user_prompt: str, max_output_tokens: int) -> int:
+    """Provider-style estimate: prompt characters / 4 plus the output budget."""
+    return (len(system_prompt or "") + len(user_prompt or "")) // 4 + int(max_output_tokens or 0)
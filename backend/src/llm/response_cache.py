@@ -0,0 +1,215 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.config.runtime import (
+    LLM_RESPONSE_CACHE_BACKEND,
+    LLM_RESPONSE_CACHE_TTL_SECONDS,
+    LLM_RESPONSE_CACHE_MAX_MB,
+    LLM_RESPONSE_CACHE_DIR,
+    LLM_RESPONSE_CACHE_SWEEP_SECONDS,
+    LLM_RESPONSE_CACHE_MEMCACHED_SERVER,
+)
+from src.utils.job_utils import _read_json_file, _write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored entry layout changes so old entries are never read back
+RESPONSE_CACHE_FORMAT = 1
+
+
+def response_cache_key(model: str, effort_level: Optional[str], schema: Optional[dict], system_prompt: str, user_prompt: str, max_output_tokens: int) -> str:
+    """Content address of a generation request: identical inputs always map to the same key."""
+    payload = json.dumps(
+        {
+            "format": RESPONSE_CACHE_FORMAT,
+            "model": model,
+            "effort_level": effort_level,
+            "schema": schema,
+            "system_prompt": system_prompt,
+            "user_prompt": user_prompt,
+            "max_output_tokens": max_output_tokens,
+        },
+        ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskLRUResponseCache:
+    """
+    One JSON file per entry under the cache directory. Reads refresh the file mtime, so when the
+    directory grows past max_bytes the least recently used entries are removed first; entries older
+    than ttl_seconds are dropped on read and during eviction. Writes only add to a running size
+    estimate; the directory is scanned when that estimate passes max_bytes or every sweep_seconds.
+    """
+
+    name = "disk"
+
+    def __init__(self, directory: str, max_bytes: int, ttl_seconds: int,
+                 sweep_seconds: float = LLM_RESPONSE_CACHE_SWEEP_SECONDS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_seconds = sweep_seconds
+        self._lock = threading.Lock()
+        # Bytes on disk as of the last sweep plus everything written since (None until the first sweep)
+        self._approx_bytes: Optional[int] = None
+        self._last_sweep = 0.0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        entry = _read_json_file(path)
+        if not entry or time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("response")
+
+    def set(self, key: str, response: dict) -> None:
+        path = self._path(key)
+        _write_json_atomic(path, {"created_at": time.time(), "response": response})
+        try:
+            written = os.path.getsize(path)
+        except OSError:
+            written = 0
+        with self._lock:
+            if self._approx_bytes is not None:
+                self._approx_bytes += written
+            sweep_due = (self._approx_bytes is None or self._approx_bytes > self.max_bytes
+                         or time.time() - self._last_sweep >= self.sweep_seconds)
+        if sweep_due:
+            self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            self._last_sweep = time.time()
+            entries = []
+            total = 0
+            now = time.time()
+            try:
+                scanned = list(os.scandir(self.directory))
+            except FileNotFoundError:
+                return
+            for item in scanned:
+                if not item.name.endswith(".json"):
+                    continue
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                # mtime is refreshed on every hit, so it tracks recency rather than creation
+                if now - stat.st_mtime > self.ttl_seconds:
+                    self._remove(item.path)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, item.path))
+                total += stat.st_size
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+            self._approx_bytes = total
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class MemcachedResponseCache:
+    """Entries shared by every worker through memcached; eviction is memcached's own LRU plus the TTL."""
+
+    name = "memcached"
+
+    def __init__(self, server: str, ttl_seconds: int):
+        from pymemcache.client.base import PooledClient
+
+        host, _, port = server.partition(":")
+        self.ttl_seconds = ttl_seconds
+        self._client = PooledClient(
+            (host or "127.0.0.1", int(port or 11211)), connect_timeout=2, timeout=2, no_delay=True)
+
+    def get(self, key: str) -> Optional[dict]:
+        value = self._client.get(f"llm:{key}")
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, response: dict) -> None:
+        self._client.set(
+            f"llm:{key}", json.dumps(response, ensure_ascii=False).encode("utf-8"), expire=self.ttl_seconds)
+
+
+class ResponseCacheStats:
+    """Hit/miss counters per stage (q_a_summary, judge, overview...) since process start."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, int]] = {}
+
+    def record(self, stage: Optional[str], event: str, saved_tokens: int = 0) -> None:
+        with self._lock:
+            counters = self._stages.setdefault(stage or "unknown", {
+                "hits": 0, "misses": 0, "stores": 0, "errors": 0, "saved_tokens": 0})
+            counters[event] += 1
+            counters["saved_tokens"] += saved_tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {stage: dict(counters) for stage, counters in self._stages.items()}
+        for counters in stages.values():
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_rate"] = round(counters["hits"] / lookups, 3) if lookups else None
+        return stages
+
+
+_CACHE_LOCK = threading.Lock()
+_CACHE: Dict[str, Any] = {}
+RESPONSE_CACHE_STATS = ResponseCacheStats()
+
+
+def get_response_cache():
+    """The configured response cache backend, or None when caching is off or the backend is unavailable."""
+    backend = (LLM_RESPONSE_CACHE_BACKEND or "none").lower()
+    with _CACHE_LOCK:
+        if backend in _CACHE:
+            return _CACHE[backend]
+        cache = None
+        try:
+            if backend == "disk":
+                cache = DiskLRUResponseCache(
+                    LLM_RESPONSE_CACHE_DIR,
+                    max_bytes=LLM_RESPONSE_CACHE_MAX_MB * 1024 * 1024,
+                    ttl_seconds=LLM_RESPONSE_CACHE_TTL_SECONDS)
+            elif backend == "memcached":
+                cache = MemcachedResponseCache(
+                    LLM_RESPONSE_CACHE_MEMCACHED_SERVER, ttl_seconds=LLM_RESPONSE_CACHE_TTL_SECONDS)
+            elif backend != "none":
+                logger.warning("Unknown LLM response cache backend %r; caching disabled", backend)
+        except Exception as e:
+            logger.warning("LLM response cache backend %s unavailable: %s", backend, e)
+            cache = None
+        _CACHE[backend] = cache
+        return cache
+
+
+def get_response_cache_stats() -> Dict[str, Any]:
+    cache = get_response_cache()
+    return {
+        "backend": cache.name if cache is not None else "none",
+        "stages": RESPONSE_CACHE_STATS.snapshot(),
+    }
@@ -0,0 +1,146 @@
+import random
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from src.config.runtime import (
+    LLM_RETRY_MAX_ATTEMPTS,
+    LLM_RETRY_BASE_DELAY_SECONDS,
+    LLM_RETRY_MAX_DELAY_SECONDS,
+    LLM_HEDGING,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_MIN_SAMPLES,
+    LLM_HEDGE_MAX_RATIO,
+)
+from src.llm.rate_limiter import parse_reset_duration
+
+# Transport failures and these HTTP statuses are worth another attempt; any other 4xx
+# (bad request, auth, schema errors...) fails the same way every time
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+RETRYABLE_ERROR_NAMES = frozenset({"APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError"})
+
+
+@dataclass(slots=True)
+class RetryPolicy:
+    max_attempts: int = LLM_RETRY_MAX_ATTEMPTS
+    base_delay: float = LLM_RETRY_BASE_DELAY_SECONDS
+    max_delay: float = LLM_RETRY_MAX_DELAY_SECONDS
+    retryable_status_codes: FrozenSet[int] = RETRYABLE_STATUS_CODES
+
+    def is_retryable(self, error: Optional[BaseException]) -> bool:
+        if error is None:
+            # Failures raised by the client itself (e.g. empty output) carry no API error
+            return False
+        status = getattr(error, "status_code", None)
+        if status is not None:
+            return status in self.retryable_status_codes
+        return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+    def next_delay(self, attempt: int, error: Optional[BaseException]) -> Optional[float]:
+        """Seconds to wait before the next attempt (attempt counts from 1), or None to give up."""
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+        # Full jitter keeps concurrent jobs that failed together from retrying together
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        retry_after = parse_reset_duration(headers.get("retry-after")) if headers else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+class LatencyTracker:
+    """Recent successful call durations for one model and stage."""
+
+    def __init__(self, max_samples: int = 200):
+        self._samples: deque = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: Optional[float]) -> None:
+        if seconds is None:
+            return
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+@dataclass(slots=True)
+class HedgePolicy:
+    """
+    Fire a duplicate of a call once it has been running longer than the given latency percentile of
+    its stage, and keep hedges to at most max_ratio of all calls so tail cutting cannot double the spend.
+    """
+    enabled: bool = LLM_HEDGING
+    percentile: float = LLM_HEDGE_PERCENTILE
+    min_samples: int = LLM_HEDGE_MIN_SAMPLES
+    max_ratio: float = LLM_HEDGE_MAX_RATIO
+    _calls: int = field(default=0, init=False)
+    _hedges: int = field(default=0, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def hedge_after(self, tracker: LatencyTracker) -> Optional[float]:
+        """Delay after which the call may be hedged, or None when hedging is off or not yet calibrated."""
+        with self._lock:
+            self._calls += 1
+        if not self.enabled or len(tracker) < self.min_samples:
+            return None
+        return tracker.percentile(self.percentile)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._hedges + 1 > self.max_ratio * self._calls:
+                return False
+            self._hedges += 1
+            return True
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {"calls": self._calls, "hedges": self._hedges}
+
+
+_TRACKERS: Dict[Tuple[str, str], LatencyTracker] = {}
+_HEDGE_POLICIES: Dict[str, HedgePolicy] = {}
+_LOCK = threading.Lock()
+
+
+def get_latency_tracker(model: str, stage: Optional[str]) -> LatencyTracker:
+    key = (model, stage or "unknown")
+    with _LOCK:
+        if key not in _TRACKERS:
+            _TRACKERS[key] = LatencyTracker()
+        return _TRACKERS[key]
+
+
+def get_hedge_policy(model: str) -> HedgePolicy:
+    with _LOCK:
+        if model not in _HEDGE_POLICIES:
+            _HEDGE_POLICIES[model] = HedgePolicy()
+        return _HEDGE_POLICIES[model]
+
+
+class PartialGate:
+    """Forwards streaming callbacks until a winner is picked, so a losing hedge cannot overwrite the result."""
+
+    def __init__(self, on_partial):
+        self._on_partial = on_partial
+        self._open = True
+        self._lock = threading.Lock()
+
+    def __call__(self, array_key: str, item: dict, fields: dict) -> None:
+        with self._lock:
+            if self._open and self._on_partial is not None:
+                self._on_partial(array_key, item, fields)
+
+    def close(self) -> None:
+        with self._lock:
+            self._open = False
@@ -0,0 +1,334 @@
+"""
+Offline stand-in for the OpenAI Responses API, for load tests of the workflow without network access.
+SimulatedLLMClient goes through the same rate limiter, retry, hedging and streaming code as OpenAIClient;
+only the API call itself is replaced. Latency, token usage, x-ratelimit-* headers, truncation and
+injected 429/5xx/timeout failures follow the LLM_SIMULATOR_* settings, and structured output is a
+random but schema-valid instance of the requested text_format.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+import types
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+import httpx
+from openai import APIStatusError, APITimeoutError, InternalServerError, RateLimitError
+from pydantic import BaseModel
+
+from src.config.runtime import (
+    LLM_SIMULATOR_LATENCY_SCALE,
+    LLM_SIMULATOR_PROFILES,
+    LLM_SIMULATOR_DEFAULT_PROFILE,
+    LLM_SIMULATOR_REASONING_TOKENS,
+    LLM_SIMULATOR_RATE_LIMITS,
+    LLM_DEFAULT_RATE_LIMIT,
+    LLM_SIMULATOR_ERROR_RATES,
+    LLM_SIMULATOR_TRUNCATION_RATE,
+    LLM_SIMULATOR_TIMEOUT_SECONDS,
+    LLM_SIMULATOR_JUDGE_PASS_RATE,
+    LLM_SIMULATOR_SEED,
+)
+from src.llm.llm_client import LLMClientError, LLMResponse, OpenAIClient
+from src.llm.partial_json import StreamingArrayExtractor
+from src.llm.rate_limiter import ModelRateLimiter, Reservation
+from src.llm.retry_policy import RetryPolicy, get_hedge_policy
+from src.utils.token_estimator import CHARS_PER_TOKEN, count_tokens
+
+_REQUEST = httpx.Request("POST", "https://llm-simulator.local/v1/responses")
+_WORDS = (
+    "revenue guidance margin growth quarter demand pricing customers pipeline backlog bookings "
+    "retention expansion platform enterprise adoption investment headcount efficiency outlook "
+    "seasonality churn conversion visibility macro budget cycle segment international mix"
+).split()
+# Items per generated list, by nesting depth (analysts/topics, then questions, then bullets)
+_LIST_ITEMS = [(2, 6), (1, 3), (1, 2)]
+_LONG_TEXT_FIELDS = ("summary", "overview", "description", "text")
+_STREAM_CHUNK_CHARS = 200
+# Criteria listed as "- metric_name: question" in a judge prompt
+_CRITERION_LINE = re.compile(r"^- ([a-z]+(?:_[a-z]+)*): ", re.MULTILINE)
+
+
+@dataclass(slots=True)
+class SimulatedCall:
+    first_token_delay: float
+    generation_delay: float
+    response: Any = None
+    headers: Optional[Dict[str, str]] = None
+    error: Optional[BaseException] = None
+
+
+class _ProviderWindow:
+    """Requests and tokens counted per one-minute window, as the provider reports them in its headers."""
+
+    def __init__(self, limits: Dict[str, int]):
+        self.requests_limit = int(limits["requests_per_minute"])
+        self.tokens_limit = int(limits["tokens_per_minute"])
+        self._started = time.monotonic()
+        self._requests = 0
+        self._tokens = 0
+        self._lock = threading.Lock()
+
+    def admit(self, tokens: int) -> Tuple[bool, Dict[str, str]]:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._started >= 60.0:
+                self._started, self._requests, self._tokens = now, 0, 0
+            admitted = (self._requests + 1 <= self.requests_limit
+                        and self._tokens + tokens <= self.tokens_limit)
+            if admitted:
+                self._requests += 1
+                self._tokens += tokens
+            reset = f"{max(0.0, self._started + 60.0 - now):.3f}s"
+            headers = {
+                "x-ratelimit-limit-requests": str(self.requests_limit),
+                "x-ratelimit-remaining-requests": str(max(0, self.requests_limit - self._requests)),
+                "x-ratelimit-reset-requests": reset,
+                "x-ratelimit-limit-tokens": str(self.tokens_limit),
+                "x-ratelimit-remaining-tokens": str(max(0, self.tokens_limit - self._tokens)),
+                "x-ratelimit-reset-tokens": reset,
+            }
+            if not admitted:
+                headers["retry-after"] = reset.rstrip("s")
+            return admitted, headers
+
+
+def _api_error(status: int, headers: Dict[str, str]) -> APIStatusError:
+    response = httpx.Response(status, headers=headers, request=_REQUEST)
+    if status == 429:
+        return RateLimitError("Simulated rate limit exceeded", response=response, body=None)
+    if status >= 500:
+        return InternalServerError(f"Simulated server error {status}", response=response, body=None)
+    return APIStatusError(f"Simulated error {status}", response=response, body=None)
+
+
+def _words(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(low, high)))
+
+
+def _fake_value(annotation: Any, name: str, rng: random.Random, depth: int) -> Any:
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        # Optional fields are always filled, as a model following the schema would
+        return _fake_value(next(a for a in get_args(annotation) if a is not type(None)), name, rng, depth)
+    if origin is list:
+        low, high = _LIST_ITEMS[min(depth, len(_LIST_ITEMS) - 1)]
+        return [_fake_value(get_args(annotation)[0], name, rng, depth + 1) for _ in range(rng.randint(low, high))]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {field: _fake_value(info.annotation, field, rng, depth)
+                for field, info in annotation.model_fields.items()}
+    if annotation is bool:
+        return rng.random() < LLM_SIMULATOR_JUDGE_PASS_RATE
+    if annotation is int:
+        return rng.randint(0, 20)
+    if annotation is float:
+        return round(rng.random(), 3)
+    if any(hint in name for hint in _LONG_TEXT_FIELDS):
+        return _words(rng, 30, 80).capitalize() + "."
+    return _words(rng, 2, 6).title()
+
+
+def _make_consistent(data: Any) -> Any:
+    """Judge invariants the schema cannot express: passed criteria list no errors, totals add up."""
+    if isinstance(data, list):
+        return [_make_consistent(item) for item in data]
+    if not isinstance(data, dict):
+        return data
+    data = {key: _make_consistent(value) for key, value in data.items()}
+    if data.get("passed") is True and "errors" in data:
+        data["errors"] = []
+    results = data.get("evaluation_results")
+    if isinstance(results, list) and isinstance(data.get("overall_assessment"), dict):
+        passed = sum(1 for r in results if r.get("passed"))
+        data["overall_assessment"].update({
+            "total_criteria": len(results),
+            "passed_criteria": passed,
+            "failed_criteria": len(results) - passed,
+            "overall_passed": passed == len(results),
+            "pass_rate": round(passed / len(results), 3) if results else 0.0,
+            "evaluation_timestamp": datetime.now().isoformat(),
+        })
+    return data
+
+
+def fake_output(text_format: Type[BaseModel], rng: random.Random, metric_names: Optional[List[str]] = None) -> dict:
+    """
+    A random instance of the schema, as a dict that text_format.model_validate accepts.
+    Judge evaluation results get one entry per metric name listed in the prompt, when given.
+    """
+    data = _fake_value(text_format, "", rng, 0)
+    if metric_names and isinstance(data.get("evaluation_results"), list):
+        item_type = get_args(text_format.model_fields["evaluation_results"].annotation)[0]
+        data["evaluation_results"] = [
+            {**_fake_value(item_type, "evaluation_results", rng, 1), "metric_name": name} for name in metric_names]
+    return _make_consistent(data)
+
+
+class SimulatedLLMClient(OpenAIClient):
+    """OpenAIClient whose API calls are simulated locally; everything around the call is the real code."""
+
+    _WINDOWS: Dict[str, _ProviderWindow] = {}
+    _WINDOWS_LOCK = threading.Lock()
+
+    def __init__(self, model: str = "gpt-5-mini"):
+        # No SDK clients or HTTP pool: only the call methods below touch the "network"
+        self.model = model
+        self.http_pool = None
+        self.retry_policy = RetryPolicy()
+        self.hedge_policy = get_hedge_policy(model)
+        self.profile = LLM_SIMULATOR_PROFILES.get(model, LLM_SIMULATOR_DEFAULT_PROFILE)
+        self._rng = random.Random(LLM_SIMULATOR_SEED)
+        self._seen_prompt_cache_keys = set()
+        with self._WINDOWS_LOCK:
+            if model not in self._WINDOWS:
+                self._WINDOWS[model] = _ProviderWindow(
+                    LLM_SIMULATOR_RATE_LIMITS.get(model, LLM_DEFAULT_RATE_LIMIT))
+            self.window = self._WINDOWS[model]
+
+    # ---- simulated provider ----
+
+    def _injected_error(self) -> Optional[str]:
+        roll = self._rng.random()
+        for kind, rate in LLM_SIMULATOR_ERROR_RATES.items():
+            if roll < rate:
+                return kind
+            roll -= rate
+        return None
+
+    def _first_token_delay(self) -> float:
+        median = self.profile["ttft_median_seconds"]
+        return self._rng.lognormvariate(math.log(median), self.profile["ttft_sigma"]) * LLM_SIMULATOR_LATENCY_SCALE
+
+    def _reasoning_tokens(self, effort_level: Optional[str]) -> int:
+        median = LLM_SIMULATOR_REASONING_TOKENS.get(effort_level or "", 0)
+        return int(self._rng.lognormvariate(math.log(median), 0.4)) if median else 0
+
+    def _simulate(self, base: dict, text_format: Optional[Type[BaseModel]]) -> SimulatedCall:
+        instructions, user_input = base.get("instructions") or "", base.get("input") or ""
+        input_tokens = count_tokens(instructions) + count_tokens(user_input)
+        max_output_tokens = int(base.get("max_output_tokens") or 0)
+
+        admitted, headers = self.window.admit(input_tokens + max_output_tokens)
+        if not admitted:
+            return SimulatedCall(0.05 * LLM_SIMULATOR_LATENCY_SCALE, 0.0, headers=headers, error=_api_error(429, headers))
+        kind = self._injected_error()
+        if kind == "timeout":
+            return SimulatedCall(LLM_SIMULATOR_TIMEOUT_SECONDS * LLM_SIMULATOR_LATENCY_SCALE, 0.0,
+                                 error=APITimeoutError(request=_REQUEST))
+        if kind is not None:
+            status = int(kind)
+            if status == 429:
+                headers = {**headers, "retry-after": "1"}
+            return SimulatedCall(self._first_token_delay(), 0.0, headers=headers, error=_api_error(status, headers))
+
+        # Same prompt, same content: only timing and failures vary between attempts
+        content_rng = random.Random(hashlib.sha256((instructions + user_input).encode("utf-8")).hexdigest())
+        parsed = None
+        if text_format is not None:
+            metric_names = _CRITERION_LINE.findall(instructions)
+            parsed = text_format.model_validate(fake_output(text_format, content_rng, metric_names))
+            text = parsed.model_dump_json()
+        else:
+            text = " ".join(_words(content_rng, 12, 24).capitalize() + "." for _ in range(8))
+
+        reasoning_tokens = self._reasoning_tokens((base.get("reasoning") or {}).get("effort"))
+        visible_tokens = count_tokens(text)
+        status = "completed"
+        if reasoning_tokens + visible_tokens > max_output_tokens:
+            status = "incomplete"
+            visible_tokens = max(0, max_output_tokens - reasoning_tokens)
+        elif self._rng.random() < LLM_SIMULATOR_TRUNCATION_RATE:
+            status = "incomplete"
+            visible_tokens = int(visible_tokens * self._rng.uniform(0.2, 0.9))
+        if status == "incomplete":
+            text, parsed = text[:visible_tokens * CHARS_PER_TOKEN], None
+
+        prompt_cache_key = (base.get("extra_body") or {}).get("prompt_cache_key")
+        cached_tokens = 0
+        if prompt_cache_key in self._seen_prompt_cache_keys:
+            # The provider caches the shared prefix in 128-token steps from 1024 tokens
+            prefix_tokens = count_tokens(instructions)
+            cached_tokens = prefix_tokens // 128 * 128 if prefix_tokens >= 1024 else 0
+        elif prompt_cache_key:
+            self._seen_prompt_cache_keys.add(prompt_cache_key)
+
+        output_tokens = reasoning_tokens + visible_tokens
+        usage = types.SimpleNamespace(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            reasoning_tokens=reasoning_tokens,
+            input_tokens_details=types.SimpleNamespace(cached_tokens=cached_tokens),
+            output_tokens_details=types.SimpleNamespace(reasoning_tokens=reasoning_tokens),
+        )
+        response = types.SimpleNamespace(
+            output_text=text, output_parsed=parsed, status=status, usage=usage, output=[])
+        generation_delay = output_tokens / self.profile["tokens_per_second"] * LLM_SIMULATOR_LATENCY_SCALE
+        return SimulatedCall(self._first_token_delay(), generation_delay, response=response, headers=headers)
+
+    @staticmethod
+    def _raise_if_failed(call: SimulatedCall) -> None:
+        if call.error is not None:
+            raise LLMClientError(f"Simulated API error: {call.error}") from call.error
+
+    @staticmethod
+    def _stream_pieces(text: str) -> List[types.SimpleNamespace]:
+        return [types.SimpleNamespace(type="response.output_text.delta", delta=text[i:i + _STREAM_CHUNK_CHARS])
+                for i in range(0, len(text), _STREAM_CHUNK_CHARS)]
+
+    def _finish(self, call: SimulatedCall, text_format: Optional[Type[BaseModel]], start_time: float,
+                limiter: ModelRateLimiter, reservation: Reservation) -> LLMResponse:
+        text_output, status, parsed_resp = self._read_output(call.response, text_format)
+        # Plain and streamed calls both carry the simulated rate-limit headers
+        raw_api_resp = types.SimpleNamespace(headers=call.headers)
+        return self._to_llm_response(
+            raw_api_resp, call.response, text_output, status, parsed_resp, start_time, limiter, reservation)
+
+    # ---- OpenAIClient call overrides ----
+
+    def _generate_once(self, base: dict, text_format: Optional[Type[BaseModel]],
+                       limiter: ModelRateLimiter, reservation: Reservation) -> LLMResponse:
+        start_time = time.time()
+        call = self._simulate(base, text_format)
+        time.sleep(call.first_token_delay + call.generation_delay)
+        self._raise_if_failed(call)
+        return self._finish(call, text_format, start_time, limiter, reservation)
+
+    async def _agenerate_once(self, base: dict, text_format: Optional[Type[BaseModel]],
+                              limiter: ModelRateLimiter, reservation: Reservation) -> LLMResponse:
+        start_time = time.time()
+        call = self._simulate(base, text_format)
+        await asyncio.sleep(call.first_token_delay + call.generation_delay)
+        self._raise_if_failed(call)
+        return self._finish(call, text_format, start_time, limiter, reservation)
+
+    def _generate_streaming(self, base: dict, text_format: Type[BaseModel], on_partial,
+                            limiter: ModelRateLimiter, reservation: Reservation) -> LLMResponse:
+        start_time = time.time()
+        call = self._simulate(base, text_format)
+        time.sleep(call.first_token_delay)
+        self._raise_if_failed(call)
+        extractor = StreamingArrayExtractor()
+        events = self._stream_pieces(call.response.output_text)
+        for event in events:
+            time.sleep(call.generation_delay / len(events))
+            self._feed_partial(extractor, event, on_partial)
+        return self._finish(call, text_format, start_time, limiter, reservation)
+
+    async def _agenerate_streaming(self, base: dict, text_format: Type[BaseModel], on_partial,
+                                   limiter: ModelRateLimiter, reservation: Reservation) -> LLMResponse:
+        start_time = time.time()
+        call = self._simulate(base, text_format)
+        await asyncio.sleep(call.first_token_delay)
+        self._raise_if_failed(call)
+        extractor = StreamingArrayExtractor()
+        events = self._stream_pieces(call.response.output_text)
+        for event in events:
+            await asyncio.sleep(call.generation_delay / len(events))
+            self._feed_partial(extractor, event, on_partial)
+        return self._finish(call, text_format, start_time, limiter, reservation)
@@ -0,0 +1,127 @@
+"""
+Per-job token budgets from the counts stored with the transcript at validation time:
+the Q&A max_output_tokens sized from the analyst/question counts, and a pre-flight check
+that every stage's prompt plus output budget fits the model's context window.
+"""
+
+import math
+from typing import Dict, Optional
+
+from src.config.runtime import (
+    JUDGE_MODEL,
+    OVERVIEW_MODEL,
+    MODEL_CONTEXT_WINDOWS,
+    MODEL_MAX_OUTPUT_TOKENS,
+    DEFAULT_CONTEXT_WINDOW,
+    DEFAULT_MAX_OUTPUT_TOKENS,
+    Q_A_OUTPUT_TOKENS_BASE,
+    Q_A_OUTPUT_TOKENS_PER_ANALYST,
+    Q_A_OUTPUT_TOKENS_PER_QUESTION,
+    Q_A_OUTPUT_BUDGET_SAFETY,
+    Q_A_OUTPUT_BUDGET_MIN,
+    REASONING_TOKEN_RESERVE,
+    Q_A_CHUNKED_MIN_CHARS,
+    Q_A_CHUNK_TARGET_CHARS,
+    Q_A_MAX_CHUNKS,
+)
+from src.llm.llm_utils import get_prompt_config, stage_prompt_template
+from src.utils.token_estimator import count_tokens
+
+
+def plan_q_a_output_tokens(q_a_stats: Optional[Dict], summary_length: str, model: str, effort_level: Optional[str]) -> Optional[int]:
+    """
+    max_output_tokens for the Q&A summary, or None to keep the prompt's value when the question count
+    is unknown or unreliable (stats saved before questions were counted, or no question marks found).
+    """
+    if not q_a_stats or not q_a_stats.get("questions_counted"):
+        return None
+    per_question = Q_A_OUTPUT_TOKENS_PER_QUESTION.get(
+        summary_length, max(Q_A_OUTPUT_TOKENS_PER_QUESTION.values()))
+    visible = (Q_A_OUTPUT_TOKENS_BASE
+               + q_a_stats.get("analysts", 0) * Q_A_OUTPUT_TOKENS_PER_ANALYST
+               + q_a_stats.get("questions", 0) * per_question)
+    # Reasoning tokens count against max_output_tokens on reasoning models
+    reserve = REASONING_TOKEN_RESERVE.get(effort_level or "", 0)
+    budget = math.ceil(visible * Q_A_OUTPUT_BUDGET_SAFETY) + reserve
+    return max(Q_A_OUTPUT_BUDGET_MIN, min(budget, MODEL_MAX_OUTPUT_TOKENS.get(model, DEFAULT_MAX_OUTPUT_TOKENS)))
+
+
+def _expected_q_a_chunks(call_type: str, q_a_chars: int) -> int:
+    min_chars = Q_A_CHUNKED_MIN_CHARS.get((call_type or "").lower())
+    if min_chars is None or q_a_chars < min_chars:
+        return 1
+    target = max(Q_A_CHUNK_TARGET_CHARS, q_a_chars // Q_A_MAX_CHUNKS + 1)
+    return max(1, min(Q_A_MAX_CHUNKS, q_a_chars // target))
+
+
+def _stage_plan(stage: str, model: str, variable_tokens: int, max_output_tokens: int,
+                call_type: str, summary_length: str, answer_format: str) -> Dict:
+    template, _ = stage_prompt_template(stage, call_type, summary_length, answer_format)
+    input_tokens = count_tokens(template, model) + variable_tokens
+    context_window = MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+    return {
+        "model": model,
+        "input_tokens": input_tokens,
+        "max_output_tokens": max_output_tokens,
+        "context_window": context_window,
+        "fits": input_tokens + max_output_tokens <= context_window,
+    }
+
+
+def plan_job_tokens(transcript_doc: Dict, call_type: str, summary_length: str, answer_format: str = "prose") -> Dict:
+    """
+    Estimated input tokens and output budget of every stage for this transcript and configuration.
+    The judge reads the whole Q&A transcript plus the summary; the overview the presentation plus the summary.
+    """
+    token_counts = transcript_doc.get("token_counts") or {}
+    transcripts = transcript_doc.get("transcripts") or {}
+    q_a_tokens = token_counts.get("q_a")
+    if q_a_tokens is None:
+        q_a_tokens = count_tokens(transcripts.get("q_a") or "")
+    presentation_tokens = token_counts.get("presentation")
+    if presentation_tokens is None:
+        presentation_tokens = count_tokens(transcripts.get("presentation") or "")
+
+    prompt_config = get_prompt_config(call_type, summary_length, answer_format)
+    _, q_a_prompt_max = stage_prompt_template("q_a_summary", call_type, summary_length, answer_format)
+    q_a_budget = plan_q_a_output_tokens(
+        transcript_doc.get("qa_stats"), summary_length, prompt_config["model"], prompt_config["effort_level"])
+    q_a_max_output = q_a_budget or q_a_prompt_max
+    chunks = _expected_q_a_chunks(call_type, len(transcripts.get("q_a") or ""))
+
+    # The summary passed on to judge/overview is at most the Q&A output budget (reasoning excluded)
+    summary_tokens = q_a_max_output
+    _, judge_max = stage_prompt_template("judge", call_type, summary_length, answer_format)
+    _, overview_max = stage_prompt_template("overview", call_type, summary_length, answer_format)
+
+    stages = {
+        "q_a_summary": _stage_plan(
+            "q_a_summary", prompt_config["model"], math.ceil(q_a_tokens / chunks),
+            q_a_max_output if chunks == 1 else q_a_prompt_max, call_type, summary_length, answer_format),
+        "judge": _stage_plan(
+            "judge", JUDGE_MODEL, q_a_tokens + summary_tokens, judge_max, call_type, summary_length, answer_format),
+        "overview": _stage_plan(
+            "overview", OVERVIEW_MODEL, presentation_tokens + summary_tokens, overview_max, call_type, summary_length, answer_format),
+    }
+    stages["q_a_summary"]["chunks"] = chunks
+    stages["q_a_summary"]["adaptive_max_output_tokens"] = q_a_budget
+    return {
+        "stages": stages,
+        "fits": all(plan["fits"] for plan in stages.values()),
+    }
+
+
+def preflight_context_error(plan: Dict) -> Optional[Dict]:
+    """Error payload for the first stage that would overflow its context window, or None."""
+    for stage, stage_plan in plan["stages"].items():
+        if not stage_plan["fits"]:
+            return {
+                "code": "context_window_exceeded",
+                "message": (
+                    f"The transcript is too long for the {stage} stage: about {stage_plan['input_tokens']} input tokens "
+                    f"plus {stage_plan['max_output_tokens']} output tokens exceed the {stage_plan['context_window']}-token "
+                    f"context window of {stage_plan['model']}."
+                ),
+                "stage": stage,
+            }
+    return None
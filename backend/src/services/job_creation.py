@@ -1,3 +1,4 @@
+import asyncio
 import hashlib
 import json
 import logging
@@ -6,21 +7,36 @@ import threading
 from datetime import datetime
 from typing import Dict, Any
 
-from src.config.constants import CACHE_DIR
-from src.services.summary_workflow import run_summary_workflow_from_saved_transcripts
+from src.config.constants import (
+    CACHE_DIR,
+    NEAR_DUPLICATE_MIN_SIMILARITY,
+    NEAR_DUPLICATE_MAX_ENTRIES,
+    NEAR_DUPLICATE_MAX_Q_A_LENGTH_DELTA,
+)
+from src.services.summary_workflow import (
+    run_summary_workflow_from_saved_transcripts,
+    arun_summary_workflow_from_saved_transcripts,
+)
 from src.utils.job_state import JobStatusManager
 from src.utils.job_utils import _write_json_atomic
+from src.utils.transcript_fingerprint import fingerprint_transcripts, simhash_similarity
 from src.config.runtime import (
     CONFERENCE_LONG_QA_PROMPT_VERSION,
     EARNINGS_SHORT_QA_PROMPT_VERSION,
     EARNINGS_LONG_QA_PROMPT_VERSION,
     OVERVIEW_PROMPT_VERSION,
     JUDGE_PROMPT_VERSION,
+    JUDGE_FAN_OUT,
+    JUDGE_FAN_OUT_PROMPT_VERSION,
+    SUMMARY_WORKFLOW_MODE,
 )
 
 logger = logging.getLogger(__name__)
 
 _JOB_INDEX_PATH = os.path.join(CACHE_DIR, "job_index.json")
+# Parameter signature (without content hash) -> [{simhash, content_hash, job_id, shape}]
+_FINGERPRINT_INDEX_PATH = os.path.join(CACHE_DIR, "fingerprint_index.json")
+_FINGERPRINT_INDEX_LOCK = threading.Lock()
 
 
 def _compute_signature(content_hash: str, call_type: str, summary_length: str, prompt_sig: str, answer_format: str = "prose") -> str:
@@ -34,6 +50,16 @@ def _compute_signature(content_hash: str, call_type: str, summary_length: str, p
     return hashlib.sha1(raw).hexdigest()[:32]
 
 
+def _prompt_signature(call_type: str, summary_length: str) -> str:
+    if call_type.lower() == "conference":
+        q_a_prompt_ver = CONFERENCE_LONG_QA_PROMPT_VERSION
+    else:
+        q_a_prompt_ver = EARNINGS_SHORT_QA_PROMPT_VERSION if (
+            summary_length or "").lower() == "short" else EARNINGS_LONG_QA_PROMPT_VERSION
+    judge_prompt_ver = JUDGE_FAN_OUT_PROMPT_VERSION if JUDGE_FAN_OUT else JUDGE_PROMPT_VERSION
+    return f"{q_a_prompt_ver}|{OVERVIEW_PROMPT_VERSION}|{judge_prompt_ver}"
+
+
 # Helper function to read the job index
 def _read_json_file(path: str) -> dict:
     try:
@@ -72,6 +98,72 @@ def _can_reuse_job(job_id: str) -> bool:
     return True
 
 
+def _transcript_simhash(transcript_doc: dict) -> str | None:
+    """Simhash stored at validation time; computed on the fly for transcripts saved before it existed."""
+    simhash = transcript_doc.get("simhash")
+    if isinstance(simhash, str) and simhash:
+        return simhash
+    transcripts = transcript_doc.get("transcripts") or {}
+    if not (transcripts.get("presentation") or transcripts.get("q_a")):
+        return None
+    return fingerprint_transcripts((transcripts.get("presentation") or "").strip(),
+                                   (transcripts.get("q_a") or "").strip())
+
+
+def _transcript_shape(transcript_doc: dict) -> Dict[str, Any]:
+    """Q&A length and analyst/question counts, used to confirm a simhash match."""
+    transcripts = transcript_doc.get("transcripts") or {}
+    qa_stats = transcript_doc.get("qa_stats") or {}
+    return {
+        "q_a_chars": len((transcripts.get("q_a") or "").strip()),
+        "analysts": qa_stats.get("analysts"),
+        "questions": qa_stats.get("questions"),
+    }
+
+
+def _same_shape(shape: Dict[str, Any], other: Any) -> bool:
+    # Entries indexed before the shape was recorded cannot be confirmed
+    if not isinstance(other, dict):
+        return False
+    if shape["analysts"] != other.get("analysts") or shape["questions"] != other.get("questions"):
+        return False
+    longest = max(shape["q_a_chars"], other.get("q_a_chars") or 0)
+    if not longest:
+        return True
+    return abs(shape["q_a_chars"] - (other.get("q_a_chars") or 0)) / longest <= NEAR_DUPLICATE_MAX_Q_A_LENGTH_DELTA
+
+
+def _remember_fingerprint(params_signature: str, simhash: str, content_hash: str, job_id: str, shape: Dict[str, Any]) -> None:
+    with _FINGERPRINT_INDEX_LOCK:
+        index = _read_json_file(_FINGERPRINT_INDEX_PATH)
+        entries = [e for e in (index.get(params_signature) or [])
+                   if isinstance(e, dict) and e.get("content_hash") != content_hash]
+        entries.append({"simhash": simhash,
+                       "content_hash": content_hash, "job_id": job_id, "shape": shape})
+        # Keep the most recent entries only
+        index[params_signature] = entries[-NEAR_DUPLICATE_MAX_ENTRIES:]
+        _write_json_atomic(_FINGERPRINT_INDEX_PATH, index)
+
+
+def _find_near_duplicate_job(params_signature: str, simhash: str, shape: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Return the most similar reusable job above NEAR_DUPLICATE_MIN_SIMILARITY with the same Q&A shape, if any."""
+    if NEAR_DUPLICATE_MIN_SIMILARITY >= 1.0:
+        return None
+    entries = _read_json_file(_FINGERPRINT_INDEX_PATH).get(params_signature) or []
+    candidates = []
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not isinstance(entry.get("job_id"), str):
+            continue
+        similarity = simhash_similarity(simhash, entry.get("simhash"))
+        if similarity >= NEAR_DUPLICATE_MIN_SIMILARITY and _same_shape(shape, entry.get("shape")):
+            candidates.append((similarity, position, entry))
+    # Most similar first; among equals, the most recently indexed
+    for similarity, _, entry in sorted(candidates, key=lambda c: (c[0], c[1]), reverse=True):
+        if _can_reuse_job(entry["job_id"]):
+            return {**entry, "similarity": similarity}
+    return None
+
+
 def _run_workflow_background(
     transcript_json_name: str,
     call_type_bg: str,
@@ -94,6 +186,54 @@ def _run_workflow_background(
             "Background summary workflow failed for %s: %s", transcript_json_name, e)
 
 
+async def _arun_workflow_background(
+    transcript_json_name: str,
+    call_type_bg: str,
+    summary_length_bg: str,
+    job_dir_bg: str,
+    answer_format_bg: str = "prose",
+) -> None:
+    try:
+        await arun_summary_workflow_from_saved_transcripts(
+            transcript_name=transcript_json_name,
+            call_type=call_type_bg,
+            summary_length=summary_length_bg,
+            job_dir=job_dir_bg,
+            answer_format=answer_format_bg,
+        )
+    except asyncio.CancelledError:
+        logger.info("Summary workflow cancelled for %s", transcript_json_name)
+        raise
+    except Exception as e:
+        logger.exception(
+            "Background summary workflow failed for %s: %s", transcript_json_name, e)
+
+
+def _start_workflow(job_id: str, transcript_name: str, call_type: str, summary_length: str, job_dir: str, answer_format: str) -> None:
+    if SUMMARY_WORKFLOW_MODE == "asyncio":
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            task = loop.create_task(_arun_workflow_background(
+                transcript_name, call_type, summary_length, job_dir, answer_format))
+            JobStatusManager.register_task(job_id, task)
+            return
+        logger.warning(
+            "No running event loop for job %s; running the workflow in a thread", job_id)
+
+    cancel_evt = threading.Event()
+    JobStatusManager.register_cancel_event(job_id, cancel_evt)
+
+    threading.Thread(
+        target=_run_workflow_background,
+        args=(transcript_name, call_type,
+              summary_length, job_dir, cancel_evt, answer_format),
+        daemon=True,
+    ).start()
+
+
 def _create_new_job(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Creates a new job, starts the workflow, and updates the dedup index."""
     transcript_name = payload.get("transcript_name",  "transcript.json")
@@ -126,16 +266,9 @@ def _create_new_job(payload: Dict[str, Any]) -> Dict[str, Any]:
     }
     _write_json_atomic(os.path.join(job_dir, "status.json"), status_payload)
 
-    # 3. Start Background Workflow
-    cancel_evt = threading.Event()
-    JobStatusManager.register_cancel_event(job_id, cancel_evt)
-
-    threading.Thread(
-        target=_run_workflow_background,
-        args=(transcript_name, call_type,
-              summary_length, job_dir, cancel_evt, answer_format),
-        daemon=True,
-    ).start()
+    # 3. Start Background Workflow (worker thread, or a task on the API event loop)
+    _start_workflow(job_id, transcript_name, call_type,
+                    summary_length, job_dir, answer_format)
 
     # pdate Dedup Index for different prompt
     try:
@@ -143,12 +276,7 @@ def _create_new_job(payload: Dict[str, Any]) -> Dict[str, Any]:
         transcript_doc = _read_json_file(transcript_path) or {}
         content_hash = transcript_doc.get("content_hash")
         if content_hash:
-            if call_type.lower() == "conference":
-                q_a_prompt_ver = CONFERENCE_LONG_QA_PROMPT_VERSION
-            else:
-                q_a_prompt_ver = EARNINGS_SHORT_QA_PROMPT_VERSION if (
-                    summary_length or "").lower() == "short" else EARNINGS_LONG_QA_PROMPT_VERSION
-            prompt_sig = f"{q_a_prompt_ver}|{OVERVIEW_PROMPT_VERSION}|{JUDGE_PROMPT_VERSION}"
+            prompt_sig = _prompt_signature(call_type, summary_length)
             signature = _compute_signature(
                 content_hash, call_type, summary_length, prompt_sig, answer_format)
 
@@ -161,6 +289,13 @@ def _create_new_job(payload: Dict[str, Any]) -> Dict[str, Any]:
             _write_json_atomic(_JOB_INDEX_PATH, index)
             logger.info("Dedup index updated: signature=%s job_id=%s",
                         signature, job_id)
+
+            simhash = _transcript_simhash(transcript_doc)
+            if simhash:
+                params_signature = _compute_signature(
+                    "*", call_type, summary_length, prompt_sig, answer_format)
+                _remember_fingerprint(
+                    params_signature, simhash, content_hash, job_id, _transcript_shape(transcript_doc))
     except Exception as e:
         logger.warning(
             "Failed to update dedup index for job %s: %s", job_id, e)
@@ -186,12 +321,7 @@ def _reuse_existing_job(payload: Dict[str, Any]) -> Dict[str, Any] | None:
         return None
 
     # Build prompt signature
-    if call_type.lower() == "conference":
-        q_a_prompt_ver = CONFERENCE_LONG_QA_PROMPT_VERSION
-    else:
-        q_a_prompt_ver = EARNINGS_SHORT_QA_PROMPT_VERSION if (
-            summary_length or "").lower() == "short" else EARNINGS_LONG_QA_PROMPT_VERSION
-    prompt_sig = f"{q_a_prompt_ver}|{OVERVIEW_PROMPT_VERSION}|{JUDGE_PROMPT_VERSION}"
+    prompt_sig = _prompt_signature(call_type, summary_length)
 
     answer_format = (payload.get("input", {}) or {}).get(
         "answer_format", "prose")
@@ -209,4 +339,24 @@ def _reuse_existing_job(payload: Dict[str, Any]) -> Dict[str, Any] | None:
 
         return {**payload, "job_id": existing_job_id, "dedup_hit": True}
 
+    # No exact match: look for a near-identical transcript summarized with the same parameters
+    simhash = _transcript_simhash(transcript_doc or {})
+    if simhash:
+        params_signature = _compute_signature(
+            "*", call_type, summary_length, prompt_sig, answer_format)
+        match = _find_near_duplicate_job(
+            params_signature, simhash, _transcript_shape(transcript_doc or {}))
+        if match:
+            logger.info("Near-duplicate dedup hit: similarity=%.3f job_id=%s",
+                        match["similarity"], match["job_id"])
+            return {
+                **payload,
+                "job_id": match["job_id"],
+                "dedup_hit": True,
+                "near_duplicate": {
+                    "similarity": round(match["similarity"], 4),
+                    "matched_content_hash": match["content_hash"],
+                },
+            }
+
     return None
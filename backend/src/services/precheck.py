@@ -1,13 +1,25 @@
 import os
+import tempfile
+import threading
 from datetime import datetime
+from typing import Optional, Tuple
 from fastapi import UploadFile
 from src.utils.pdf_processor import PDFProcessingError, create_pdf_processor
-from src.config.constants import CACHE_DIR
+from src.utils.job_utils import _read_json_file, _write_json_atomic
+from src.utils.speaker_turns import q_a_stats, speaker_index_name
+from src.utils.token_estimator import estimate_transcript_tokens
+from src.utils.transcript_fingerprint import fingerprint_transcripts
+from src.config.constants import CACHE_DIR, PDF_INDEX_MAX_ENTRIES, SPOOLED_FILESIZE, UPLOAD_SPOOL_CHUNK_BYTES
 
 import json
 import hashlib
 
 
+# Raw upload cache: sha256 of the PDF bytes -> transcript JSON it produced
+_PDF_INDEX_PATH = os.path.join(CACHE_DIR, "pdf_index.json")
+_PDF_INDEX_LOCK = threading.Lock()
+
+
 class PrecheckError(Exception):
     def __init__(self, code: str, message: str):
         # Getting the message from the built-in Exception
@@ -16,37 +28,276 @@ class PrecheckError(Exception):
         self.message = message 
 
 
-def run_validate_file(file: UploadFile, call_type: str, summary_length: str, answer_format: str = "prose"):
-    processor = create_pdf_processor(save_transcripts_dir=CACHE_DIR)
+def _pdf_index_entry_is_valid(entry) -> bool:
+    """An index entry is usable while its transcript JSON still carries the recorded content hash."""
+    if not isinstance(entry, dict) or not entry.get("transcript_name"):
+        return False
+    # The transcript JSON may have been overwritten by another upload with the same filename
+    saved = _read_json_file(os.path.join(CACHE_DIR, entry["transcript_name"]))
+    return bool(saved) and saved.get("content_hash") == entry.get("content_hash")
+
+
+def _lookup_pdf_cache(pdf_hash: str) -> Optional[str]:
+    """Return the transcript JSON name previously extracted from these exact bytes, if it is still valid."""
+    entry = _read_json_file(_PDF_INDEX_PATH).get(pdf_hash)
+    if entry is None:
+        return None
+    if not _pdf_index_entry_is_valid(entry):
+        _forget_pdf(pdf_hash)
+        return None
+    return entry["transcript_name"]
+
+
+def _forget_pdf(pdf_hash: str) -> None:
+    with _PDF_INDEX_LOCK:
+        index = _read_json_file(_PDF_INDEX_PATH)
+        if index.pop(pdf_hash, None) is not None:
+            _write_json_atomic(_PDF_INDEX_PATH, index)
+
+
+def _remember_pdf(pdf_hash: str, transcript_name: str, content_hash: str) -> None:
+    with _PDF_INDEX_LOCK:
+        index = _read_json_file(_PDF_INDEX_PATH)
+        # Re-insert so the dict order stays oldest -> newest
+        index.pop(pdf_hash, None)
+        index[pdf_hash] = {
+            "transcript_name": transcript_name,
+            "content_hash": content_hash,
+        }
+        if len(index) > PDF_INDEX_MAX_ENTRIES:
+            index = _valid_pdf_index_entries(index)
+            keep = PDF_INDEX_MAX_ENTRIES * 4 // 5
+            if len(index) > keep:
+                index = dict(list(index.items())[-keep:])
+        _write_json_atomic(_PDF_INDEX_PATH, index)
+
+
+def _valid_pdf_index_entries(index: dict) -> dict:
+    return {pdf_hash: entry for pdf_hash, entry in index.items() if _pdf_index_entry_is_valid(entry)}
+
+
+def _prune_pdf_index() -> None:
+    """Drop raw upload cache entries whose transcript JSON is gone or was overwritten."""
+    with _PDF_INDEX_LOCK:
+        index = _read_json_file(_PDF_INDEX_PATH)
+        pruned = _valid_pdf_index_entries(index)
+        if len(pruned) != len(index):
+            _write_json_atomic(_PDF_INDEX_PATH, pruned)
+            print(
+                f"[PRECHECK] PDF index prune: removed={len(index) - len(pruned)} kept={len(pruned)}")
+
+
+def _transcript_json_name(original_filename: str) -> str:
+    # Use the literal original filename for the transcript JSON name
+    base_name = os.path.basename(original_filename or "transcript.pdf")
+    return os.path.splitext(base_name)[0] + ".json"
+
+
+def _reuse_cached_transcript(cached_name: str, pdf_hash: str, original_filename: str, call_type: str, summary_length: str, answer_format: str) -> Optional[str]:
+    """Name the transcript after the current upload, taking only the content from the cached record.
+
+    Returns None when the cached record can no longer be read, so the caller extracts the PDF again.
+    """
+    json_name = _transcript_json_name(original_filename)
+    if json_name == cached_name:
+        return json_name
+    cached = _read_json_file(os.path.join(CACHE_DIR, cached_name))
+    if not cached:
+        return None
+    content_hash = cached.get("content_hash")
+    json_path = os.path.join(CACHE_DIR, json_name)
+    if _read_json_file(json_path).get("content_hash") != content_hash:
+        _write_json_atomic(json_path, {
+            **cached,
+            "validated_at": datetime.now().isoformat(),
+            "input": {
+                "call_type": call_type,
+                "summary_length": summary_length,
+                "answer_format": answer_format,
+                "filename": os.path.basename(original_filename),
+            },
+            "transcript_name": json_name,
+            "speaker_index": speaker_index_name(json_name),
+        })
+        cached_index = _read_json_file(
+            os.path.join(CACHE_DIR, speaker_index_name(cached_name)))
+        if cached_index:
+            _write_json_atomic(os.path.join(CACHE_DIR, speaker_index_name(json_name)), {
+                **cached_index,
+                "transcript_name": json_name,
+            })
+    _remember_pdf(pdf_hash, json_name, content_hash)
+    return json_name
+
+
+def _build_validation_output(call_type: str, summary_length: str, answer_format: str, original_filename: str, json_name: str, pdf_cache_hit: bool) -> dict:
+    return {
+        "is_validated": True,
+        "validated_at": datetime.now().isoformat(),
+        "input": {
+            "call_type": call_type,
+            "summary_length": summary_length,
+            "answer_format": answer_format,
+            # it will be the same with the matched existing file
+            "filename": os.path.basename(original_filename),
+        },
+        "transcript_name": json_name,
+        "pdf_cache_hit": pdf_cache_hit,
+    }
+
+
+def _build_no_qa_output(call_type: str, summary_length: str, answer_format: str, original_filename: str) -> dict:
+    return {
+        "is_validated": False,
+        "validated_at": datetime.now().isoformat(),
+        "input": {
+            "call_type": call_type,
+            "summary_length": summary_length,
+            "answer_format": answer_format,
+            "filename": os.path.basename(original_filename),
+        },
+        "transcript_name": None,
+        "pdf_cache_hit": False,
+        "error": {
+            "code": "no_q_a_transcript",
+            "message": "No Q&A transcript found in the document.",
+        },
+    }
 
-    original_filename = (file.filename or "transcript.pdf")
 
-    # Read bytes directly
-    pdf_bytes = file.file.read()
+def _spool_upload(file: UploadFile, max_bytes: int) -> Tuple[str, str, int, Optional[int]]:
+    """
+    Give the upload a path on disk, hashing it in fixed-size chunks so the whole PDF is never held in memory.
+    Returns (path, sha256, size, fd); fd is set when the path is FastAPI's own spooled file, kept open by it.
+    """
+    rolled = _rolled_upload_path(file)
+    if rolled is not None:
+        spool_path, spool_fd = rolled
+        try:
+            pdf_hash, size = _read_upload(file, max_bytes)
+        except BaseException:
+            _remove_spool(spool_path, spool_fd)
+            raise
+        return spool_path, pdf_hash, size, spool_fd
+
+    # Still in memory: stream it to a temporary file
+    fd, spool_path = tempfile.mkstemp(prefix="upload-", suffix=".pdf")
     try:
-        # Preserve user-provided filename
-        result = processor.process_pdf_bytes(
-            pdf_bytes, original_filename=original_filename
-        )
+        with os.fdopen(fd, "wb") as out:
+            pdf_hash, size = _read_upload(file, max_bytes, out)
+    except BaseException:
+        _remove_spool(spool_path)
+        raise
+    return spool_path, pdf_hash, size, None
+
+
+def _rolled_upload_path(file: UploadFile) -> Optional[Tuple[str, int]]:
+    """
+    FastAPI's UploadFile is a SpooledTemporaryFile; past its memory limit it already lives in an unnamed
+    temporary file. Expose that file as /proc/<pid>/fd/<fd> (readable by the extraction workers too)
+    through a duplicated descriptor, so it stays readable even if the request closes the upload first.
+    """
+    spooled = file.file
+    proc_fd_dir = f"/proc/{os.getpid()}/fd"
+    if not getattr(spooled, "_rolled", False) or not os.path.isdir(proc_fd_dir):
+        return None
+    try:
+        fd = os.dup(spooled.fileno())
+    except (AttributeError, OSError):
+        return None
+    return os.path.join(proc_fd_dir, str(fd)), fd
+
 
-        # DEBUG: Log the extracted content lengths and snippets
-        pres_transcript = result.get("presentation_transcript", "")
+def _read_upload(file: UploadFile, max_bytes: int, out=None) -> Tuple[str, int]:
+    """Read the upload from the start in chunks, enforcing max_bytes; copies it to out when given."""
+    hasher = hashlib.sha256()
+    size = 0
+    file.file.seek(0)
+    while True:
+        chunk = file.file.read(UPLOAD_SPOOL_CHUNK_BYTES)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise PrecheckError(
+                "file_too_large",
+                f"File size exceeds maximum allowed size ({max_bytes / (1024 * 1024)}MB)",
+            )
+        hasher.update(chunk)
+        if out is not None:
+            out.write(chunk)
+    return hasher.hexdigest(), size
 
-        qa_transcript = result.get("q_a_transcript", "")
 
-        if pres_transcript:
+def _remove_spool(spool_path: str, spool_fd: Optional[int] = None) -> None:
+    try:
+        # The upload's own file is deleted by FastAPI; only our descriptor on it is ours to close
+        if spool_fd is not None:
+            os.close(spool_fd)
+        else:
+            os.remove(spool_path)
+    except OSError:
+        pass
+
+
+def run_validate_file(file: UploadFile, call_type: str, summary_length: str, answer_format: str = "prose"):
+    original_filename = (file.filename or "transcript.pdf")
+
+    # Parse from a file on disk instead of reading the whole upload into memory
+    spool_path, pdf_hash, pdf_size, spool_fd = _spool_upload(
+        file, SPOOLED_FILESIZE * 1024 * 1024)
+    try:
+        # Same bytes uploaded before: reuse the stored transcript without opening the PDF
+        cached_name = _lookup_pdf_cache(pdf_hash) if pdf_size else None
+        if cached_name:
             print(
-                f"[PRECHECK] Presentation preview (first 200 chars): {pres_transcript[:200]}...")
+                f"[PRECHECK] PDF cache hit, reusing transcript: {cached_name}")
+            json_name = _reuse_cached_transcript(
+                cached_name, pdf_hash, original_filename, call_type, summary_length, answer_format)
+            if json_name:
+                return _build_validation_output(
+                    call_type, summary_length, answer_format, original_filename, json_name, pdf_cache_hit=True)
 
-        if qa_transcript:
+        processor = create_pdf_processor(
+            max_file_size_mb=SPOOLED_FILESIZE, save_transcripts_dir=CACHE_DIR)
+
+        # Reject documents without any Q&A title before the full span analysis and the transcript write;
+        # valid documents are extracted from the same open PDF, reusing the pre-scanned pages
+        try:
+            # Preserve user-provided filename
+            result = processor.prescan_and_process_pdf_file(
+                spool_path, original_filename=original_filename)
+        except PDFProcessingError as e:
+            raise PrecheckError("pdf_processing_error", str(e))
+        if result is None:
             print(
-                f"[PRECHECK] Q&A preview (first 200 chars): {qa_transcript[:200]}...")
-        else:
-            print("[PRECHECK] Q&A transcript is empty or None!")
+                f"[PRECHECK] No Q&A section found in pre-scan, rejecting: {original_filename}")
+            return _build_no_qa_output(call_type, summary_length, answer_format, original_filename)
+        prescan = result["prescan"]
+        print(
+            f"[PRECHECK] Q&A pre-scan hit via {prescan['strategy']} on page {prescan['page'] + 1}")
+
+        return _save_extraction(
+            result, pdf_hash, original_filename, call_type, summary_length, answer_format)
+    finally:
+        _remove_spool(spool_path, spool_fd)
+
 
-    except PDFProcessingError as e:
+def _save_extraction(result: dict, pdf_hash: str, original_filename: str, call_type: str, summary_length: str, answer_format: str) -> dict:
+    # DEBUG: Log the extracted content lengths and snippets
+    pres_transcript = result.get("presentation_transcript", "")
 
-        raise PrecheckError("pdf_processing_error", str(e))
+    qa_transcript = result.get("q_a_transcript", "")
+
+    if pres_transcript:
+        print(
+            f"[PRECHECK] Presentation preview (first 200 chars): {pres_transcript[:200]}...")
+
+    if qa_transcript:
+        print(
+            f"[PRECHECK] Q&A preview (first 200 chars): {qa_transcript[:200]}...")
+    else:
+        print("[PRECHECK] Q&A transcript is empty or None!")
 
     # Build payload to persist server-side
     save_transcript_data = {
@@ -63,6 +314,12 @@ def run_validate_file(file: UploadFile, call_type: str, summary_length: str, ans
             "q_a": result.get("q_a_transcript") or "",
         },
     }
+    # How the Q&A start page was found (outline, links, font_heuristic, none)
+    save_transcript_data["qa_boundary_strategy"] = result.get("qa_boundary_strategy")
+    save_transcript_data["layout"] = result.get("layout")
+    # Repeated page headers/footers stripped during extraction (chars and ~tokens saved)
+    if result.get("boilerplate"):
+        save_transcript_data["boilerplate"] = result["boilerplate"]
 
     # Compute content hash (normalized simple hash)
     norm_p = (save_transcript_data["transcripts"]
@@ -72,13 +329,19 @@ def run_validate_file(file: UploadFile, call_type: str, summary_length: str, ans
     content_hash = hashlib.sha256(combined).hexdigest()
 
     save_transcript_data["content_hash"] = content_hash
+    # Similarity fingerprint for near-duplicate dedup (re-downloads with cosmetic differences)
+    save_transcript_data["simhash"] = fingerprint_transcripts(norm_p, norm_q)
+    save_transcript_data["pdf_hash"] = pdf_hash
+    # Token counts and analyst/question counts size the per-job output budgets and the pre-flight check
+    save_transcript_data["token_counts"] = estimate_transcript_tokens(norm_p, norm_q)
+    save_transcript_data["qa_stats"] = q_a_stats(
+        (result.get("speaker_index") or {}).get("turns") or [], result.get("q_a_transcript") or "")
 
-    # Use the literal original filename for the transcript JSON name
-    base_name = os.path.basename(original_filename or "transcript.pdf")
-    json_name = os.path.splitext(base_name)[0] + ".json"
+    json_name = _transcript_json_name(original_filename)
     json_path = os.path.join(CACHE_DIR, json_name)
 
     save_transcript_data["transcript_name"] = json_name
+    save_transcript_data["speaker_index"] = speaker_index_name(json_name)
 
     # If a JSON with the same literal name exists, compare content hashes
     # - If equal: reuse existing JSON (skip saving)
@@ -100,18 +363,17 @@ def run_validate_file(file: UploadFile, call_type: str, summary_length: str, ans
         with open(json_path, "w", encoding="utf-8") as f:
             json.dump(save_transcript_data, f, ensure_ascii=False)
 
-    # Output for frontend
-    output = {
-        "is_validated": True,
-        "validated_at": datetime.now().isoformat(),
-        "input": {
-            "call_type": call_type,
-            "summary_length": summary_length,
-            "answer_format": answer_format,
-            # it will be the same with the matched existing file
-            "filename": os.path.basename(original_filename),
-        },
-        "transcript_name": json_name,
-    }
+    # Speaker-turn index lives next to the transcript JSON; offsets refer to transcripts.q_a
+    speaker_index_path = os.path.join(CACHE_DIR, speaker_index_name(json_name))
+    if not reuse_existing or not os.path.exists(speaker_index_path):
+        _write_json_atomic(speaker_index_path, {
+            "transcript_name": json_name,
+            "content_hash": content_hash,
+            **(result.get("speaker_index") or {}),
+        })
 
-    return output
+    _remember_pdf(pdf_hash, json_name, content_hash)
+
+    # Output for frontend
+    return _build_validation_output(
+        call_type, summary_length, answer_format, original_filename, json_name, pdf_cache_hit=False)
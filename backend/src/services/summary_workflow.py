@@ -1,19 +1,37 @@
+import asyncio
 import json
 import logging
 import os
 import threading
-import time
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
 from typing import Any, Dict, Optional, Tuple
 from pydantic import ValidationError
 
 from src.config.constants import CACHE_DIR
+from src.config.runtime import (
+    JUDGE_PROMPT_VERSION,
+    JUDGE_FAN_OUT,
+    JUDGE_FAN_OUT_PROMPT_VERSION,
+    Q_A_STREAMING,
+    Q_A_CHUNKED_MIN_CHARS,
+    Q_A_CHUNK_TARGET_CHARS,
+    Q_A_MAX_CHUNKS,
+)
 from src.llm.llm_utils import (
     get_prompt_config,
     judge_q_a_summary,
+    judge_q_a_summary_fan_out,
     run_overview_workflow,
     summarize_q_a,
+    summarize_q_a_chunked,
+    ajudge_q_a_summary,
+    ajudge_q_a_summary_fan_out,
+    arun_overview_workflow,
+    asummarize_q_a,
+    asummarize_q_a_chunked,
 )
+from src.llm.token_budget import plan_q_a_output_tokens
+from src.utils.speaker_turns import build_speaker_index, load_speaker_index, split_q_a_by_analyst
 # Import the manager and helpers from their new, shared location
 from src.utils.job_state import JobStatusManager, Stage, Status
 
@@ -52,7 +70,7 @@ def run_summary_workflow_from_saved_transcripts(
 
     try:
         #Fetch transcripts from local cache
-        qa_transcript, presentation_transcript = _load_transcripts(
+        qa_transcript, presentation_transcript, qa_stats = _load_transcripts(
             transcript_name)
 
         #Configuring prompt
@@ -67,6 +85,9 @@ def run_summary_workflow_from_saved_transcripts(
         # Summarize Q&A
         qa_block, qa_summary_text, summary_metadata, time_taken = _execute_qa_summary(
             qa_transcript=qa_transcript,
+            presentation_transcript=presentation_transcript,
+            transcript_name=transcript_name,
+            qa_stats=qa_stats,
             prompt_config=prompt_config,
             job_manager=job_manager,
             summary_length=summary_length,
@@ -84,9 +105,6 @@ def run_summary_workflow_from_saved_transcripts(
                 "cancelled", "User cancelled after Q&A summary")
             return {"title": "Untitled", "call_type": call_type, "blocks": blocks or []}
 
-        # exponential backoff if reach rate limit
-        _apply_exponential_backoff(summary_metadata.get("remaining_tokens"))
-
         # Call Overview and Judge Stages in Parallel
         parallel_blocks, parallel_time_sec = _execute_parallel_stages(
             qa_transcript=qa_transcript,
@@ -105,6 +123,78 @@ def run_summary_workflow_from_saved_transcripts(
         job_manager.fail_job(e.code, e.message)
         return {"title": "Untitled", "call_type": call_type, "blocks": blocks or []}
 
+    return _finalize_workflow(job_manager, blocks, total_time_sec, call_type)
+
+
+async def arun_summary_workflow_from_saved_transcripts(
+    transcript_name: str,
+    call_type: str,
+    summary_length: str,
+    job_dir: Optional[str] = None,
+    answer_format: str = "prose",
+) -> Dict[str, Any]:
+    """
+    Coroutine version of run_summary_workflow_from_saved_transcripts for the asyncio execution mode.
+    Cancelling the task cancels the in-flight LLM calls; the job is marked cancelled and
+    CancelledError is re-raised.
+    """
+    job_manager = JobStatusManager(job_dir)
+    blocks: list[dict[str, Any]] = []
+    total_time_sec = 0.0
+
+    try:
+        qa_transcript, presentation_transcript, qa_stats = _load_transcripts(
+            transcript_name)
+
+        prompt_config = get_prompt_config(
+            call_type, summary_length, answer_format)
+
+        qa_block, qa_summary_text, summary_metadata, time_taken = await _aexecute_qa_summary(
+            qa_transcript=qa_transcript,
+            presentation_transcript=presentation_transcript,
+            transcript_name=transcript_name,
+            qa_stats=qa_stats,
+            prompt_config=prompt_config,
+            job_manager=job_manager,
+            summary_length=summary_length,
+            answer_format=answer_format,
+            call_type=call_type
+        )
+        blocks.append(qa_block)
+        total_time_sec += time_taken
+
+        parallel_blocks, parallel_time_sec = await _aexecute_parallel_stages(
+            qa_transcript=qa_transcript,
+            presentation_transcript=presentation_transcript,
+            qa_summary_text=qa_summary_text,
+            summary_metadata=summary_metadata,
+            call_type=call_type,
+            job_manager=job_manager,
+        )
+        blocks.extend(parallel_blocks)
+        total_time_sec += parallel_time_sec
+
+    except SummaryWorkflowError as e:
+        logger.error(f"Workflow failed with code {e.code}: {e.message}")
+        job_manager.fail_job(e.code, e.message)
+        return {"title": "Untitled", "call_type": call_type, "blocks": blocks or []}
+    except asyncio.CancelledError:
+        _mark_cancelled(job_manager)
+        raise
+
+    return _finalize_workflow(job_manager, blocks, total_time_sec, call_type)
+
+
+def _mark_cancelled(job_manager: JobStatusManager) -> None:
+    status = job_manager._read_status()
+    stages = status.get("stages") or {}
+    for stage in Stage:
+        if stages.get(stage.value) != Status.COMPLETED.value:
+            job_manager.set_stage_status(stage, Status.FAILED)
+    job_manager.fail_job("cancelled", "User cancelled")
+
+
+def _finalize_workflow(job_manager: JobStatusManager, blocks: list, total_time_sec: float, call_type: str) -> Dict[str, Any]:
     # Mark job complete
     if job_manager.is_job_complete():
         job_manager.update_status({
@@ -125,8 +215,8 @@ def run_summary_workflow_from_saved_transcripts(
 # --- Helper Functions for Workflow Stages ---
 
 
-def _load_transcripts(transcript_name: str) -> Tuple[str, str]:
-    """Loads Q&A and presentation transcripts from a JSON file."""
+def _load_transcripts(transcript_name: str) -> Tuple[str, str, Optional[Dict]]:
+    """Loads Q&A and presentation transcripts, plus the analyst/question counts, from a JSON file."""
     json_path = os.path.join(CACHE_DIR, transcript_name)
     if not os.path.exists(json_path):
         raise SummaryWorkflowError(
@@ -145,67 +235,195 @@ def _load_transcripts(transcript_name: str) -> Tuple[str, str]:
     if not qa_transcript:
         raise SummaryWorkflowError("precheck_error", "No Q&A transcript found")
 
-    return qa_transcript, presentation_transcript
+    return qa_transcript, presentation_transcript, saved.get("qa_stats")
+
+
+class _PartialQASummaryWriter:
+    """Rewrites q_a_summary.json with the analyst/topic blocks streamed so far, so /summary can show them."""
+
+    def __init__(self, job_manager: JobStatusManager, prompt_config: Dict[str, Any]):
+        self.job_manager = job_manager
+        self.prompt_config = prompt_config
+        self.items: Dict[str, list] = {}
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, array_key: str, item: dict, fields: dict) -> None:
+        with self._lock:
+            self.items.setdefault(array_key, []).append(item)
+            self.count += 1
+            data = {"title": fields.get("title", ""), **
+                    {key: list(items) for key, items in self.items.items()}}
+            payload = {
+                "metadata": {
+                    "partial": True,
+                    "partial_items": self.count,
+                    "model": self.prompt_config.get("model"),
+                    "prompt_version": self.prompt_config.get("prompt_version"),
+                },
+                "data": data,
+            }
+            JobStatusManager.write_json_atomic(os.path.join(
+                self.job_manager.job_dir, "q_a_summary.json"), payload)
+        self.job_manager.update_status({"q_a_partial_items": self.count})
+
+    def reset(self) -> None:
+        """Drop the blocks of a failed attempt from memory, disk and status.
+
+        Called before a retry streams the summary from the beginning and when the stage fails,
+        so /summary never serves a partial summary the stage did not finish.
+        """
+        with self._lock:
+            self.items = {}
+            self.count = 0
+            try:
+                os.remove(os.path.join(self.job_manager.job_dir, "q_a_summary.json"))
+            except FileNotFoundError:
+                pass
+        self.job_manager.update_status({"q_a_partial_items": 0})
 
 
-def _execute_qa_summary(**kwargs) -> Tuple[Dict, str, Dict, float]:
-    """Runs the Q&A summarization, handles its errors, and updates job status."""
+def _qa_summary_args(**kwargs) -> Dict[str, Any]:
     job_manager: JobStatusManager = kwargs["job_manager"]
+    args = {
+        "qa_transcript": kwargs["qa_transcript"],
+        "call_type": kwargs["call_type"],
+        "summary_length": kwargs["summary_length"],
+        "prompt_version": kwargs["prompt_config"]["prompt_version"],
+        "model": kwargs["prompt_config"]["model"],
+        "effort_level": kwargs["prompt_config"]["effort_level"],
+        "answer_format": kwargs["answer_format"],
+        # Sized from the analyst/question counts; None keeps the prompt's max_output_tokens
+        "max_output_tokens": plan_q_a_output_tokens(
+            kwargs.get("qa_stats"), kwargs["summary_length"],
+            kwargs["prompt_config"]["model"], kwargs["prompt_config"]["effort_level"]),
+    }
+    if Q_A_STREAMING and job_manager.has_job_directory:
+        args["on_partial"] = _PartialQASummaryWriter(
+            job_manager, kwargs["prompt_config"])
+    return args
+
+
+def _start_qa_summary(job_manager: JobStatusManager) -> None:
     job_manager.update_status({
         "current_stage": Stage.QA_SUMMARY.value,
         "stages": {Stage.QA_SUMMARY.value: Status.RUNNING.value},
         "percent_complete": 25,
     })
 
-    try:
-        qa_resp = summarize_q_a(
-            qa_transcript=kwargs["qa_transcript"],
-            call_type=kwargs["call_type"],
-            summary_length=kwargs["summary_length"],
-            prompt_version=kwargs["prompt_config"]["prompt_version"],
-            model=kwargs["prompt_config"]["model"],
-            effort_level=kwargs["prompt_config"]["effort_level"],
-            answer_format=kwargs["answer_format"],
-        )
 
-        summary_metadata = qa_resp.get("metadata", {})
-        qa_summary_obj = qa_resp.get("summary", {}).get("obj")
-        if not qa_summary_obj:
-            raise ValidationError(
-                "LLM did not return a parsed Pydantic object for Summary Q&A")
+def _qa_summary_failed(job_manager: JobStatusManager, e: Exception,
+                       partial_writer: Optional[_PartialQASummaryWriter] = None) -> SummaryWorkflowError:
+    if partial_writer is not None:
+        partial_writer.reset()
+    job_manager.set_stage_status(Stage.QA_SUMMARY, Status.FAILED)
+    if isinstance(e, ValidationError):
+        job_manager.add_warning("Q&A summary failed: invalid JSON from LLM")
+        return SummaryWorkflowError("llm_invalid_json", str(e))
+    job_manager.add_warning(f"Q&A summary failed: {e}")
+    return SummaryWorkflowError("llm_summary_error", str(e))
 
-        qa_summary_text = qa_resp.get(
-            "summary", {}).get("text", "Empty summary")
 
-        if job_manager.has_job_directory:
-            payload = {"metadata": _format_for_json(
-                summary_metadata), "data": qa_summary_obj.model_dump()}
-            JobStatusManager.write_json_atomic(os.path.join(
-                job_manager.job_dir, "q_a_summary.json"), payload)
+def _plan_qa_chunks(**kwargs) -> Optional[list]:
+    """Analyst-exchange chunks for the map-reduce Q&A summary, or None to summarize in one call."""
+    qa_transcript = kwargs["qa_transcript"]
+    min_chars = Q_A_CHUNKED_MIN_CHARS.get((kwargs["call_type"] or "").lower())
+    if min_chars is None or len(qa_transcript) < min_chars:
+        return None
 
-        job_manager.update_status({
-            "stages": {Stage.QA_SUMMARY.value: Status.COMPLETED.value},
-            "percent_complete": 55,
-        })
+    # Offsets in the stored speaker index refer to this exact Q&A text
+    speaker_index = load_speaker_index(kwargs.get("transcript_name") or "")
+    if not speaker_index or not speaker_index.get("turns"):
+        speaker_index = build_speaker_index(
+            kwargs.get("presentation_transcript") or "", qa_transcript)
 
-        block_type = "q_a_short" if kwargs["summary_length"] == "short" else "q_a_long"
-        qa_block = {
-            "type": block_type,
-            "metadata": summary_metadata,
-            "data": qa_summary_obj.model_dump(),
-        }
-        time_taken = summary_metadata.get("time", 0.0)
+    chunks = split_q_a_by_analyst(
+        qa_transcript, speaker_index.get("turns") or [], Q_A_CHUNK_TARGET_CHARS, Q_A_MAX_CHUNKS)
+    return chunks if len(chunks) > 1 else None
 
-        return qa_block, qa_summary_text, summary_metadata, time_taken
 
-    except ValidationError as e:
-        job_manager.set_stage_status(Stage.QA_SUMMARY, Status.FAILED)
-        job_manager.add_warning("Q&A summary failed: invalid JSON from LLM")
-        raise SummaryWorkflowError("llm_invalid_json", str(e))
+def _chunked_args(chunks: list, **kwargs) -> Dict[str, Any]:
+    args = _qa_summary_args(**kwargs)
+    args.pop("qa_transcript")
+    # Each chunk covers a fraction of the analysts: chunks keep the prompt's max_output_tokens
+    args.pop("max_output_tokens", None)
+    # Partial blocks of several concurrent streams would interleave; chunks persist on merge
+    args.pop("on_partial", None)
+    return {"chunks": chunks, **args}
+
+
+def _execute_qa_summary(**kwargs) -> Tuple[Dict, str, Dict, float]:
+    """Runs the Q&A summarization, handles its errors, and updates job status."""
+    job_manager: JobStatusManager = kwargs["job_manager"]
+    _start_qa_summary(job_manager)
+
+    partial_writer = None
+    try:
+        chunks = _plan_qa_chunks(**kwargs)
+        if chunks:
+            logger.info(f"Summarizing Q&A in {len(chunks)} chunks")
+            qa_resp = summarize_q_a_chunked(**_chunked_args(chunks, **kwargs))
+        else:
+            args = _qa_summary_args(**kwargs)
+            partial_writer = args.get("on_partial")
+            qa_resp = summarize_q_a(**args)
+        return _complete_qa_summary(qa_resp, **kwargs)
     except Exception as e:
-        job_manager.set_stage_status(Stage.QA_SUMMARY, Status.FAILED)
-        job_manager.add_warning(f"Q&A summary failed: {e}")
-        raise SummaryWorkflowError("llm_summary_error", str(e))
+        raise _qa_summary_failed(job_manager, e, partial_writer)
+
+
+async def _aexecute_qa_summary(**kwargs) -> Tuple[Dict, str, Dict, float]:
+    """Async counterpart of _execute_qa_summary."""
+    job_manager: JobStatusManager = kwargs["job_manager"]
+    _start_qa_summary(job_manager)
+
+    partial_writer = None
+    try:
+        chunks = _plan_qa_chunks(**kwargs)
+        if chunks:
+            logger.info(f"Summarizing Q&A in {len(chunks)} chunks")
+            qa_resp = await asummarize_q_a_chunked(**_chunked_args(chunks, **kwargs))
+        else:
+            args = _qa_summary_args(**kwargs)
+            partial_writer = args.get("on_partial")
+            qa_resp = await asummarize_q_a(**args)
+        return _complete_qa_summary(qa_resp, **kwargs)
+    except Exception as e:
+        raise _qa_summary_failed(job_manager, e, partial_writer)
+
+
+def _complete_qa_summary(qa_resp: Dict[str, Any], **kwargs) -> Tuple[Dict, str, Dict, float]:
+    """Validates the Q&A summary response, persists it, and builds its block."""
+    job_manager: JobStatusManager = kwargs["job_manager"]
+    summary_metadata = qa_resp.get("metadata", {})
+    qa_summary_obj = qa_resp.get("summary", {}).get("obj")
+    if not qa_summary_obj:
+        raise ValidationError(
+            "LLM did not return a parsed Pydantic object for Summary Q&A")
+
+    qa_summary_text = qa_resp.get(
+        "summary", {}).get("text", "Empty summary")
+
+    if job_manager.has_job_directory:
+        payload = {"metadata": _format_for_json(
+            summary_metadata), "data": qa_summary_obj.model_dump()}
+        JobStatusManager.write_json_atomic(os.path.join(
+            job_manager.job_dir, "q_a_summary.json"), payload)
+
+    job_manager.update_status({
+        "stages": {Stage.QA_SUMMARY.value: Status.COMPLETED.value},
+        "percent_complete": 55,
+    })
+
+    block_type = "q_a_short" if kwargs["summary_length"] == "short" else "q_a_long"
+    qa_block = {
+        "type": block_type,
+        "metadata": summary_metadata,
+        "data": qa_summary_obj.model_dump(),
+    }
+    time_taken = summary_metadata.get("time", 0.0)
+
+    return qa_block, qa_summary_text, summary_metadata, time_taken
 
 
 def _execute_parallel_stages(**kwargs) -> Tuple[list, float]:
@@ -255,18 +473,93 @@ def _execute_parallel_stages(**kwargs) -> Tuple[list, float]:
     return completed_blocks, total_time_sec
 
 
+async def _aexecute_parallel_stages(**kwargs) -> Tuple[list, float]:
+    """Runs overview and judge as concurrent tasks on the event loop."""
+    job_manager: JobStatusManager = kwargs["job_manager"]
+
+    completed_blocks = []
+    total_time_sec = 0.0
+
+    stages = (Stage.OVERVIEW, Stage.JUDGE)
+    tasks = [
+        asyncio.create_task(_arun_overview_task(**kwargs)),
+        asyncio.create_task(_arun_judge_task(**kwargs)),
+    ]
+    try:
+        _done, pending = await asyncio.wait(tasks, timeout=PARALLEL_TIMEOUT_SECONDS)
+    except asyncio.CancelledError:
+        # Job task cancelled: take both stage calls down with it
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    if pending:
+        logger.error("Parallel stage processing timed out.")
+    for task, stage in zip(tasks, stages):
+        if task in pending:
+            task.cancel()
+            job_manager.set_stage_status(stage, Status.FAILED)
+            job_manager.add_warning(
+                f"Stage '{stage.value}' timed out after {PARALLEL_TIMEOUT_SECONDS}s")
+            continue
+        try:
+            block, time_taken = task.result()
+            if block:
+                completed_blocks.append(block)
+            total_time_sec += time_taken
+            job_manager.set_stage_status(stage, Status.COMPLETED)
+        except Exception as e:
+            logger.exception(
+                f"Parallel stage '{stage.value}' failed: {e}")
+            job_manager.set_stage_status(stage, Status.FAILED)
+            job_manager.add_warning(
+                f"Stage '{stage.value}' failed: {e}")
+
+    return completed_blocks, total_time_sec
+
+
+def _start_stage(job_manager: JobStatusManager, stage: Stage) -> None:
+    job_manager.update_status({"current_stage": stage.value, "stages": {
+                              stage.value: Status.RUNNING.value}})
+
+
+def _overview_args(**kwargs) -> Dict[str, Any]:
+    return {
+        "presentation_transcript": kwargs["presentation_transcript"] or "No presentation section.",
+        "q_a_summary": kwargs["qa_summary_text"],
+        "call_type": kwargs["call_type"],
+    }
+
+
+def _judge_args(**kwargs) -> Dict[str, Any]:
+    return {
+        "transcript": kwargs["qa_transcript"],
+        "q_a_summary": kwargs["qa_summary_text"],
+        "summary_structure": kwargs["summary_metadata"].get(
+            "summary_structure", {}),
+        "prompt_version": JUDGE_FAN_OUT_PROMPT_VERSION if JUDGE_FAN_OUT else JUDGE_PROMPT_VERSION,
+    }
+
+
 def _run_overview_task(**kwargs) -> Tuple[Optional[Dict], float]:
     """Task wrapper for running the overview workflow."""
     job_manager: JobStatusManager = kwargs["job_manager"]
-    job_manager.update_status({"current_stage": Stage.OVERVIEW.value, "stages": {
-                              Stage.OVERVIEW.value: Status.RUNNING.value}})
+    _start_stage(job_manager, Stage.OVERVIEW)
 
-    resp = run_overview_workflow(
-        presentation_transcript=kwargs["presentation_transcript"] or "No presentation section.",
-        q_a_summary=kwargs["qa_summary_text"],
-        call_type=kwargs["call_type"],
-    )
+    resp = run_overview_workflow(**_overview_args(**kwargs))
+    return _overview_block(resp, job_manager)
 
+
+async def _arun_overview_task(**kwargs) -> Tuple[Optional[Dict], float]:
+    job_manager: JobStatusManager = kwargs["job_manager"]
+    _start_stage(job_manager, Stage.OVERVIEW)
+
+    resp = await arun_overview_workflow(**_overview_args(**kwargs))
+    return _overview_block(resp, job_manager)
+
+
+def _overview_block(resp: Dict[str, Any], job_manager: JobStatusManager) -> Tuple[Optional[Dict], float]:
     ov_obj = resp.get("overview", {}).get("obj")
     metadata = resp.get("metadata", {})
     time_taken = metadata.get("time", 0.0)
@@ -286,47 +579,53 @@ def _run_overview_task(**kwargs) -> Tuple[Optional[Dict], float]:
 def _run_judge_task(**kwargs) -> Tuple[Optional[Dict], float]:
     """Task wrapper for running the judge workflow."""
     job_manager: JobStatusManager = kwargs["job_manager"]
-    job_manager.update_status({"current_stage": Stage.JUDGE.value, "stages": {
-                              Stage.JUDGE.value: Status.RUNNING.value}})
+    _start_stage(job_manager, Stage.JUDGE)
 
     try:
-        judge_resp = judge_q_a_summary(
-            transcript=kwargs["qa_transcript"],
-            q_a_summary=kwargs["qa_summary_text"],
-            summary_structure=kwargs["summary_metadata"].get(
-                "summary_structure", {}),
-            prompt_version="version_2"
-        )
-        judge_obj = judge_resp.get("eval_results", {}).get("obj")
-        if not judge_obj:
-            raise ValidationError(
-                "LLM did not return a parsed Pydantic object for Judge")
+        judge = judge_q_a_summary_fan_out if JUDGE_FAN_OUT else judge_q_a_summary
+        judge_resp = judge(**_judge_args(**kwargs))
+        return _judge_block(judge_resp, job_manager)
+
+    except Exception as e:
+        # Catching a broad exception here to wrap it for the parallel executor
+        raise SummaryWorkflowError("llm_judge_error", str(e))
 
-        metadata = judge_resp.get("metadata", {})
-        time_taken = metadata.get("time", 0.0)
 
-        block = {"type": "judge", "metadata": metadata,
-                 "data": judge_obj.model_dump()}
-        if job_manager.has_job_directory:
-            payload = {"metadata": _format_for_json(
-                metadata), "data": judge_obj.model_dump()}
-            JobStatusManager.write_json_atomic(os.path.join(
-                job_manager.job_dir, "summary_evaluation.json"), payload)
+async def _arun_judge_task(**kwargs) -> Tuple[Optional[Dict], float]:
+    job_manager: JobStatusManager = kwargs["job_manager"]
+    _start_stage(job_manager, Stage.JUDGE)
 
-        return block, time_taken
+    try:
+        ajudge = ajudge_q_a_summary_fan_out if JUDGE_FAN_OUT else ajudge_q_a_summary
+        judge_resp = await ajudge(**_judge_args(**kwargs))
+        return _judge_block(judge_resp, job_manager)
 
     except Exception as e:
-        # Catching a broad exception here to wrap it for the parallel executor
+        # CancelledError is not an Exception, so task cancellation still propagates
         raise SummaryWorkflowError("llm_judge_error", str(e))
 
-# --- Utility Functions ---
 
+def _judge_block(judge_resp: Dict[str, Any], job_manager: JobStatusManager) -> Tuple[Optional[Dict], float]:
+    judge_obj = judge_resp.get("eval_results", {}).get("obj")
+    if not judge_obj:
+        raise ValidationError(
+            "LLM did not return a parsed Pydantic object for Judge")
+
+    metadata = judge_resp.get("metadata", {})
+    time_taken = metadata.get("time", 0.0)
+
+    block = {"type": "judge", "metadata": metadata,
+             "data": judge_obj.model_dump()}
+    if job_manager.has_job_directory:
+        payload = {"metadata": _format_for_json(
+            metadata), "data": judge_obj.model_dump()}
+        JobStatusManager.write_json_atomic(os.path.join(
+            job_manager.job_dir, "summary_evaluation.json"), payload)
+
+    return block, time_taken
 
-def _apply_exponential_backoff(remaining_tokens: Optional[int], threshold: int = 40000):
-    """Waits if remaining tokens are below a threshold to avoid rate limiting."""
-    if remaining_tokens is not None and remaining_tokens < threshold:
-        logger.info(f"Token count {remaining_tokens} is low, pausing briefly.")
-        time.sleep(5)
+
+# --- Utility Functions ---
 
 
 # Local JSON sanitizer for metadata payloads
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+from src.config.constants import VALIDATION_MAX_CONCURRENCY, VALIDATION_MAX_QUEUE
+from src.services.precheck import PrecheckError
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationExecutor:
+    """
+    Bounded executor for PDF validation work (parsing, hashing, JSON writes) so it never runs on the event loop.
+    At most `max_concurrency` validations run at once and at most `max_queue` wait behind them;
+    anything beyond that is rejected immediately with `server_busy`.
+    """
+
+    def __init__(self, max_concurrency: int = VALIDATION_MAX_CONCURRENCY, max_queue: int = VALIDATION_MAX_QUEUE):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="validate")
+        # One slot per running or queued validation
+        self._slots = threading.BoundedSemaphore(max_concurrency + max_queue)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, Dict[str, float]]:
+        """Run fn in the executor; returns (result, timings) with queue wait and execution time reported separately."""
+        if not self._slots.acquire(blocking=False):
+            raise PrecheckError(
+                "server_busy", "Too many files are being validated right now. Please try again shortly.")
+
+        submitted_at = time.perf_counter()
+
+        def _task():
+            started_at = time.perf_counter()
+            try:
+                return fn(*args, **kwargs), started_at, None
+            except BaseException as e:
+                return None, started_at, e
+            finally:
+                # Release only once the work is really done, even if the awaiting request was cancelled
+                self._slots.release()
+
+        def _release_if_cancelled(future: Future) -> None:
+            # A queued job cancelled by a client disconnect never runs _task, so its slot is freed here
+            if future.cancelled():
+                self._slots.release()
+
+        future = self._executor.submit(_task)
+        future.add_done_callback(_release_if_cancelled)
+        result, started_at, error = await asyncio.wrap_future(future)
+        finished_at = time.perf_counter()
+
+        timings = {
+            "queue_wait_seconds": round(started_at - submitted_at, 3),
+            "execution_seconds": round(finished_at - started_at, 3),
+        }
+        logger.info("Validation timings: queue_wait=%.3fs execution=%.3fs",
+                    timings["queue_wait_seconds"], timings["execution_seconds"])
+
+        if error is not None:
+            raise error
+        return result, timings
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Process-wide instance used by the validation route
+validation_executor = ValidationExecutor()
@@ -10,8 +10,9 @@ from src.utils.job_utils import (
     _job_last_updated,
     _job_is_terminal,
     _read_json_file,
-    _write_job_index
+    _write_json_atomic
 )
+from src.services.precheck import _prune_pdf_index
 from src.config.constants import RETENTION_DAYS, FORCE_CLEANUP_DAYS, CLEANUP_INTERVAL_SECONDS, CACHE_DIR
 
 
@@ -83,9 +84,10 @@ def _run_cleanup_cycle():
         pruned_idx = {sig: jid for sig,
                       jid in idx.items() if jid in active_job_ids}
         if len(pruned_idx) != original_count:
-            _write_job_index(_JOB_INDEX_PATH, pruned_idx)
+            _write_json_atomic(_JOB_INDEX_PATH, pruned_idx)
             logger.info("Job index prune: removed=%d kept=%d",
                         original_count - len(pruned_idx), len(pruned_idx))
+        _prune_pdf_index()
     except Exception as e:
         logger.exception("Cache cleanup cycle failed: %s", e)
     logger.info("Cache cleanup cycle finished.")
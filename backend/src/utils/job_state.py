@@ -1,3 +1,4 @@
+import asyncio
 import threading
 import os
 import json
@@ -44,6 +45,14 @@ class JobStatusManager:
     def register_cancel_event(cls, job_id: str, event: threading.Event) -> None:
         cls._CANCEL_EVENTS[job_id] = event
 
+    # Workflow tasks of the asyncio execution mode; cancelled instead of signalled
+    _TASKS: Dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def register_task(cls, job_id: str, task: asyncio.Task) -> None:
+        cls._TASKS[job_id] = task
+        task.add_done_callback(lambda _t: cls._TASKS.pop(job_id, None))
+
     @classmethod
     def signal_cancel(cls, job_id: str) -> None:
         evt = cls._CANCEL_EVENTS.get(job_id)
@@ -52,6 +61,13 @@ class JobStatusManager:
                 evt.set()
             except Exception:
                 pass
+        task = cls._TASKS.get(job_id)
+        if task is not None and not task.done():
+            try:
+                # Safe from any thread: the cancel runs on the task's own loop
+                task.get_loop().call_soon_threadsafe(task.cancel)
+            except Exception:
+                pass
 
     @classmethod
     def get_cancel_event(cls, job_id: str) -> Optional[threading.Event]:
@@ -0,0 +1,85 @@
+import hashlib
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import fitz
+
+from src.config.constants import CACHE_DIR, LAYOUT_PROFILE_MIN_DOCUMENTS
+from src.utils.job_utils import _read_json_file, _write_json_atomic
+
+# Layout fingerprint -> learned profile (body font size, Q&A header style, header/footer line signatures)
+LAYOUT_PROFILES_FILENAME = "layout_profiles.json"
+
+_SUBSET_PREFIX = re.compile(r"^[A-Z]{6}\+")
+_STORES: Dict[str, "LayoutProfileStore"] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def layout_fingerprint(doc: fitz.Document, first_page_edges: List) -> str:
+    """
+    Identify the publisher template from the producer/creator metadata, the fonts of the first page
+    and its structure (page size, header/footer line positions and styles). Text is left out so
+    every call from the same template shares one fingerprint.
+    """
+    metadata = doc.metadata or {}
+    producer = re.sub(r"[\d.]+", "#", (metadata.get("producer") or "").lower())
+    creator = re.sub(r"[\d.]+", "#", (metadata.get("creator") or "").lower())
+
+    fonts = sorted({_SUBSET_PREFIX.sub("", font[3] or "") for font in doc[0].get_fonts()}) if len(doc) else []
+    rect = doc[0].rect if len(doc) else fitz.Rect()
+    edges = sorted({(edge.band, edge.position, edge.size, edge.bold) for edge in first_page_edges})
+
+    raw = f"{producer}|{creator}|{','.join(fonts)}|{round(rect.width)}x{round(rect.height)}|{edges}"
+    return hashlib.sha1(raw.encode("utf-8", errors="ignore")).hexdigest()[:16]
+
+
+class LayoutProfileStore:
+    """
+    Learned layout profiles persisted as JSON under the cache directory.
+    A profile is trusted once LAYOUT_PROFILE_MIN_DOCUMENTS documents agreed on its body font size.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._profiles: Optional[Dict[str, dict]] = None
+
+    def _load(self) -> Dict[str, dict]:
+        if self._profiles is None:
+            self._profiles = _read_json_file(self.path)
+        return self._profiles
+
+    def get(self, fingerprint: str) -> Optional[dict]:
+        with self._lock:
+            profile = self._load().get(fingerprint)
+        if isinstance(profile, dict) and profile.get("documents", 0) >= LAYOUT_PROFILE_MIN_DOCUMENTS:
+            return profile
+        return None
+
+    def observe(self, fingerprint: str, body_font_size: float, qa_header: Optional[dict], boilerplate_signatures: List[list], producer: str = "") -> dict:
+        """Record the statistics computed for one document; a disagreeing body font size restarts the count."""
+        with self._lock:
+            profiles = self._load()
+            profile = profiles.get(fingerprint)
+            if not isinstance(profile, dict) or profile.get("body_font_size") != body_font_size:
+                profile = {"body_font_size": body_font_size, "documents": 0}
+            profile["documents"] = profile.get("documents", 0) + 1
+            profile["producer"] = producer
+            if qa_header:
+                profile["qa_header"] = qa_header
+            profile["boilerplate"] = boilerplate_signatures
+            profile["updated_at"] = datetime.now().isoformat()
+            profiles[fingerprint] = profile
+            _write_json_atomic(self.path, profiles)
+            return dict(profile)
+
+
+def get_layout_profile_store(cache_dir: str = CACHE_DIR) -> LayoutProfileStore:
+    path = os.path.join(str(cache_dir), LAYOUT_PROFILES_FILENAME)
+    with _STORES_LOCK:
+        if path not in _STORES:
+            _STORES[path] = LayoutProfileStore(path)
+        return _STORES[path]
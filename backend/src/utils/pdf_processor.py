@@ -4,14 +4,30 @@ Handles PDF validation, text extraction, and Q&A section identification
 """
 
 
+import multiprocessing
 import re
 import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Tuple, Dict, List
-from statistics import mode, StatisticsError
 import fitz
 
-from src.config.constants import QA_PATTERNS, FILESIZE, CACHE_DIR
+from src.utils.speaker_turns import build_speaker_index
+from src.utils.layout_profiles import get_layout_profile_store, layout_fingerprint
+from src.config.constants import (
+    QA_PATTERNS,
+    CACHE_DIR,
+    SPOOLED_FILESIZE,
+    PDF_PARALLEL_MIN_PAGES,
+    PDF_EXTRACTION_WORKERS,
+    BOILERPLATE_EDGE_BAND,
+    BOILERPLATE_MIN_PAGES,
+    BOILERPLATE_MIN_PAGE_RATIO,
+    QA_TOC_LINK_SCAN_PAGES,
+    QA_PRESCAN_MAX_CACHED_PAGES,
+)
 
 
 class PDFProcessingError(Exception):
@@ -19,48 +35,346 @@ class PDFProcessingError(Exception):
     pass
 
 
+@dataclass(slots=True)
+class LineRecord:
+    """One text line of a page: joined span text plus the raw span sizes and lowercased font names"""
+    text: str
+    sizes: List[float]
+    fonts: List[str]
+
+
+@dataclass(slots=True)
+class EdgeLine:
+    """A line inside the top or bottom band of a page, candidate for repeated header/footer boilerplate"""
+    text: str
+    # ("top", distance from the top edge) or ("bottom", distance from the bottom edge), rounded to points
+    band: str
+    position: int
+    size: float
+    bold: bool
+
+    def signature(self) -> Tuple[str, int, float, bool, str]:
+        # Digits are masked so "6/18" and "7/18" page numbers share one signature
+        return (self.band, self.position, self.size, self.bold,
+                re.sub(r"\d+", "#", " ".join(self.text.lower().split())))
+
+
+@dataclass(slots=True)
+class PageRecord:
+    """Compact result of parsing a single page once with fitz"""
+    page_num: int
+    # Plain text of the page, as returned by page.get_text()
+    text: str
+    # Character offset of this page's text in the whole-document text
+    offset: int
+    # Rounded span font size -> number of spans, in first-seen order
+    size_counts: Dict[float, int] = field(default_factory=dict)
+    lines: List[LineRecord] = field(default_factory=list)
+    # Bold runs that open an otherwise regular line (speaker names ahead of their firm)
+    bold_leads: List[str] = field(default_factory=list)
+    edge_lines: List[EdgeLine] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ExtractedSections:
+    presentation: str
+    q_a: str
+    qa_start_page: Optional[int]
+    # (page_num, start offset in q_a) for every page that contributes to the Q&A text
+    q_a_page_offsets: List[Tuple[int, int]] = field(default_factory=list)
+    # Which resolver found qa_start_page: "outline", "links", "layout_profile", "font_heuristic" or "none"
+    qa_boundary_strategy: str = "none"
+    bold_leads: List[str] = field(default_factory=list)
+    # Repeated header/footer lines removed before assembly
+    boilerplate: Dict = field(default_factory=dict)
+    # Publisher template fingerprint and whether a learned profile replaced the statistics passes
+    layout: Dict = field(default_factory=dict)
+
+
+def _is_bold(font_name: str) -> bool:
+    return "bold" in font_name or "heavy" in font_name
+
+
+def compile_qa_matcher(patterns: List[str]) -> re.Pattern:
+    """
+    Build one case-insensitive alternation from the Q&A title patterns.
+    Longer patterns go first so "questions and answers" wins over its "questions and answer" prefix.
+    """
+    ordered = sorted(set(p.lower() for p in patterns), key=len, reverse=True)
+    return re.compile("|".join(re.escape(p) for p in ordered), flags=re.IGNORECASE)
+
+
+# Compiled once at import time from QA_PATTERNS
+QA_TITLE_REGEX = compile_qa_matcher(QA_PATTERNS)
+
+
+def parse_page(page: fitz.Page, page_num: int, offset: int = 0, title_regex: re.Pattern = QA_TITLE_REGEX,
+               textpage: Optional[fitz.TextPage] = None) -> PageRecord:
+    """
+    Parse a page a single time: one TextPage feeds both the plain text and the span dict.
+    Line records (text, sizes, fonts) are only built for pages whose plain text contains a Q&A title
+    candidate; every other page only contributes its span size counts.
+    A TextPage already built for this page (by the pre-scan) is reused instead of extracting it again.
+    """
+    if textpage is None:
+        textpage = page.get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+    text = page.get_text("text", textpage=textpage)
+    blocks = page.get_text("dict", textpage=textpage)["blocks"]
+    is_candidate = title_regex.search(text) is not None
+    page_height = page.rect.height
+    band = page_height * BOILERPLATE_EDGE_BAND
+
+    size_counts: Dict[float, int] = {}
+    lines: List[LineRecord] = []
+    bold_leads: List[str] = []
+    edge_lines: List[EdgeLine] = []
+    for block in blocks:
+        for line in block.get("lines", ()):
+            spans = line["spans"]
+            for span in spans:
+                rounded = round(span["size"], 1)
+                size_counts[rounded] = size_counts.get(rounded, 0) + 1
+            if spans:
+                y0, y1 = line["bbox"][1], line["bbox"][3]
+                if y1 <= band or y0 >= page_height - band:
+                    edge_text = "".join(span["text"] for span in spans).strip()
+                    if edge_text:
+                        is_top = y1 <= band
+                        edge_lines.append(EdgeLine(
+                            text=edge_text,
+                            band="top" if is_top else "bottom",
+                            position=round(y0 if is_top else page_height - y1),
+                            size=round(max(span["size"] for span in spans), 1),
+                            bold=any(_is_bold(str(span.get("font", "")).lower()) for span in spans),
+                        ))
+            if len(spans) > 1 and _is_bold(str(spans[0].get("font", "")).lower()):
+                lead_spans = 1
+                while lead_spans < len(spans) and _is_bold(str(spans[lead_spans].get("font", "")).lower()):
+                    lead_spans += 1
+                lead = "".join(span["text"]
+                               for span in spans[:lead_spans]).strip()
+                if lead_spans < len(spans) and lead:
+                    bold_leads.append(lead)
+            if is_candidate:
+                fonts = [str(span.get("font", "")).lower() for span in spans]
+                lines.append(LineRecord(
+                    text="".join(span["text"] for span in spans).strip(),
+                    sizes=[span["size"] for span in spans],
+                    fonts=[f for f in fonts if f],
+                ))
+
+    return PageRecord(page_num=page_num, text=text, offset=offset,
+                      size_counts=size_counts, lines=lines, bold_leads=bold_leads,
+                      edge_lines=edge_lines)
+
+
+def _remove_edge_lines(text: str, top: List[str], bottom: List[str]) -> Tuple[str, int]:
+    """
+    Drop one text line per header (scanning from the start of the page) and per footer (from the end),
+    so body lines that happen to repeat a header's text stay in place. Returns (text, chars removed).
+    """
+    lines = text.splitlines(keepends=True)
+    removed = [False] * len(lines)
+    for targets, order in ((top, range(len(lines))), (bottom, range(len(lines) - 1, -1, -1))):
+        pending = list(targets)
+        for i in order:
+            if not pending:
+                break
+            stripped = lines[i].strip()
+            if not removed[i] and stripped in pending:
+                pending.remove(stripped)
+                removed[i] = True
+    chars_removed = sum(len(line) for line, drop in zip(lines, removed) if drop)
+    return "".join(line for line, drop in zip(lines, removed) if not drop), chars_removed
+
+
+def strip_boilerplate(pages: List[PageRecord], known_signatures: Optional[List[list]] = None) -> Dict:
+    """
+    Remove header/footer lines that repeat across pages at the same position, font and digit-masked text
+    (publisher title, print timestamp, URL, page numbers). Page texts and offsets are updated in place.
+    With `known_signatures` (band, position, size, bold, masked text from a layout profile) the per-page
+    frequency count is skipped and only edge lines matching one of those signatures are removed.
+    Returns a report with the removed lines, styles and signatures, characters and an estimated token count.
+    """
+    report = {"lines": [], "styles": [], "signatures": [], "chars_removed": 0, "estimated_tokens_removed": 0}
+    if known_signatures is not None:
+        known = {tuple(signature) for signature in known_signatures}
+        repeated = {edge.signature() for record in pages for edge in record.edge_lines
+                    if edge.signature() in known}
+    else:
+        if len(pages) < BOILERPLATE_MIN_PAGES:
+            return report
+
+        # Number of distinct pages each signature appears on
+        page_hits: Dict[Tuple, int] = {}
+        for record in pages:
+            for signature in {edge.signature() for edge in record.edge_lines}:
+                page_hits[signature] = page_hits.get(signature, 0) + 1
+
+        min_pages = max(BOILERPLATE_MIN_PAGES, int(
+            len(pages) * BOILERPLATE_MIN_PAGE_RATIO))
+        repeated = {sig for sig, hits in page_hits.items() if hits >= min_pages}
+    if not repeated:
+        return report
+
+    chars_removed = 0
+    offset = 0
+    for record in pages:
+        top = [edge.text for edge in record.edge_lines
+               if edge.band == "top" and edge.signature() in repeated]
+        bottom = [edge.text for edge in record.edge_lines
+                  if edge.band == "bottom" and edge.signature() in repeated]
+        if top or bottom:
+            record.text, removed = _remove_edge_lines(record.text, top, bottom)
+            chars_removed += removed
+        record.offset = offset
+        offset += len(record.text)
+
+    report["lines"] = sorted({sig[-1] for sig in repeated})
+    report["styles"] = [list(style) for style in sorted({sig[:4] for sig in repeated})]
+    report["signatures"] = [list(sig) for sig in sorted(repeated)]
+    report["chars_removed"] = chars_removed
+    # ~4 characters per token for English prose
+    report["estimated_tokens_removed"] = chars_removed // 4
+    return report
+
+
+def parse_pages(doc: fitz.Document, scanned_pages: Optional[Dict[int, Tuple[fitz.Page, fitz.TextPage]]] = None) -> List[PageRecord]:
+    """Parse every page of the document once, in order, reusing pages and TextPages loaded by the pre-scan"""
+    scanned_pages = scanned_pages or {}
+    pages: List[PageRecord] = []
+    offset = 0
+    for page_num in range(len(doc)):
+        # A TextPage is only valid together with the Page object it was built from
+        page, textpage = scanned_pages.pop(page_num, (None, None))
+        record = parse_page(page or doc.load_page(page_num), page_num, offset, textpage=textpage)
+        offset += len(record.text)
+        pages.append(record)
+    return pages
+
+
+# ------------------ PAGE-SHARDED EXTRACTION (PROCESS POOL) --------
+
+_EXTRACTION_POOL: Optional[ProcessPoolExecutor] = None
+_EXTRACTION_POOL_LOCK = threading.Lock()
+
+
+def _noop() -> None:
+    return None
+
+
+def get_extraction_pool() -> ProcessPoolExecutor:
+    """Return the process-wide extraction pool, creating it on first use"""
+    global _EXTRACTION_POOL
+    with _EXTRACTION_POOL_LOCK:
+        if _EXTRACTION_POOL is None:
+            # spawn: never fork the threaded API process
+            _EXTRACTION_POOL = ProcessPoolExecutor(
+                max_workers=PDF_EXTRACTION_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _EXTRACTION_POOL
+
+
+def warm_extraction_pool() -> None:
+    """Start every worker up front so the first large upload doesn't pay process spawn + fitz import"""
+    pool = get_extraction_pool()
+    for future in [pool.submit(_noop) for _ in range(PDF_EXTRACTION_WORKERS)]:
+        future.result()
+
+
+def shutdown_extraction_pool() -> None:
+    global _EXTRACTION_POOL
+    with _EXTRACTION_POOL_LOCK:
+        if _EXTRACTION_POOL is not None:
+            _EXTRACTION_POOL.shutdown(wait=False, cancel_futures=True)
+            _EXTRACTION_POOL = None
+
+
+def _parse_page_range(pdf_path: str, start: int, stop: int) -> List[PageRecord]:
+    """
+    Worker entry point: open the spooled PDF and parse pages [start, stop).
+    Offsets are relative to the start of the range; the parent rebases them.
+    """
+    doc = fitz.open(pdf_path, filetype="pdf")
+    try:
+        pages: List[PageRecord] = []
+        offset = 0
+        for page_num in range(start, stop):
+            record = parse_page(doc.load_page(page_num), page_num, offset)
+            offset += len(record.text)
+            pages.append(record)
+        return pages
+    finally:
+        doc.close()
+
+
+def parse_file_pages_parallel(pdf_path: str, page_count: int) -> List[PageRecord]:
+    """
+    Split the page range across the extraction pool and merge the per-page records back in page order.
+    Every worker opens the PDF on disk itself instead of receiving a pickled copy.
+    """
+    workers = max(1, min(PDF_EXTRACTION_WORKERS, page_count))
+    chunk = -(-page_count // workers)  # ceil division
+    ranges = [(start, min(start + chunk, page_count))
+              for start in range(0, page_count, chunk)]
+
+    pool = get_extraction_pool()
+    futures = [pool.submit(_parse_page_range, str(pdf_path), start, stop)
+               for start, stop in ranges]
+    shards = [future.result() for future in futures]
+
+    # Rebase shard-relative offsets onto the whole document
+    pages: List[PageRecord] = []
+    offset = 0
+    for shard in shards:
+        for record in shard:
+            record.offset = offset
+            offset += len(record.text)
+            pages.append(record)
+    return pages
+
+
 class PDFProcessor:
     """Handles PDF processing operations for earnings call transcripts"""
 
-    def __init__(self, max_file_size_mb: int = FILESIZE, save_transcripts_dir: str = CACHE_DIR):
+    def __init__(self, max_file_size_mb: int = SPOOLED_FILESIZE, save_transcripts_dir: str = CACHE_DIR,
+                 parallel_min_pages: Optional[int] = PDF_PARALLEL_MIN_PAGES, use_layout_profiles: bool = True):
 
         self.max_file_size_bytes = max_file_size_mb * 1024 * 1024
+        # Page count from which extraction is sharded across the process pool (None = always in-process)
+        self.parallel_min_pages = parallel_min_pages
         self.save_transcripts_dir = Path(save_transcripts_dir)
         self.save_transcripts_dir.mkdir(exist_ok=True)
         # Titles of the Q&A sections
         self.qa_patterns = QA_PATTERNS
+        self.qa_title_regex = QA_TITLE_REGEX
+        # Learned publisher templates, persisted next to the transcripts
+        self.layout_profiles = get_layout_profile_store(
+            save_transcripts_dir) if use_layout_profiles else None
 
 # ------------------ FUNCTIONS UTILITIES --------
 
     # Find the body font size
-    def analyze_font_styles(self,  doc: fitz.Document) -> float:
+    def analyze_font_styles(self,  doc: fitz.Document, pages: Optional[List[PageRecord]] = None) -> float:
 
         try:
+            if pages is None:
+                pages = parse_pages(doc)
 
-            font_sizes = []
+            # Merge per-page counts; insertion order keeps the first-seen size on ties, like statistics.mode
+            size_counts: Dict[float, int] = {}
+            for record in pages:
+                for size, count in record.size_counts.items():
+                    if size > 0:  # Filter out invalid sizes
+                        size_counts[size] = size_counts.get(size, 0) + count
 
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                blocks = page.get_text("dict")["blocks"]
-
-                for block in blocks:
-                    if "lines" in block:
-                        for line in block["lines"]:
-                            for span in line["spans"]:
-                                font_size = span["size"]
-                                if font_size > 0:  # Filter out invalid sizes
-                                    font_sizes.append(round(font_size, 1))
-            if not font_sizes:
+            if not size_counts:
                 raise PDFProcessingError(
                     "No valid font sizes found in document")
 
-            # Calculate mode (most common font size)
-            try:
-                body_font_size = mode(font_sizes)
-            except StatisticsError:
-                # If no mode exists, use median
-                font_sizes.sort()
-                body_font_size = font_sizes[len(font_sizes) // 2]
+            # Most common font size
+            body_font_size = max(size_counts, key=size_counts.__getitem__)
 
             return body_font_size
 
@@ -69,150 +383,226 @@ class PDFProcessor:
                 f"Failed to analyze font styles: {str(e)}")
 
     # Find the Q&A section by Q&A keywords and font size and font weight
-    def find_qa_section_title(self, doc: fitz.Document, body_font_size: float) -> Optional[int]:
+    def find_qa_section_title(self, doc: fitz.Document, body_font_size: float, pages: Optional[List[PageRecord]] = None) -> Optional[int]:
 
         try:
-
-            self.qa_patterns = QA_PATTERNS
+            if pages is None:
+                pages = parse_pages(doc)
 
             min_title_font_size = body_font_size
 
-            # Search from the last page to the first to avoid table of contents
-            for page_num in range(len(doc) - 1, -1, -1):
-                page = doc.load_page(page_num)
-                blocks = page.get_text("dict")["blocks"]
-
-                for block in blocks:
-                    if "lines" in block:
-                        for line in block["lines"]:
-                            line_text = ""
-                            line_font_sizes = []
-                            line_fonts: List[str] = []
-
-                            for span in line["spans"]:
-                                line_text += span["text"]
-                                line_font_sizes.append(span["size"])
-                                # Collect font names to infer bold
-                                font_name = str(span.get("font", "")).lower()
-                                if font_name:
-                                    line_fonts.append(font_name)
-
-                            line_text = line_text.strip()
-
-                            # Infer bold / heading-like
-                            is_bold = any(
-                                ("bold" in f or "heavy" in f) for f in line_fonts
-                            )
-
-                            # Check if line matches Q&A patterns (case-insensitive)
-                            for pattern in self.qa_patterns:
-
-                                if re.search(re.escape(pattern), line_text, flags=re.IGNORECASE):
-                                    print(
-                                        f"[EXTRACT Q&A] Found Q&A pattern: {pattern}")
-                                    if line_font_sizes:
-                                        print(
-                                            f"[EXTRACT Q&A] Line font sizes: {line_font_sizes}")
-                                        max_size = max(line_font_sizes)
-                                        print(
-                                            f"[EXTRACT Q&A] Max size: {max_size}")
-                                        # Accept if strictly larger than body, or equal-size within epsilon but bold/heading-like
-                                        print(
-                                            f"[EXTRACT Q&A] Min title font size: {min_title_font_size}")
-                                        print(
-                                            f"[EXTRACT Q&A] Is bold: {is_bold}")
-                                        if max_size > (min_title_font_size) or (max_size == min_title_font_size and is_bold):
-                                            print(
-                                                f"[EXTRACT Q&A] Found Q&A section at page {page_num}")
-                                            q_a_page_num = page_num
-                                            return q_a_page_num
-                                        elif max_size == min_title_font_size:
-                                            # Remove the matched pattern and count remaining words
-                                            remaining_text = re.sub(
-                                                re.escape(pattern), "", line_text, flags=re.IGNORECASE)
-                                            other_words = re.findall(
-                                                r"\b\w+\b", remaining_text)
-                                            print(
-                                                f"[EXTRACT Q&A] Remaining words after removing pattern: {other_words}")
-                                            if len(other_words) <= 3:
-                                                print(
-                                                    f"[EXTRACT Q&A] Accepted (equal size, <=3 other words) at page {page_num}")
-                                                q_a_page_num = page_num
-                                                return q_a_page_num
-                                            else:
-                                                print(
-                                                    f"[EXTRACT Q&A] Rejected (equal size, >3 other words) at page {page_num}")
+            # Search from the last page to the first to avoid table of contents.
+            # Only pages that passed the plain-text prefilter carry line records.
+            for record in reversed(pages):
+                for line in record.lines:
+                    line_text = line.text
+
+                    # Check if line matches Q&A patterns (case-insensitive)
+                    if not line.sizes or not self.qa_title_regex.search(line_text):
+                        continue
+
+                    max_size = max(line.sizes)
+
+                    # Infer bold / heading-like
+                    is_bold = any(_is_bold(f) for f in line.fonts)
+
+                    # Accept if strictly larger than body, or equal-size but bold/heading-like
+                    if max_size > min_title_font_size or (max_size == min_title_font_size and is_bold):
+                        return record.page_num
+                    elif max_size == min_title_font_size:
+                        # Remove the matched pattern and count remaining words
+                        remaining_text = self.qa_title_regex.sub(
+                            "", line_text)
+                        other_words = re.findall(r"\b\w+\b", remaining_text)
+                        if len(other_words) <= 3:
+                            return record.page_num
 
             return None
 
         except Exception as e:
             raise PDFProcessingError(f"Failed to find Q&A section: {str(e)}")
 
-    def extract_text_sections(self, doc: fitz.Document) -> Tuple[str, str]:
+    def _qa_boundary_page(self, page_num: int, pages: List[PageRecord]) -> Optional[int]:
+        # Accept a target only if the title text is really on that page, so the split below finds it
+        if 0 <= page_num < len(pages) and self.qa_title_regex.search(pages[page_num].text):
+            return page_num
+        return None
+
+    def find_qa_page_from_outline(self, doc: fitz.Document, pages: List[PageRecord]) -> Optional[int]:
+        """Q&A start page from the PDF outline (bookmarks); the last matching entry wins."""
+        for _level, title, page_number in reversed(doc.get_toc(simple=True)):
+            if self.qa_title_regex.search(title or ""):
+                target = self._qa_boundary_page(page_number - 1, pages)
+                if target is not None:
+                    return target
+        return None
+
+    def find_qa_page_from_links(self, doc: fitz.Document, pages: List[PageRecord]) -> Optional[int]:
+        """Q&A start page from an internal link whose anchor text is a Q&A title (table of contents page)."""
+        for page_num in range(min(len(doc), QA_TOC_LINK_SCAN_PAGES)):
+            page = doc[page_num]
+            for link in page.get_links():
+                if link.get("kind") != fitz.LINK_GOTO or "page" not in link:
+                    continue
+                anchor = page.get_textbox(link["from"])
+                if self.qa_title_regex.search(anchor or ""):
+                    target = self._qa_boundary_page(link["page"], pages)
+                    if target is not None:
+                        return target
+        return None
+
+    def find_qa_page_from_header_style(self, pages: List[PageRecord], qa_header: dict) -> Optional[int]:
+        """Q&A start page from the title style learned for this publisher template; the last matching page wins."""
+        for record in reversed(pages):
+            for line in record.lines:
+                if (line.sizes and round(max(line.sizes), 1) == qa_header.get("size")
+                        and any(_is_bold(f) for f in line.fonts) == qa_header.get("bold")
+                        and self.qa_title_regex.search(line.text)):
+                    return record.page_num
+        return None
+
+    def resolve_qa_boundary(self, doc: fitz.Document, body_font_size: float, pages: List[PageRecord],
+                            qa_header: Optional[dict] = None) -> Tuple[Optional[int], str]:
+        """
+        Find the Q&A start page, trying the outline, then table-of-contents links, then the title style
+        of a known layout profile, and only then the font heuristic over every page. Returns (page, strategy).
+        """
+        try:
+            page_num = self.find_qa_page_from_outline(doc, pages)
+            if page_num is not None:
+                return page_num, "outline"
+            page_num = self.find_qa_page_from_links(doc, pages)
+            if page_num is not None:
+                return page_num, "links"
+        except Exception as e:
+            # Malformed outline or link table: the heuristic still works on the text
+            print(f"[EXTRACT Q&A] Outline/link lookup failed: {e}")
+
+        if qa_header:
+            page_num = self.find_qa_page_from_header_style(pages, qa_header)
+            if page_num is not None:
+                return page_num, "layout_profile"
+
+        page_num = self.find_qa_section_title(doc, body_font_size, pages)
+        return page_num, ("font_heuristic" if page_num is not None else "none")
+
+    def _qa_header_style(self, record: PageRecord) -> Optional[dict]:
+        for line in record.lines:
+            if line.sizes and self.qa_title_regex.search(line.text):
+                return {"size": round(max(line.sizes), 1), "bold": any(_is_bold(f) for f in line.fonts)}
+        return None
+
+    def _known_layout(self, doc: fitz.Document, pages: List[PageRecord]) -> Tuple[str, Optional[dict]]:
+        fingerprint = layout_fingerprint(doc, pages[0].edge_lines if pages else [])
+        if self.layout_profiles is None:
+            return fingerprint, None
+        profile = self.layout_profiles.get(fingerprint)
+        if not profile:
+            return fingerprint, None
+        # A profile whose body size never occurs in this document is stale for it
+        if not any(profile.get("body_font_size") in record.size_counts for record in pages):
+            return fingerprint, None
+        # Profiles learned before header/footer text was part of the signature are relearned
+        if any(len(signature) != 5 for signature in profile.get("boilerplate") or []):
+            return fingerprint, None
+        return fingerprint, profile
+
+    def extract_text_sections(self, doc: fitz.Document, pages: Optional[List[PageRecord]] = None) -> Tuple[str, str]:
+        sections = self.extract_sections(doc, pages)
+        return sections.presentation, sections.q_a
+
+    def extract_sections(self, doc: fitz.Document, pages: Optional[List[PageRecord]] = None,
+                         scanned_pages: Optional[Dict[int, Tuple[fitz.Page, fitz.TextPage]]] = None) -> ExtractedSections:
         try:
-            body_font_size = self.analyze_font_styles(doc)
-            print(f"[EXTRACT Q&A] Body font size: {body_font_size}")
+            # Single parse pass shared by every phase below
+            if pages is None:
+                pages = parse_pages(doc, scanned_pages)
+
+            # Known publisher template: its profile replaces the font-size and header/footer statistics
+            fingerprint, profile = self._known_layout(doc, pages)
+            if profile:
+                body_font_size = profile["body_font_size"]
+                print(
+                    f"[EXTRACT Q&A] Layout profile {fingerprint} hit, body font size: {body_font_size}")
+            else:
+                body_font_size = self.analyze_font_styles(doc, pages)
+                print(f"[EXTRACT Q&A] Body font size: {body_font_size}")
 
-            qa_start_page = self.find_qa_section_title(doc, body_font_size)
-            print(f"[EXTRACT Q&A] Q&A start page: {qa_start_page}")
+            # Drop repeated headers/footers before any text is assembled, hashed or stored
+            boilerplate = strip_boilerplate(
+                pages, (profile.get("boilerplate") or []) if profile else None)
+            if boilerplate["chars_removed"]:
+                print(
+                    f"[EXTRACT Q&A] Removed boilerplate: {boilerplate['chars_removed']} chars "
+                    f"(~{boilerplate['estimated_tokens_removed']} tokens), lines={boilerplate['lines']}")
 
-            presentation_transcript = ""
-            q_a_transcript = ""
+            qa_start_page, qa_boundary_strategy = self.resolve_qa_boundary(
+                doc, body_font_size, pages, profile.get("qa_header") if profile else None)
+            print(
+                f"[EXTRACT Q&A] Q&A start page: {qa_start_page} (strategy: {qa_boundary_strategy})")
+
+            layout = {"fingerprint": fingerprint, "profile_hit": bool(profile)}
+            # Learn the template from documents whose Q&A section was found
+            if not profile and qa_start_page is not None and self.layout_profiles is not None:
+                learned = self.layout_profiles.observe(
+                    fingerprint,
+                    body_font_size,
+                    self._qa_header_style(pages[qa_start_page]),
+                    boilerplate["signatures"],
+                    producer=(doc.metadata or {}).get("producer") or "",
+                )
+                layout["documents"] = learned["documents"]
+
+            presentation_parts: List[str] = []
+            q_a_parts: List[str] = []
+            q_a_page_offsets: List[Tuple[int, int]] = []
             # If no Q&A section is found, the whole document is the presentation.
             if qa_start_page is None:
                 print(
                     "[EXTRACT Q&A] No Q&A section found - treating entire document as presentation")
-                for page_num in range(len(doc)):
-                    presentation_transcript += doc.load_page(
-                        page_num).get_text()
+                presentation_parts.extend(record.text for record in pages)
             else:
                 print(
                     f"[EXTRACT Q&A] Q&A section found starting at page {qa_start_page}")
                 # Extract text from pages before the Q&A section
-                for page_num in range(qa_start_page):
-                    presentation_transcript += doc.load_page(
-                        page_num).get_text()
+                presentation_parts.extend(
+                    record.text for record in pages[:qa_start_page])
 
                 # Split the page where the Q&A section starts
-                page = doc.load_page(qa_start_page)
-                page_text = page.get_text()
-
-                qa_start_index = -1
-                lowered_page_text = page_text.lower()
-                # Find the first occurece of q&a title pattern
-                for pattern in self.qa_patterns:
+                page_text = pages[qa_start_page].text
 
-                    found_index = lowered_page_text.find(pattern.lower())
-                    if found_index != -1:  # found pattern
-
-                        if qa_start_index == -1 or found_index < qa_start_index:
-                            qa_start_index = found_index
+                # Find the first occurence of q&a title pattern
+                match = self.qa_title_regex.search(page_text)
+                qa_start_index = match.start() if match else -1
 
+                q_a_length = 0
                 if qa_start_index != -1:  # found q_a first occurence
-                    presentation_transcript += page_text[:qa_start_index]
-                    q_a_transcript += page_text[qa_start_index:]
+                    presentation_parts.append(page_text[:qa_start_index])
+                    q_a_parts.append(page_text[qa_start_index:])
+                    q_a_page_offsets.append((qa_start_page, 0))
+                    q_a_length = len(page_text) - qa_start_index
                 else:
                     # Fallback if pattern not found on page (should not happen)
-                    presentation_transcript += page_text
+                    presentation_parts.append(page_text)
 
                 # Extract text from the rest of the pages for the Q&A section
-                for page_num in range(qa_start_page + 1, len(doc)):
-                    q_a_transcript += doc.load_page(page_num).get_text()
+                for record in pages[qa_start_page + 1:]:
+                    q_a_parts.append(record.text)
+                    q_a_page_offsets.append((record.page_num, q_a_length))
+                    q_a_length += len(record.text)
+
+            presentation_transcript = "".join(presentation_parts)
+            q_a_transcript = "".join(q_a_parts)
+            # Leading whitespace removed by the strips below shifts every page offset
+            q_a_lead = len(q_a_transcript) - len(q_a_transcript.lstrip())
 
             # Clean up and remove possible copyright page from the end
-            if len(doc) > 1:
-                last_page = doc.load_page(len(doc) - 1)
-                last_page_text = last_page.get_text().strip()
+            if len(pages) > 1:
+                last_page = pages[-1]
+                last_page_text = last_page.text.strip()
 
                 if last_page_text:
-                    last_page_font_sizes = []
-                    blocks = last_page.get_text("dict")["blocks"]
-                    for block in blocks:
-                        if "lines" in block:
-                            for line in block["lines"]:
-                                for span in line["spans"]:
-                                    last_page_font_sizes.append(
-                                        round(span["size"], 1))
+                    last_page_font_sizes = list(last_page.size_counts)
 
                    # if the last page has text smaller than the body font size, then trim the copyright from the last page
                     if last_page_font_sizes and max(last_page_font_sizes) < body_font_size:
@@ -225,7 +615,24 @@ class PDFProcessor:
                             presentation_transcript = presentation_transcript.strip()[
                                 :-len(last_page_text)].strip()
 
-            return presentation_transcript.strip(), q_a_transcript.strip()
+            q_a_transcript = q_a_transcript.strip()
+            q_a_page_offsets = [
+                (page_num, max(0, offset - q_a_lead))
+                for page_num, offset in q_a_page_offsets
+                if offset - q_a_lead < len(q_a_transcript)
+            ]
+
+            return ExtractedSections(
+                presentation=presentation_transcript.strip(),
+                q_a=q_a_transcript,
+                qa_start_page=qa_start_page,
+                q_a_page_offsets=q_a_page_offsets,
+                qa_boundary_strategy=qa_boundary_strategy,
+                bold_leads=list(dict.fromkeys(
+                    lead for record in pages for lead in record.bold_leads)),
+                boilerplate=boilerplate,
+                layout=layout,
+            )
 
         except Exception as e:
             raise PDFProcessingError(
@@ -233,20 +640,24 @@ class PDFProcessor:
 
     # ------------------ FUNCTIONS WORKFLOWS ------------------------------------------------
 
+    def _check_size(self, size_bytes: int) -> None:
+        if size_bytes > self.max_file_size_bytes:
+            size_mb = size_bytes / (1024 * 1024)
+            max_mb = self.max_file_size_bytes / (1024 * 1024)
+            raise PDFProcessingError(
+                f"File size ({size_mb:.2f}MB) exceeds maximum allowed size ({max_mb}MB)"
+            )
+
     def process_pdf_bytes(self, pdf_bytes: bytes, original_filename: Optional[str] = None) -> Dict:
         """
         Process a PDF provided as in-memory bytes, without writing a temporary file.
+        Always parsed in-process: the extraction pool reads documents from disk (see process_pdf_file).
         """
         if not pdf_bytes or len(pdf_bytes) == 0:
             raise PDFProcessingError("Empty PDF upload")
 
         # Validate size
-        if len(pdf_bytes) > self.max_file_size_bytes:
-            size_mb = len(pdf_bytes) / (1024 * 1024)
-            max_mb = self.max_file_size_bytes / (1024 * 1024)
-            raise PDFProcessingError(
-                f"File size ({size_mb:.2f}MB) exceeds maximum allowed size ({max_mb}MB)"
-            )
+        self._check_size(len(pdf_bytes))
 
         # Open document from memory
         try:
@@ -255,10 +666,128 @@ class PDFProcessor:
             raise PDFProcessingError(
                 f"Failed to open PDF from bytes: {str(e)}")
 
+        return self._process_document(doc, None, original_filename)
+
+    def prescan_qa_section(self, doc: fitz.Document,
+                           scanned_pages: Optional[Dict[int, Tuple[fitz.Page, fitz.TextPage]]] = None) -> Optional[Dict]:
+        """
+        Cheap check for a Q&A section: outline titles first, then the plain text of each page
+        from the back. No span/font analysis, so a document without any Q&A title
+        (e.g. a press release) is rejected in a fraction of the full extraction time.
+        Up to QA_PRESCAN_MAX_CACHED_PAGES of the pages and TextPages loaded along the way are stored in
+        `scanned_pages` (page number -> (page, textpage)) so the extraction that follows does not build them again.
+        Returns {"strategy", "page"} for the first hit, or None.
+        """
+        try:
+            for _level, title, page_number in doc.get_toc(simple=True):
+                if self.qa_title_regex.search(title or ""):
+                    return {"strategy": "outline", "page": page_number - 1}
+
+            # Any page whose plain text mentions a Q&A title is a candidate for the full heuristic
+            for page_num in range(len(doc) - 1, -1, -1):
+                page = doc.load_page(page_num)
+                textpage = page.get_textpage(flags=fitz.TEXTFLAGS_TEXT)
+                if scanned_pages is not None and len(scanned_pages) < QA_PRESCAN_MAX_CACHED_PAGES:
+                    scanned_pages[page_num] = (page, textpage)
+                text = page.get_text("text", textpage=textpage)
+                if self.qa_title_regex.search(text):
+                    return {"strategy": "text", "page": page_num}
+
+            return None
+
+        except Exception as e:
+            raise PDFProcessingError(f"Failed to pre-scan PDF: {str(e)}")
+
+    def prescan_pdf_file(self, pdf_path: str) -> Optional[Dict]:
+        doc = self._open_pdf_file(pdf_path)
+        try:
+            return self.prescan_qa_section(doc)
+        finally:
+            doc.close()
+
+    def _open_pdf_file(self, pdf_path: str) -> fitz.Document:
+        try:
+            size_bytes = Path(pdf_path).stat().st_size
+        except OSError as e:
+            raise PDFProcessingError(f"Failed to read spooled PDF: {str(e)}")
+        if size_bytes == 0:
+            raise PDFProcessingError("Empty PDF upload")
+
+        self._check_size(size_bytes)
+
+        try:
+            return fitz.open(pdf_path, filetype="pdf")
+        except Exception as e:
+            raise PDFProcessingError(
+                f"Failed to open PDF from file: {str(e)}")
+
+    def process_pdf_file(self, pdf_path: str, original_filename: Optional[str] = None) -> Dict:
+        """
+        Process a PDF that was spooled to disk. MuPDF reads the file on demand,
+        so memory stays bounded regardless of the upload size.
+        """
+        doc = self._open_pdf_file(pdf_path)
+
+        return self._process_document(
+            doc, lambda page_count: parse_file_pages_parallel(pdf_path, page_count), original_filename)
+
+    def prescan_and_process_pdf_file(self, pdf_path: str, original_filename: Optional[str] = None) -> Optional[Dict]:
+        """
+        Pre-scan a spooled PDF and, only if it has a Q&A title, run the full extraction on the same open
+        document, reusing the pages and TextPages the pre-scan loaded. Returns None for documents without a Q&A title;
+        otherwise the process_pdf_file result with the pre-scan hit under "prescan".
+        """
+        doc = self._open_pdf_file(pdf_path)
+        # Sharded documents are re-parsed by the workers, so their pre-scanned pages would go unused
+        scanned_pages: Optional[Dict[int, Tuple[fitz.Page, fitz.TextPage]]] = (
+            None if self._parses_in_parallel(len(doc)) else {})
+        try:
+            prescan = self.prescan_qa_section(doc, scanned_pages)
+        except BaseException:
+            doc.close()
+            raise
+        if prescan is None:
+            doc.close()
+            return None
+
+        result = self._process_document(
+            doc, lambda page_count: parse_file_pages_parallel(pdf_path, page_count), original_filename,
+            scanned_pages=scanned_pages)
+        result["prescan"] = prescan
+        return result
+
+    def _parses_in_parallel(self, page_count: int) -> bool:
+        # A single worker only adds IPC on top of the in-process pass
+        return (self.parallel_min_pages is not None and page_count >= self.parallel_min_pages
+                and PDF_EXTRACTION_WORKERS > 1)
+
+    def _process_document(self, doc: fitz.Document, parse_parallel, original_filename: Optional[str],
+                          scanned_pages: Optional[Dict[int, Tuple[fitz.Page, fitz.TextPage]]] = None) -> Dict:
+        # Large documents: parse page shards in worker processes, then run the phases on the merged records
+        pages: Optional[List[PageRecord]] = None
+        page_count = len(doc)
+        if parse_parallel is not None and self._parses_in_parallel(page_count):
+            try:
+                pages = parse_parallel(page_count)
+                print(
+                    f"[PDF_PROCESSOR] Parsed {page_count} pages in the extraction pool")
+            except Exception as e:
+                # Pool unavailable (e.g. broken worker): fall back to the in-process pass
+                print(
+                    f"[PDF_PROCESSOR] Parallel extraction failed, parsing in-process: {e}")
+                pages = None
+
         print("Extracting text sections...")
         #  Extract both text sections
-        presentation_transcript, q_a_transcript = self.extract_text_sections(
-            doc)
+        try:
+            sections = self.extract_sections(doc, pages, scanned_pages)
+        finally:
+            doc.close()
+        presentation_transcript, q_a_transcript = sections.presentation, sections.q_a
+
+        # Speaker turns (operator / analyst / executive) with offsets into the Q&A text
+        speaker_index = build_speaker_index(
+            presentation_transcript, q_a_transcript, sections.q_a_page_offsets, sections.bold_leads)
 
         print("Validating content...")
         #  Validate content
@@ -281,19 +810,23 @@ class PDFProcessor:
         else:
             print("[PDF_PROCESSOR] Q&A transcript is EMPTY!")
 
-        doc.close()
-
         return {
             "presentation_transcript": presentation_transcript.strip(),
             "presentation_text_length": len(presentation_transcript),
             "q_a_transcript": q_a_transcript.strip(),
             "qa_text_length": len(q_a_transcript),
+            "speaker_index": speaker_index,
+            "boilerplate": sections.boilerplate,
+            "qa_boundary_strategy": sections.qa_boundary_strategy,
+            "layout": sections.layout,
         }
 
 
-def create_pdf_processor(max_file_size_mb: int = FILESIZE, save_transcripts_dir: str = CACHE_DIR) -> PDFProcessor:
+def create_pdf_processor(max_file_size_mb: int = SPOOLED_FILESIZE, save_transcripts_dir: str = CACHE_DIR,
+                         parallel_min_pages: Optional[int] = PDF_PARALLEL_MIN_PAGES,
+                         use_layout_profiles: bool = True) -> PDFProcessor:
     """
     Main function to  create the pdf processor's instance
     """
 
-    return PDFProcessor(max_file_size_mb, save_transcripts_dir)
+    return PDFProcessor(max_file_size_mb, save_transcripts_dir, parallel_min_pages, use_layout_profiles)
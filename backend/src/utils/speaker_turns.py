@@ -0,0 +1,337 @@
+"""
+Speaker-turn segmentation for extracted Q&A transcripts.
+Splits the Q&A text into operator / analyst / executive turns with character offsets,
+speaker name, firm, role and source page, using the participant lists that BamSEC-style
+transcripts print at the top of the presentation.
+"""
+
+import json
+import os
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.config.constants import CACHE_DIR
+
+
+OPERATOR = "operator"
+ANALYST = "analyst"
+EXECUTIVE = "executive"
+UNKNOWN = "unknown"
+
+_DASH = " – "
+_EXECUTIVES_TITLE = re.compile(r"^corporate participants$", re.IGNORECASE)
+_ANALYSTS_TITLE = re.compile(
+    r"^conference call participants$", re.IGNORECASE)
+_PARTICIPANTS_END = re.compile(r"^(presentation|operator)$", re.IGNORECASE)
+# "Our next question comes from Brian Essex with JPMorgan."
+_ANNOUNCEMENT = re.compile(
+    r"\bfrom ((?:[A-Z][\w.'-]*\s){1,3}[A-Z][\w.'-]*)\s+(?:with|from|of|at)\b")
+# Fallback header shape when no participant list is available: "Name Firm – Role"
+_GENERIC_HEADER = re.compile(r"^[A-Z][^–\n]{2,100} – [^\n]{2,100}$")
+# End of a question sentence; "??" or "?!" count once
+_QUESTION_END = re.compile(r"\?[?!]*")
+
+
+@dataclass(slots=True)
+class Participant:
+    header: str
+    name: str
+    firm: str
+    role: str
+    speaker_type: str
+
+
+@dataclass(slots=True)
+class SpeakerTurn:
+    index: int
+    speaker_type: str
+    speaker: str
+    firm: str
+    role: str
+    # Character offsets of the whole turn (header included) in the Q&A transcript
+    start: int
+    end: int
+    page: Optional[int]
+
+
+def _norm(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _participant_entries(lines: Sequence[str]) -> List[Tuple[str, str]]:
+    """Group wrapped participant lines into (entry, speaker_type) pairs."""
+    entries: List[Tuple[str, str]] = []
+    speaker_type: Optional[str] = None
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        if _EXECUTIVES_TITLE.match(line):
+            speaker_type = EXECUTIVE
+            continue
+        if _ANALYSTS_TITLE.match(line):
+            speaker_type = ANALYST
+            continue
+        if speaker_type is None:
+            continue
+        if _PARTICIPANTS_END.match(line):
+            break
+        if _DASH in line or not entries or entries[-1][1] != speaker_type:
+            entries.append((line, speaker_type))
+        else:
+            # Wrapped continuation of the previous entry
+            entries[-1] = (entries[-1][0] + " " + line, speaker_type)
+    return entries
+
+
+def _common_suffix(token_lists: List[List[str]]) -> List[str]:
+    suffix: List[str] = []
+    for column in zip(*(reversed(tokens) for tokens in token_lists)):
+        if len(set(column)) != 1:
+            break
+        suffix.insert(0, column[0])
+    return suffix
+
+
+def _split_name_firm(before: str, bold_leads: Sequence[str], announced: List[List[str]], exec_firm: List[str]) -> Tuple[str, str]:
+    tokens = before.split()
+
+    # 1) The PDF rendered the name in bold ahead of the firm
+    for lead in bold_leads:
+        if before.startswith(lead + " "):
+            return lead, before[len(lead):].strip()
+
+    # 2) Executives share the company name as a common suffix
+    if exec_firm and len(tokens) > len(exec_firm) and tokens[-len(exec_firm):] == exec_firm:
+        return " ".join(tokens[:-len(exec_firm)]), " ".join(exec_firm)
+
+    # 3) The operator announced a short form of the name ("Brian Essex" for "Brian Lee Essex", "Rob" for "Robbie")
+    for short in announced:
+        if tokens and tokens[0][:3] == short[0][:3] and short[-1] in tokens[1:-1]:
+            cut = tokens.index(short[-1], 1) + 1
+            return " ".join(tokens[:cut]), " ".join(tokens[cut:])
+
+    # 4) First name + surname (keep a middle initial)
+    cut = 3 if len(tokens) > 3 and re.fullmatch(r"[A-Z]\.?", tokens[1]) else 2
+    return " ".join(tokens[:cut]), " ".join(tokens[cut:])
+
+
+def parse_participants(presentation_text: str, q_a_text: str = "", bold_leads: Optional[Sequence[str]] = None) -> List[Participant]:
+    """
+    Read the Corporate / Conference Call Participants lists printed before the presentation.
+    bold_leads: bold text runs that open a line (speaker names are usually bold ahead of the firm).
+    """
+    bold_leads = sorted(_norm(lead) for lead in (bold_leads or ()) if lead.strip())
+    entries = _participant_entries(presentation_text.splitlines())
+    announced = [m.group(1).split() for m in _ANNOUNCEMENT.finditer(q_a_text)]
+
+    parsed: List[Tuple[str, str, str, str]] = []
+    for entry, speaker_type in entries:
+        entry = _norm(entry)
+        before, _, role = entry.partition(_DASH)
+        parsed.append((entry, before.strip(), role.strip(), speaker_type))
+
+    exec_tokens = [before.split() for _, before, _, t in parsed if t == EXECUTIVE]
+    exec_firm = _common_suffix(exec_tokens) if len(exec_tokens) > 1 else []
+
+    participants: List[Participant] = []
+    for entry, before, role, speaker_type in parsed:
+        name, firm = _split_name_firm(before, bold_leads, announced, exec_firm)
+        participants.append(Participant(
+            header=entry, name=name, firm=firm, role=role, speaker_type=speaker_type))
+    return participants
+
+
+def _match_header(lines: List[str], i: int, participants: List[Participant]) -> Tuple[Optional[Participant], int]:
+    """
+    Return (participant, number of lines the header spans) when line i opens a participant header.
+    Headers can wrap differently from the participants list, so lines are joined until the header is complete.
+    """
+    line = _norm(lines[i])
+    if not line:
+        return None, 0
+    for participant in participants:
+        if not participant.header.startswith(line):
+            continue
+        before = participant.header.partition(_DASH)[0]
+        if len(line) < len(before):
+            continue
+        consumed, joined = 1, line
+        while joined != participant.header and i + consumed < len(lines):
+            candidate = _norm(joined + " " + lines[i + consumed])
+            if not participant.header.startswith(candidate):
+                break
+            joined = candidate
+            consumed += 1
+        return participant, consumed
+    return None, 0
+
+
+def _generic_participant(line: str, announced: List[List[str]]) -> Optional[Participant]:
+    line = _norm(line)
+    # Page titles like "Company, Q2 Earnings Call – Company – Publisher" carry several separators
+    if len(line) > 160 or line[-1] in ".?!,;:" or line.count(_DASH) != 1 or not _GENERIC_HEADER.match(line):
+        return None
+    before, _, role = line.partition(_DASH)
+    name, firm = _split_name_firm(before.strip(), [], announced, [])
+    lowered = line.lower()
+    speaker_type = ANALYST if ("analyst" in lowered or "research" in lowered) else EXECUTIVE
+    return Participant(header=line, name=name, firm=firm, role=role.strip(), speaker_type=speaker_type)
+
+
+def segment_turns(q_a_text: str, participants: List[Participant], page_offsets: Optional[List[Tuple[int, int]]] = None) -> List[SpeakerTurn]:
+    """
+    Split the Q&A transcript into speaker turns.
+    page_offsets: (page_num, start offset in q_a_text) pairs in ascending order, used to tag each turn's page.
+    """
+    page_offsets = page_offsets or []
+    page_starts = [offset for _, offset in page_offsets]
+
+    def page_at(offset: int) -> Optional[int]:
+        pos = bisect_right(page_starts, offset) - 1
+        return page_offsets[pos][0] if pos >= 0 else None
+
+    lines = q_a_text.split("\n")
+    line_starts: List[int] = []
+    offset = 0
+    for line in lines:
+        line_starts.append(offset)
+        offset += len(line) + 1
+
+    announced = [] if participants else [
+        m.group(1).split() for m in _ANNOUNCEMENT.finditer(q_a_text)]
+
+    turns: List[SpeakerTurn] = []
+    i = 0
+    while i < len(lines):
+        stripped = lines[i].strip()
+        if stripped.lower() == OPERATOR:
+            speaker, consumed = Participant(
+                header=stripped, name="Operator", firm="", role="", speaker_type=OPERATOR), 1
+        elif participants:
+            speaker, consumed = _match_header(lines, i, participants)
+        else:
+            speaker = _generic_participant(
+                stripped, announced) if stripped else None
+            consumed = 1
+
+        if speaker is None:
+            i += 1
+            continue
+
+        start = line_starts[i]
+        if turns:
+            turns[-1].end = start
+        turns.append(SpeakerTurn(
+            index=len(turns),
+            speaker_type=speaker.speaker_type,
+            speaker=speaker.name,
+            firm=speaker.firm,
+            role=speaker.role,
+            start=start,
+            end=len(q_a_text),
+            page=page_at(start),
+        ))
+        i += consumed
+
+    return turns
+
+
+def build_speaker_index(presentation_text: str, q_a_text: str, page_offsets: Optional[List[Tuple[int, int]]] = None,
+                        bold_leads: Optional[Sequence[str]] = None) -> Dict:
+    """Participants plus Q&A turns, ready to be stored as JSON next to the transcript."""
+    participants = parse_participants(presentation_text, q_a_text, bold_leads)
+    turns = segment_turns(q_a_text, participants, page_offsets)
+    return {
+        "participants": [asdict(p) for p in participants],
+        "turns": [asdict(t) for t in turns],
+        "turn_counts": {
+            speaker_type: sum(1 for t in turns if t.speaker_type == speaker_type)
+            for speaker_type in (OPERATOR, ANALYST, EXECUTIVE, UNKNOWN)
+        },
+    }
+
+
+def q_a_stats(turns: Sequence[Dict], q_a_text: str = "") -> Optional[Dict]:
+    """
+    Distinct analysts, analyst turns and the questions asked in them; None when no analyst was found.
+    Questions are sentences ending in "?", at least one per analyst turn. questions_counted is False when
+    no analyst turn has a question mark (text without punctuation), so the count is one per turn.
+    """
+    analyst_turns = [t for t in turns if t.get("speaker_type") == ANALYST]
+    if not analyst_turns:
+        return None
+    marks = [len(_QUESTION_END.findall(q_a_text[t.get("start", 0):t.get("end", 0)])) for t in analyst_turns]
+    return {
+        "analysts": len({t.get("speaker") for t in analyst_turns}),
+        "analyst_turns": len(analyst_turns),
+        "questions": sum(max(1, count) for count in marks),
+        "questions_counted": any(marks),
+    }
+
+
+def analyst_block_starts(turns: Sequence[Dict]) -> List[int]:
+    """
+    Offsets where each analyst exchange begins: the operator turn announcing the analyst,
+    or the analyst turn itself when it was not announced.
+    """
+    starts: List[int] = []
+    previous: Optional[Dict] = None
+    current_analyst: Optional[str] = None
+    for turn in turns:
+        # Follow-ups from the same analyst belong to the exchange already open
+        if turn.get("speaker_type") == ANALYST and turn.get("speaker") != current_analyst:
+            current_analyst = turn.get("speaker")
+            if previous and previous.get("speaker_type") == OPERATOR:
+                start = previous["start"]
+            else:
+                start = turn["start"]
+            if not starts or start > starts[-1]:
+                starts.append(start)
+        previous = turn
+    return starts
+
+
+def split_q_a_by_analyst(q_a_text: str, turns: Sequence[Dict], target_chars: int, max_chunks: int) -> List[str]:
+    """
+    Split the Q&A transcript at analyst-exchange boundaries into chunks of roughly `target_chars`,
+    never cutting an exchange. Text before the first exchange stays with the first chunk.
+    Returns a single chunk when there are not enough boundaries to split on.
+    """
+    starts = [start for start in analyst_block_starts(turns) if 0 < start < len(q_a_text)]
+    if not starts or max_chunks < 2:
+        return [q_a_text]
+
+    # Aim for evenly sized chunks, no more than max_chunks of them
+    target = max(target_chars, len(q_a_text) // max_chunks + 1)
+    chunks: List[str] = []
+    chunk_start = 0
+    for start in starts:
+        if start - chunk_start >= target and len(chunks) < max_chunks - 1:
+            chunks.append(q_a_text[chunk_start:start])
+            chunk_start = start
+    chunks.append(q_a_text[chunk_start:])
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+# ------------------ PERSISTENCE (next to the transcript JSON) --------
+
+SPEAKER_INDEX_SUFFIX = ".speakers.json"
+
+
+def speaker_index_name(transcript_name: str) -> str:
+    """Call.json -> Call.speakers.json"""
+    return os.path.splitext(transcript_name)[0] + SPEAKER_INDEX_SUFFIX
+
+
+def load_speaker_index(transcript_name: str) -> Optional[Dict]:
+    path = os.path.join(CACHE_DIR, speaker_index_name(transcript_name))
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else None
+    except Exception:
+        # Missing or unreadable index: callers fall back to the flat transcript
+        return None
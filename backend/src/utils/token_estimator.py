@@ -0,0 +1,62 @@
+"""
+Local token counts for transcripts and prompts, without an API call.
+Uses tiktoken when it is installed (the encoding of the model, o200k_base otherwise) and
+falls back to the usual ~4 characters per token estimate.
+"""
+
+import threading
+from typing import Dict, Optional
+
+try:
+    import tiktoken
+except ImportError:  # optional dependency
+    tiktoken = None
+
+DEFAULT_ENCODING = "o200k_base"
+CHARS_PER_TOKEN = 4
+
+_ENCODINGS: Dict[str, object] = {}
+_ENCODINGS_LOCK = threading.Lock()
+
+
+def _encoding(model: Optional[str]):
+    if tiktoken is None:
+        return None
+    key = model or DEFAULT_ENCODING
+    with _ENCODINGS_LOCK:
+        if key not in _ENCODINGS:
+            try:
+                _ENCODINGS[key] = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(DEFAULT_ENCODING)
+            except Exception:
+                try:
+                    _ENCODINGS[key] = tiktoken.get_encoding(DEFAULT_ENCODING)
+                except Exception:
+                    # Encoding files unavailable (e.g. offline): fall back to the character estimate
+                    _ENCODINGS[key] = None
+        return _ENCODINGS[key]
+
+
+def token_estimator_name(model: Optional[str] = None) -> str:
+    encoding = _encoding(model)
+    return f"tiktoken:{encoding.name}" if encoding is not None else f"chars/{CHARS_PER_TOKEN}"
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_transcript_tokens(presentation: str, q_a: str, model: Optional[str] = None) -> Dict:
+    """Token counts stored in the transcript JSON at validation time."""
+    presentation_tokens = count_tokens(presentation, model)
+    q_a_tokens = count_tokens(q_a, model)
+    return {
+        "presentation": presentation_tokens,
+        "q_a": q_a_tokens,
+        "total": presentation_tokens + q_a_tokens,
+        "method": token_estimator_name(model),
+    }
@@ -0,0 +1,65 @@
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+from typing import Iterable, List
+
+# 64-bit simhash over word shingles: re-downloads of the same call (different timestamp,
+# whitespace, ligatures or dash glyphs) land within a few bits of each other
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3
+
+_PUNCT_MAP = str.maketrans({
+    "–": "-", "—": "-", "−": "-",
+    "‘": "'", "’": "'", "“": '"', "”": '"',
+    " ": " ",
+})
+# Words, keeping numbers such as 1,234.5 / 12% / $3 together
+_TOKEN_RE = re.compile(r"[$]?\w+(?:[.,]\w+)*%?")
+
+
+def normalize_transcript(text: str) -> str:
+    """Unicode-fold, lowercase and collapse whitespace so cosmetic differences do not change the fingerprint."""
+    text = unicodedata.normalize("NFKC", text or "").translate(_PUNCT_MAP)
+    return " ".join(text.lower().split())
+
+
+def _shingles(tokens: List[str]) -> Iterable[str]:
+    if len(tokens) < SHINGLE_SIZE:
+        return [" ".join(tokens)] if tokens else []
+    return (" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1))
+
+
+def compute_simhash(text: str) -> str:
+    """Return the simhash of the normalized text as a 16-char hex string."""
+    tokens = _TOKEN_RE.findall(normalize_transcript(text))
+    weights = Counter(_shingles(tokens))
+    if not weights:
+        return "0" * (SIMHASH_BITS // 4)
+
+    hashed = [
+        (int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"), weight)
+        for shingle, weight in weights.items()
+    ]
+    total = sum(weights.values())
+    fingerprint = 0
+    for bit in range(SIMHASH_BITS):
+        mask = 1 << bit
+        # Bit is set when shingles voting 1 outweigh those voting 0
+        ones = sum(weight for value, weight in hashed if value & mask)
+        if ones * 2 > total:
+            fingerprint |= mask
+    return f"{fingerprint:0{SIMHASH_BITS // 4}x}"
+
+
+def fingerprint_transcripts(presentation: str, q_a: str) -> str:
+    return compute_simhash((presentation or "") + "\n\n" + (q_a or ""))
+
+
+def simhash_similarity(a: str, b: str) -> float:
+    """Share of matching bits between two hex simhashes (1.0 = identical)."""
+    try:
+        distance = bin(int(a, 16) ^ int(b, 16)).count("1")
+    except (TypeError, ValueError):
+        return 0.0
+    return 1.0 - distance / SIMHASH_BITS
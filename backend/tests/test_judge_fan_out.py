@@ -0,0 +1,113 @@
+import pytest
+
+from src.llm.llm_utils import (
+    EvaluationResult,
+    JudgeGroupOutputFormat,
+    LLMGenerationError,
+    _fan_out_judge_output,
+    _judge_criteria_groups,
+    overall_assessment,
+)
+
+
+PROMPT_VERSION = "version_5"
+
+
+def _result(name, passed=True):
+    return EvaluationResult(metric_name=name, passed=passed, errors=[])
+
+
+def _group(results, **metadata):
+    return {
+        "eval_results": {"obj": JudgeGroupOutputFormat(evaluation_results=results)},
+        "metadata": {"input_tokens": 1000, "output_tokens": 100, "finish_reason": "completed", **metadata},
+    }
+
+
+def _merge(group_results, group_errors=None):
+    group_errors = group_errors or {}
+    times = {group: 1.0 for group in [*group_results, *group_errors]}
+    return _fan_out_judge_output(PROMPT_VERSION, group_results, times, group_errors, 2.0, None)
+
+
+def _all_groups_passing():
+    _, groups = _judge_criteria_groups(PROMPT_VERSION)
+    return {group: _group([_result(name) for name in names]) for group, names in groups.items()}
+
+
+def test_overall_assessment_counts_missing_criteria_as_failed():
+    assessment = overall_assessment(
+        [_result("factuality"), _result("metric_accuracy", passed=False)],
+        ["factuality", "metric_accuracy", "question_accuracy"])
+
+    assert (assessment.total_criteria, assessment.passed_criteria, assessment.failed_criteria) == (3, 1, 2)
+    assert assessment.overall_passed is False
+    assert assessment.pass_rate == pytest.approx(0.333)
+    assert "No result: question_accuracy" in assessment.evaluation_summary
+
+
+def test_overall_assessment_all_passed():
+    assessment = overall_assessment([_result("a"), _result("b")], ["a", "b"])
+
+    assert assessment.overall_passed is True
+    assert assessment.pass_rate == 1.0
+
+
+def test_merge_keeps_configured_order_and_sums_usage():
+    criteria, groups = _judge_criteria_groups(PROMPT_VERSION)
+    group_results = _all_groups_passing()
+
+    merged = _merge(group_results)
+
+    obj = merged["eval_results"]["obj"]
+    configured = [name for name in criteria if any(name in names for names in groups.values())]
+    assert [r.metric_name for r in obj.evaluation_results] == configured
+    assert obj.overall_assessment.overall_passed is True
+    assert merged["metadata"]["input_tokens"] == 1000 * len(groups)
+    assert merged["metadata"]["missing_criteria"] == []
+
+
+def test_merge_normalizes_names_and_drops_other_groups_criteria():
+    group_results = _all_groups_passing()
+    # A group answering with a display name, plus a criterion that belongs to another group
+    group_results["factuality"] = _group([_result("Metric-Accuracy"), _result("factuality", passed=False),
+                                          _result("question_accuracy", passed=False)])
+
+    obj = _merge(group_results)["eval_results"]["obj"]
+
+    by_name = {r.metric_name: r.passed for r in obj.evaluation_results}
+    assert by_name["metric_accuracy"] is True
+    assert by_name["factuality"] is False
+    # question_accuracy comes from its own group only
+    assert by_name["question_accuracy"] is True
+
+
+def test_failed_group_leaves_its_criteria_missing():
+    _, groups = _judge_criteria_groups(PROMPT_VERSION)
+    group_results = _all_groups_passing()
+    failed_group = next(iter(groups))
+    del group_results[failed_group]
+
+    merged = _merge(group_results, {failed_group: RuntimeError("timeout")})
+
+    assert merged["metadata"]["missing_criteria"] == groups[failed_group]
+    assert merged["metadata"]["failed_groups"] == {failed_group: "timeout"}
+    assessment = merged["eval_results"]["obj"].overall_assessment
+    assert assessment.failed_criteria == len(groups[failed_group])
+    assert assessment.overall_passed is False
+
+
+def test_every_group_failing_raises_the_first_error():
+    _, groups = _judge_criteria_groups(PROMPT_VERSION)
+    errors = {group: RuntimeError(f"{group} failed") for group in groups}
+
+    with pytest.raises(RuntimeError, match=f"{next(iter(groups))} failed"):
+        _merge({}, errors)
+
+
+def test_no_configured_criteria_returned_is_a_stage_error():
+    _, groups = _judge_criteria_groups(PROMPT_VERSION)
+    group_results = {group: _group([_result("tone")]) for group in groups}
+
+    with pytest.raises(LLMGenerationError, match="no group returned any of the configured criteria"):
+        _merge(group_results)
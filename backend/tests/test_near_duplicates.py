@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from src.config.constants import NEAR_DUPLICATE_MAX_Q_A_LENGTH_DELTA, NEAR_DUPLICATE_MIN_SIMILARITY
+from src.services.job_creation import _same_shape
+from src.utils.transcript_fingerprint import compute_simhash, normalize_transcript, simhash_similarity
+
+
+def _transcript(seed: int, words: int = 3000) -> str:
+    rng = random.Random(seed)
+    vocabulary = ["revenue", "margin", "guidance", "growth", "quarter", "customers", "pricing",
+                  "demand", "backlog", "capex", "cloud", "security", "billings", "churn", "pipeline",
+                  "inventory", "supply", "Europe", "Asia", "services", "product", "analyst"]
+    return " ".join(rng.choice(vocabulary) + (f" {rng.randint(1, 999)}%" if rng.random() < 0.05 else "")
+                    for _ in range(words))
+
+
+def test_normalize_folds_cosmetic_differences():
+    assert normalize_transcript("Q3  Results – “Strong”\n") == normalize_transcript('q3 results - "strong"')
+
+
+def test_cosmetic_differences_keep_the_simhash():
+    text = _transcript(1)
+    variant = text.replace(" - ", " – ").upper().replace(" ", "  ")
+
+    assert compute_simhash(text) == compute_simhash(variant)
+
+
+def test_small_edit_stays_near_and_other_call_does_not():
+    text = _transcript(1)
+    edited = text + " Operator: this concludes today's call."
+
+    assert simhash_similarity(compute_simhash(text), compute_simhash(edited)) >= NEAR_DUPLICATE_MIN_SIMILARITY
+    assert simhash_similarity(compute_simhash(text), compute_simhash(_transcript(2))) < NEAR_DUPLICATE_MIN_SIMILARITY
+
+
+def test_empty_text_and_invalid_hashes():
+    assert compute_simhash("") == "0" * 16
+    assert simhash_similarity("ffff", "ffff") == 1.0
+    assert simhash_similarity("not-hex", "ffff") == 0.0
+    assert simhash_similarity(None, "ffff") == 0.0
+
+
+SHAPE = {"q_a_chars": 100_000, "analysts": 12, "questions": 30}
+
+
+@pytest.mark.parametrize("other, expected", [
+    ({"q_a_chars": 100_000, "analysts": 12, "questions": 30}, True),
+    ({"q_a_chars": int(100_000 * (1 - NEAR_DUPLICATE_MAX_Q_A_LENGTH_DELTA)), "analysts": 12, "questions": 30}, True),
+    ({"q_a_chars": 90_000, "analysts": 12, "questions": 30}, False),
+    ({"q_a_chars": 100_000, "analysts": 11, "questions": 30}, False),
+    ({"q_a_chars": 100_000, "analysts": 12, "questions": 29}, False),
+    # Entries fingerprinted before the shape was recorded cannot be confirmed
+    (None, False),
+])
+def test_same_shape(other, expected):
+    assert _same_shape(SHAPE, other) is expected
+
+
+def test_same_shape_with_empty_q_a():
+    empty = {"q_a_chars": 0, "analysts": None, "questions": None}
+
+    assert _same_shape(empty, dict(empty))
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from src.llm.partial_json import StreamingArrayExtractor
+
+
+SUMMARY = {
+    "title": 'Q3 "Record" quarter {draft}',
+    "analysts": [
+        {"name": "Emily Novak", "questions": [{"question": "Margins?", "answers": ["Up 2 pts \\ guided {flat}"]}]},
+        {"name": "Raj Patel", "questions": []},
+    ],
+    "notes": [{"ignored": True}],
+    "topics": [{"topic": "Guidance", "points": ["FY raised"]}],
+}
+
+
+def _feed_in_pieces(text: str, size: int) -> tuple:
+    extractor = StreamingArrayExtractor()
+    emitted = []
+    for i in range(0, len(text), size):
+        emitted.extend(extractor.feed(text[i:i + size]))
+    return extractor, emitted
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 100_000])
+def test_items_of_watched_arrays_are_emitted_whole_and_in_order(size):
+    extractor, emitted = _feed_in_pieces(json.dumps(SUMMARY), size)
+
+    assert emitted == [("analysts", SUMMARY["analysts"][0]),
+                       ("analysts", SUMMARY["analysts"][1]),
+                       ("topics", SUMMARY["topics"][0])]
+    assert extractor.items == emitted
+    assert extractor.fields["title"] == SUMMARY["title"]
+
+
+def test_item_is_emitted_by_the_delta_that_closes_it():
+    extractor = StreamingArrayExtractor()
+    text = json.dumps({"title": "T", "analysts": [{"name": "A"}, {"name": "B"}]})
+    cut = text.index("}") + 1
+
+    assert extractor.feed(text[:cut - 1]) == []
+    assert extractor.feed(text[cut - 1:cut]) == [("analysts", {"name": "A"})]
+    assert extractor.feed(text[cut:]) == [("analysts", {"name": "B"})]
+
+
+def test_empty_and_unfinished_input_emit_nothing():
+    extractor = StreamingArrayExtractor()
+
+    assert extractor.feed("") == []
+    assert extractor.feed('{"title": "Unfinished", "analysts": [{"name": "A", "questions": [') == []
+    assert extractor.fields == {"title": "Unfinished"}
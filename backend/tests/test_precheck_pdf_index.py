@@ -0,0 +1,88 @@
+import json
+import os
+
+import pytest
+
+from src.services import precheck
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(precheck, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(precheck, "_PDF_INDEX_PATH", str(tmp_path / "pdf_index.json"))
+    return tmp_path
+
+
+def _write_transcript(cache_dir, name, content_hash, **extra):
+    with open(os.path.join(cache_dir, name), "w", encoding="utf-8") as f:
+        json.dump({"content_hash": content_hash, "transcript_name": name, **extra}, f)
+
+
+def _read_index(cache_dir):
+    with open(os.path.join(cache_dir, "pdf_index.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_entry_valid_while_transcript_keeps_content_hash(cache_dir):
+    _write_transcript(cache_dir, "Call.json", "abc")
+
+    assert precheck._pdf_index_entry_is_valid({"transcript_name": "Call.json", "content_hash": "abc"})
+
+
+@pytest.mark.parametrize("entry", [
+    {"transcript_name": "Call.json", "content_hash": "other"},
+    {"transcript_name": "Missing.json", "content_hash": "abc"},
+    {"content_hash": "abc"},
+    "Call.json",
+    None,
+])
+def test_entry_invalid_when_transcript_gone_overwritten_or_malformed(cache_dir, entry):
+    _write_transcript(cache_dir, "Call.json", "abc")
+
+    assert not precheck._pdf_index_entry_is_valid(entry)
+
+
+def test_lookup_drops_entry_whose_transcript_was_overwritten(cache_dir):
+    _write_transcript(cache_dir, "Call.json", "new")
+    precheck._remember_pdf("pdf-1", "Call.json", "old")
+
+    assert precheck._lookup_pdf_cache("pdf-1") is None
+    assert "pdf-1" not in _read_index(cache_dir)
+
+
+def test_prune_keeps_only_valid_entries(cache_dir):
+    _write_transcript(cache_dir, "Kept.json", "k")
+    precheck._remember_pdf("kept", "Kept.json", "k")
+    precheck._remember_pdf("gone", "Gone.json", "g")
+
+    precheck._prune_pdf_index()
+
+    assert list(_read_index(cache_dir)) == ["kept"]
+
+
+def test_remember_trims_oldest_entries_past_the_cap(cache_dir, monkeypatch):
+    monkeypatch.setattr(precheck, "PDF_INDEX_MAX_ENTRIES", 5)
+    for i in range(6):
+        _write_transcript(cache_dir, f"Call{i}.json", str(i))
+        precheck._remember_pdf(f"pdf-{i}", f"Call{i}.json", str(i))
+
+    assert list(_read_index(cache_dir)) == ["pdf-2", "pdf-3", "pdf-4", "pdf-5"]
+
+
+def test_cache_hit_is_named_after_the_current_upload(cache_dir):
+    _write_transcript(cache_dir, "First.json", "abc",
+                      input={"filename": "First.pdf", "summary_length": "long"},
+                      transcripts={"presentation": "p", "q_a": "q"})
+    precheck._remember_pdf("pdf-1", "First.json", "abc")
+
+    json_name = precheck._reuse_cached_transcript(
+        "First.json", "pdf-1", "Second.pdf", "earnings", "short", "prose")
+
+    assert json_name == "Second.json"
+    with open(os.path.join(cache_dir, "Second.json"), encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["transcript_name"] == "Second.json"
+    assert saved["input"]["filename"] == "Second.pdf"
+    assert saved["input"]["summary_length"] == "short"
+    assert saved["transcripts"] == {"presentation": "p", "q_a": "q"}
+    assert _read_index(cache_dir)["pdf-1"]["transcript_name"] == "Second.json"
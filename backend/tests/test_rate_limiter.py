@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from src.llm import rate_limiter
+from src.llm.rate_limiter import ModelRateLimiter, _Bucket, parse_reset_duration
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("1s", 1.0), ("6m0s", 360.0), ("120ms", 0.12), ("1h2m3s", 3723.0), ("0.5", 0.5),
+])
+def test_parse_reset_duration(value, seconds):
+    assert parse_reset_duration(value) == pytest.approx(seconds)
+
+
+@pytest.mark.parametrize("value", ["", None, "soon"])
+def test_parse_reset_duration_unreadable(value):
+    assert parse_reset_duration(value) is None
+
+
+def test_bucket_refills_at_its_rate_up_to_capacity():
+    bucket = _Bucket(600, per_seconds=60)
+    bucket.level = 0
+    start = bucket.updated_at
+
+    bucket.refill(start + 3)
+    assert bucket.level == pytest.approx(30)
+    assert bucket.wait_for(50) == pytest.approx(2)
+
+    bucket.refill(start + 3600)
+    assert bucket.level == 600
+    assert bucket.wait_for(600) == 0
+
+
+def test_bucket_sync_discounts_calls_still_in_flight():
+    bucket = _Bucket(1000)
+
+    bucket.sync(limit=2000, remaining=900, reset_seconds=30, in_flight=100)
+
+    assert bucket.capacity == 2000
+    assert bucket.level == 800
+    # Refills fast enough to restore the provider's view by the reset time
+    assert bucket.rate == pytest.approx((2000 - 900) / 30)
+
+
+def test_reserve_settle_returns_the_unused_estimate():
+    limiter = ModelRateLimiter("test-model", requests_per_minute=60, tokens_per_minute=10_000)
+
+    reservation = limiter.reserve(4_000)
+    assert limiter.stats()["in_flight_tokens"] == 4_000
+
+    limiter.settle(reservation, 1_000)
+    stats = limiter.stats()
+    assert stats["in_flight_tokens"] == 0
+    assert 9_000 <= stats["tokens_available"] <= 10_000
+    # Settling twice must not credit the bucket again
+    limiter.settle(reservation, 0)
+    assert limiter.stats()["tokens_available"] <= 10_000
+
+
+def test_request_larger_than_the_bucket_is_capped_instead_of_waiting_forever():
+    limiter = ModelRateLimiter("test-model", requests_per_minute=60, tokens_per_minute=1_000)
+
+    reservation = limiter.reserve(50_000)
+
+    assert reservation.tokens == 1_000
+
+
+def test_headers_resync_the_limiter():
+    limiter = ModelRateLimiter("test-model", requests_per_minute=60, tokens_per_minute=10_000)
+
+    limiter.update_from_headers({
+        "x-ratelimit-limit-tokens": "20000",
+        "x-ratelimit-remaining-tokens": "500",
+        "x-ratelimit-reset-tokens": "6s",
+        "x-ratelimit-limit-requests": "100",
+        "x-ratelimit-remaining-requests": "99",
+    })
+
+    stats = limiter.stats()
+    assert stats["tokens_limit"] == 20_000
+    assert stats["requests_limit"] == 100
+    assert stats["tokens_available"] < 1_000
+
+
+def test_async_waiters_leave_the_queue_when_cancelled():
+    limiter = ModelRateLimiter("test-model", requests_per_minute=60, tokens_per_minute=10_000)
+    limiter.block_for(60)
+
+    async def cancel_waiter():
+        waiter = asyncio.ensure_future(limiter.areserve(100))
+        await asyncio.sleep(0.05)
+        assert limiter.stats()["queued"] == 1
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(cancel_waiter())
+    assert limiter.stats()["queued"] == 0
+
+
+def test_limiters_are_shared_per_model():
+    assert rate_limiter.get_rate_limiter("shared-model") is rate_limiter.get_rate_limiter("shared-model")
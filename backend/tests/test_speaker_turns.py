@@ -0,0 +1,80 @@
+from src.utils.speaker_turns import ANALYST, EXECUTIVE, OPERATOR, analyst_block_starts, q_a_stats, split_q_a_by_analyst
+
+
+def _build_q_a(exchanges):
+    """exchanges: (analyst, [(speaker_type, speaker, text), ...]) -> (q_a_text, turns, exchange start offsets)"""
+    text = "Questions and Answers\n"
+    turns, starts = [], []
+    for analyst, lines in exchanges:
+        starts.append(len(text))
+        for speaker_type, speaker, body in lines:
+            start = len(text)
+            text += f"{speaker}\n{body}\n"
+            turns.append({"speaker": speaker, "speaker_type": speaker_type, "start": start, "end": len(text)})
+    return text, turns, starts
+
+
+def _exchange(analyst, follow_up=False, size=400):
+    lines = [
+        (OPERATOR, "Operator", f"Our next question comes from {analyst}."),
+        (ANALYST, analyst, "How should we think about margins next year?" + " detail" * (size // 7)),
+        (EXECUTIVE, "Jane Miller", "We expect margins to expand." + " context" * (size // 8)),
+    ]
+    if follow_up:
+        lines += [(ANALYST, analyst, "And on pricing?"), (EXECUTIVE, "Jane Miller", "Stable.")]
+    return analyst, lines
+
+
+EXCHANGES = [_exchange("Emily Novak", follow_up=True), _exchange("Raj Patel"),
+             _exchange("Ana Costa"), _exchange("Tom Berg", follow_up=True), _exchange("Li Wei")]
+
+
+def test_exchange_starts_at_the_operator_announcement_and_keeps_follow_ups():
+    text, turns, starts = _build_q_a(EXCHANGES)
+
+    assert analyst_block_starts(turns) == starts
+
+
+def test_chunks_cover_the_text_and_never_cut_an_exchange():
+    text, turns, starts = _build_q_a(EXCHANGES)
+
+    chunks = split_q_a_by_analyst(text, turns, target_chars=len(text) // 3, max_chunks=4)
+
+    assert 1 < len(chunks) <= 4
+    assert "".join(chunks) == text
+    boundaries = [sum(len(c) for c in chunks[:i]) for i in range(1, len(chunks))]
+    assert set(boundaries) <= set(starts)
+    # Text before the first exchange stays with the first chunk
+    assert chunks[0].startswith("Questions and Answers\n")
+
+
+def test_max_chunks_is_respected():
+    text, turns, _ = _build_q_a(EXCHANGES)
+
+    assert len(split_q_a_by_analyst(text, turns, target_chars=1, max_chunks=2)) == 2
+    assert split_q_a_by_analyst(text, turns, target_chars=1, max_chunks=1) == [text]
+
+
+def test_single_chunk_without_analyst_boundaries():
+    text = "Questions and Answers\nOperator\nThere are no questions.\n"
+
+    assert split_q_a_by_analyst(text, [], target_chars=10, max_chunks=4) == [text]
+
+
+def test_q_a_stats_counts_question_marks_per_analyst_turn():
+    text, turns, _ = _build_q_a(EXCHANGES)
+
+    stats = q_a_stats(turns, text)
+
+    # One "?" per opening question, plus the two follow-ups
+    assert stats == {"analysts": 5, "analyst_turns": 7, "questions": 7, "questions_counted": True}
+
+
+def test_q_a_stats_falls_back_to_one_question_per_turn_without_marks():
+    text, turns, _ = _build_q_a(EXCHANGES)
+
+    stats = q_a_stats(turns, text.replace("?", "."))
+
+    assert stats["questions"] == 7
+    assert stats["questions_counted"] is False
+    assert q_a_stats([t for t in turns if t["speaker_type"] != ANALYST], text) is None
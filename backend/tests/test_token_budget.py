@@ -0,0 +1,50 @@
+import math
+
+import pytest
+
+from src.config.runtime import (
+    DEFAULT_MAX_OUTPUT_TOKENS,
+    Q_A_OUTPUT_BUDGET_MIN,
+    Q_A_OUTPUT_BUDGET_SAFETY,
+    Q_A_OUTPUT_TOKENS_BASE,
+    Q_A_OUTPUT_TOKENS_PER_ANALYST,
+    Q_A_OUTPUT_TOKENS_PER_QUESTION,
+    REASONING_TOKEN_RESERVE,
+)
+from src.llm.token_budget import plan_q_a_output_tokens
+
+
+def _stats(analysts, questions, counted=True):
+    return {"analysts": analysts, "analyst_turns": questions, "questions": questions, "questions_counted": counted}
+
+
+@pytest.mark.parametrize("stats", [None, {}, _stats(12, 30, counted=False), {"analysts": 12, "questions": 30}])
+def test_unknown_or_unreliable_counts_keep_the_prompt_value(stats):
+    assert plan_q_a_output_tokens(stats, "long", "gpt-5", "low") is None
+
+
+def test_budget_is_sized_per_analyst_and_question():
+    visible = Q_A_OUTPUT_TOKENS_BASE + 20 * Q_A_OUTPUT_TOKENS_PER_ANALYST + 60 * Q_A_OUTPUT_TOKENS_PER_QUESTION["long"]
+    expected = math.ceil(visible * Q_A_OUTPUT_BUDGET_SAFETY) + REASONING_TOKEN_RESERVE["low"]
+
+    assert plan_q_a_output_tokens(_stats(20, 60), "long", "gpt-5", "low") == expected
+
+
+def test_long_summaries_and_more_questions_get_more_tokens():
+    short = plan_q_a_output_tokens(_stats(20, 60), "short", "gpt-5", "low")
+    long = plan_q_a_output_tokens(_stats(20, 60), "long", "gpt-5", "low")
+    more = plan_q_a_output_tokens(_stats(20, 80), "long", "gpt-5", "low")
+
+    assert short < long < more
+
+
+def test_reasoning_reserve_follows_the_effort_level():
+    low = plan_q_a_output_tokens(_stats(20, 60), "long", "gpt-5", "low")
+    high = plan_q_a_output_tokens(_stats(20, 60), "long", "gpt-5", "high")
+
+    assert high - low == REASONING_TOKEN_RESERVE["high"] - REASONING_TOKEN_RESERVE["low"]
+
+
+def test_budget_is_clamped_to_the_floor_and_the_model_limit():
+    assert plan_q_a_output_tokens(_stats(1, 1), "short", "gpt-5", None) == Q_A_OUTPUT_BUDGET_MIN
+    assert plan_q_a_output_tokens(_stats(200, 2000), "long", "unknown-model", "high") == DEFAULT_MAX_OUTPUT_TOKENS
@@ -79,11 +79,11 @@ export const UploadScreen: React.FC = () => {
         return
       }
 
-      const maxSizeBytes = 10 * 1024 * 1024
+      const maxSizeBytes = 50 * 1024 * 1024
       if (typeof file.size === "number" && file.size > maxSizeBytes) {
         Alert.alert(
           "Error",
-          "File is larger than 10MB. Please select a smaller PDF."
+          "File is larger than 50MB. Please select a smaller PDF."
         )
         return
       }
@@ -210,7 +210,7 @@ export const UploadScreen: React.FC = () => {
               <Text style={styles.uploadHint}>
                 Bloomberg · AlphaSense · BamSec
               </Text>
-              <Text style={styles.uploadLimit}>PDF up to 10MB</Text>
+              <Text style={styles.uploadLimit}>PDF up to 50MB</Text>
             </View>
           )}
         </TouchableOpacity>